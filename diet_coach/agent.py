@@ -6,9 +6,21 @@ from .sub_agents.macro_scanner.agent import macro_scan_pipeline
 from .sub_agents.daily_summary.agent import daily_summary_agent
 from .sub_agents.adjust_meal.agent import adjust_meal_agent
 from . import prompt
+from workout_coach_agent.intent_router import FastPathRouter, register_router, rule
 
 MODEL_GEMINI_2_5_FLASH = "gemini-2.5-flash"
 
+# Unambiguous messages go straight to the specialist, skipping the coordinator's model
+fast_path = register_router(FastPathRouter("diet_agent", [
+    # A meal photo with at most a short caption
+    rule(macro_scan_pipeline.name, 0.95, media=True, max_words=8),
+    rule(daily_summary_agent.name, 0.9, [
+        r"\b(daily|today'?s)\s+(summary|totals?|macros|calories)\b",
+        r"\bwhat did i eat today\b",
+        r"\b(calories|kcal|macros)\b.*\btoday\b",
+    ], excludes=[r"\b(was|wasn'?t|not|actually|change|wrong|fix)\b"]),
+]))
+
 root_agent = Agent(
     name="diet_agent",
     model=MODEL_GEMINI_2_5_FLASH,
@@ -23,5 +35,7 @@ root_agent = Agent(
         AgentTool(agent=daily_summary_agent),
         AgentTool(agent=adjust_meal_agent),
     ],
+    before_model_callback=fast_path.before_model,
+    after_model_callback=fast_path.after_model,
 )
 
@@ -3,7 +3,15 @@ from google.adk.tools import AgentTool
 from .agents.add_idea.agent import add_idea
 from .agents.expand_idea.agent import expand_idea
 from .agents.idea_alchemy.agent import idea_alchemy
-from .tools import list_ideas, query_ideas, update_idea, get_random_ideas
+from .async_tools import (
+    list_ideas,
+    query_ideas,
+    semantic_query_ideas,
+    get_idea_details,
+    update_idea,
+    get_idea_content,
+    get_random_ideas
+)
 from . import prompt
 
 root_agent = Agent(
@@ -17,7 +25,10 @@ root_agent = Agent(
         AgentTool(agent=idea_alchemy),
         list_ideas,
         query_ideas,
+        semantic_query_ideas,
+        get_idea_details,
         update_idea,
+        get_idea_content,
         get_random_ideas
     ]
 )
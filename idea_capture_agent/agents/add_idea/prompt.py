@@ -29,4 +29,5 @@ You process raw idea text into structured data and save it to Notion.
 - If idea is too vague, do your best with what you have
 - Always save the raw_text field exactly as received
 - ALWAYS use the label agent to get tags - do NOT create them yourself
+- If `create_idea_in_notion` returns `duplicate: true`, do NOT retry on your own. Report the possible duplicates (titles) and ask the user whether to save anyway; only then call it again with `allow_duplicate=True`
 """
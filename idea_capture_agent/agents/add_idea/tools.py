@@ -6,39 +6,31 @@ import os
 
 # Add parent directory to path to import notion_client
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from notion_client import create_page
+from notion_client import Idea, create_page, chunk_text
+from idea_mirror import get_fresh_mirror
+from embeddings import EmbeddingError, get_semantic_index
 
 
-def create_idea_in_notion(
+def build_idea_properties(
     title: str,
     description: str,
     raw_text: str,
     tags: List[str]
 ) -> Dict[str, Any]:
-    """
-    Create a new idea in Notion database.
-
-    Args:
-        title: Generated title for the idea (3-8 words)
-        description: Cleaned up and structured description
-        raw_text: Original raw text from the user (EXACT, unchanged)
-        tags: List of 2-5 relevant tags
-
-    Returns:
-        Dictionary with page_id and confirmation message
-    """
+    """Notion properties for a new idea, dated today."""
     # Get today's date in ISO format (YYYY-MM-DD)
     today = date.today().isoformat()
 
-    properties = {
+    return {
         "Title": {
             "title": [{"text": {"content": title}}]
         },
+        # Long text is split into several rich_text segments (2000 chars max each)
         "Description": {
-            "rich_text": [{"text": {"content": description}}]
+            "rich_text": [{"text": {"content": segment}} for segment in chunk_text(description)]
         },
         "Raw Text": {
-            "rich_text": [{"text": {"content": raw_text}}]
+            "rich_text": [{"text": {"content": segment}} for segment in chunk_text(raw_text)]
         },
         "Tags": {
             "multi_select": [{"name": tag} for tag in tags]
@@ -48,6 +40,59 @@ def create_idea_in_notion(
         }
     }
 
+
+def create_idea_in_notion(
+    title: str,
+    description: str,
+    raw_text: str,
+    tags: List[str],
+    allow_duplicate: bool = False
+) -> Dict[str, Any]:
+    """
+    Create a new idea in Notion database.
+    Refuses to save when a near-identical idea already exists, unless allow_duplicate is True.
+
+    Args:
+        title: Generated title for the idea (3-8 words)
+        description: Cleaned up and structured description
+        raw_text: Original raw text from the user (EXACT, unchanged)
+        tags: List of 2-5 relevant tags
+        allow_duplicate: Save even if similar ideas exist (only after the user confirms)
+
+    Returns:
+        Dictionary with page_id and confirmation message, or the possible
+        duplicates (with similarity scores) if the idea was not saved
+    """
+    if not allow_duplicate:
+        try:
+            mirror = get_fresh_mirror()
+            candidate = Idea(title=title, description=description, tags=tags)
+            matches = get_semantic_index().find_duplicates(candidate)
+            existing = mirror.get_ideas([page_id for page_id, _ in matches])
+            duplicates = [
+                {
+                    "page_id": page_id,
+                    "title": existing[page_id].title,
+                    "similarity": round(score, 3)
+                }
+                for page_id, score in matches
+                if page_id in existing
+            ]
+        except (requests.exceptions.RequestException, EmbeddingError):
+            # The duplicate check is best-effort; never block a save on it
+            duplicates = []
+
+        if duplicates:
+            return {
+                "success": False,
+                "duplicate": True,
+                "possible_duplicates": duplicates,
+                "message": f"Not saved: '{title}' looks like an existing idea ('{duplicates[0]['title']}'). "
+                           "Call again with allow_duplicate=True to save anyway."
+            }
+
+    properties = build_idea_properties(title, description, raw_text, tags)
+
     try:
         result = create_page(properties)
 
@@ -4,7 +4,7 @@ import os
 
 # Add parent directory to path to import notion_client
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from notion_client import get_page, update_page
+from notion_client import append_block_children, text_to_blocks
 
 
 def append_discussion_to_idea(
@@ -12,7 +12,11 @@ def append_discussion_to_idea(
     discussion_content: str
 ) -> Dict[str, Any]:
     """
-    Append discussion/expansion content to an existing idea's description.
+    Append discussion/expansion content to an existing idea's page.
+
+    The discussion is written below the idea's properties under a
+    "Discussion & Expansion" heading, in a single request. Long content is
+    split automatically to fit Notion's limits.
 
     Args:
         page_id: Notion page ID of the idea
@@ -22,26 +26,10 @@ def append_discussion_to_idea(
         Dictionary with success status and message
     """
     try:
-        # Get current page
-        page = get_page(page_id)
-
-        # Extract current description
-        properties = page.get("properties", {})
-        desc_property = properties.get("Description", {}).get("rich_text", [])
-        current_description = desc_property[0].get("text", {}).get("content", "") if desc_property else ""
-
-        # Append discussion with clear separator
-        separator = "\n\n---\n\n## Discussion & Expansion\n\n" if current_description else "## Discussion & Expansion\n\n"
-        new_description = f"{current_description}{separator}{discussion_content}"
-
-        # Update the page
-        update_properties = {
-            "Description": {
-                "rich_text": [{"text": {"content": new_description}}]
-            }
-        }
+        # Divider + heading keep successive discussions visually separate
+        blocks = text_to_blocks(discussion_content, heading="Discussion & Expansion", divider=True)
 
-        update_page(page_id, update_properties)
+        append_block_children(page_id, blocks)
 
         return {
             "success": True,
@@ -49,3 +49,24 @@ You are a tag management specialist. Your job is to select or create appropriate
 - Return your final tag selection as a simple list
 - Don't over-explain, just provide the tags
 """
+
+BATCH_LABEL_PROMPT = """
+You are a tag management specialist labelling a batch of ideas for a bulk import.
+
+Follow the same tag selection strategy as for single ideas:
+- Select 2-5 tags per idea
+- REUSE the existing tags below whenever one fits, even if not a perfect match
+- Only create a NEW tag when no existing tag is remotely related
+- Use lowercase with hyphens (e.g., "feature-request", "marketing-idea")
+- Ideas in the same batch about the same topic should get the same tags
+
+## Existing tags:
+{existing_tags}
+
+## Ideas:
+{ideas}
+
+## Output:
+Return ONLY a JSON array with one object per idea, in the same order:
+[{{"id": 0, "tags": ["tag-one", "tag-two"]}}, ...]
+"""
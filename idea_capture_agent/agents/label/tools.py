@@ -5,28 +5,26 @@ import os
 
 # Add parent directory to path to import notion_client
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-from notion_client import get_database_schema
+from notion_client import get_database_schema, get_tag_options
 
 
 def get_existing_tags() -> Dict[str, Any]:
     """
     Fetch all existing tags from the Notion database.
+    The schema is cached process-wide, so repeated labelling runs rarely hit the API.
 
     Returns:
         Dictionary containing list of existing tag names
     """
     try:
-        # Retrieve the database schema
+        # Retrieve the (cached) database schema
         database = get_database_schema()
 
         # Extract existing tags from the Tags multi-select property
         tags_property = database.get("properties", {}).get("Tags", {})
 
         if tags_property.get("type") == "multi_select":
-            existing_tags = [
-                option["name"]
-                for option in tags_property.get("multi_select", {}).get("options", [])
-            ]
+            existing_tags = get_tag_options(database)
 
             return {
                 "success": True,
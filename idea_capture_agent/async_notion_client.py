@@ -0,0 +1,367 @@
+"""
+Async Notion API client for idea management.
+
+Mirrors the notion_client surface (query_database, get_page, update_page,
+create_page, append_block_children, iter_block_children, get_database_schema,
+iter_database) with coroutines on a
+pooled httpx.AsyncClient, so ADK tools running inside the event loop never
+block it on an HTTP round trip.
+
+Configuration, the rate limiter, the schema cache and page listeners are
+shared with notion_client: sync and async callers draw from the same token
+bucket and keep the same local caches consistent.
+"""
+from typing import Dict, Any, AsyncIterator, List, Optional
+import asyncio
+import os
+import time
+import httpx
+import notion_client
+from notion_client import (
+    HEADERS,
+    NOTION_APPEND_BLOCK_LIMIT,
+    NOTION_DATABASE_ID,
+    NOTION_MAX_RETRIES,
+    RETRYABLE_STATUS_CODES,
+    validate_config,
+    Idea,
+    parse_idea
+)
+
+# Async connection pool limits
+NOTION_ASYNC_MAX_CONNECTIONS = int(os.getenv("NOTION_ASYNC_MAX_CONNECTIONS", "20"))
+NOTION_ASYNC_MAX_KEEPALIVE = int(os.getenv("NOTION_ASYNC_MAX_KEEPALIVE", "10"))
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the shared httpx.AsyncClient for the running event loop.
+
+    An AsyncClient is tied to the loop it was first used on, so a new one is
+    created if the loop changes (e.g. between separate asyncio.run calls).
+
+    Returns:
+        The pooled, keep-alive async client
+    """
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            headers=HEADERS,
+            limits=httpx.Limits(
+                max_connections=NOTION_ASYNC_MAX_CONNECTIONS,
+                max_keepalive_connections=NOTION_ASYNC_MAX_KEEPALIVE
+            )
+        )
+        _client_loop = loop
+    return _client
+
+
+async def close_async_client() -> None:
+    """Close the shared async client and its pooled connections."""
+    global _client, _client_loop
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+
+
+def _handle_response(response: httpx.Response) -> Dict[str, Any]:
+    """
+    Async counterpart of notion_client._handle_response.
+
+    Raises:
+        httpx.HTTPStatusError: If response status is not OK, with detailed error message
+    """
+    if not response.is_success:
+        try:
+            error_data = response.json()
+            error_msg = f"{response.status_code} {response.reason_phrase}: {error_data.get('message', 'Unknown error')}"
+        except ValueError:
+            error_msg = f"{response.status_code} {response.reason_phrase}: {response.text}"
+
+        raise httpx.HTTPStatusError(error_msg, request=response.request, response=response)
+
+    return response.json()
+
+
+async def _send(method: str, path: str, timeout: float = 10.0, **kwargs: Any) -> httpx.Response:
+    """
+    Send a request through the shared rate limiter, retrying like notion_client._send.
+
+    When no rate-limit token is free, waiting for one happens in a worker
+    thread, so the event loop stays free while the shared bucket is empty.
+
+    Raises:
+        httpx.HTTPError: If the request cannot be sent
+    """
+    scheduler = notion_client._scheduler
+    idempotent = (
+        method == "GET"
+        or path.endswith("/query")
+        or (method == "PATCH" and not path.endswith("/children"))
+    )
+    priority = notion_client._request_priority.get()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        if not scheduler.try_acquire(priority):
+            await asyncio.to_thread(scheduler.acquire, priority)
+        started = time.perf_counter()
+        try:
+            response = await get_async_client().request(
+                method,
+                f"{notion_client.NOTION_BASE_URL}/{path}",
+                timeout=timeout,
+                **kwargs
+            )
+        except (httpx.TransportError, httpx.TimeoutException):
+            if not idempotent or attempt > NOTION_MAX_RETRIES:
+                raise
+            scheduler.record_retry(rate_limited=False)
+            await asyncio.sleep(notion_client._retry_delay(attempt, None))
+            continue
+        finally:
+            notion_client._record_latency((time.perf_counter() - started) * 1000)
+
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt > NOTION_MAX_RETRIES:
+            return response
+
+        rate_limited = response.status_code == 429
+        if not rate_limited and not idempotent:
+            return response
+
+        delay = notion_client._retry_delay(attempt, response)
+        scheduler.record_retry(rate_limited)
+        if rate_limited:
+            scheduler.pause(delay)
+        else:
+            await asyncio.sleep(delay)
+
+
+async def _request(method: str, path: str, timeout: float = 10.0, **kwargs: Any) -> Dict[str, Any]:
+    """Send a request and parse the JSON response."""
+    return _handle_response(await _send(method, path, timeout=timeout, **kwargs))
+
+
+async def query_database(
+    page_size: int = 100,
+    filter_config: Optional[Dict[str, Any]] = None,
+    timeout: float = 10.0,
+    start_cursor: Optional[str] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Query the Notion database with optional filters (one page of results).
+
+    Args:
+        page_size: Number of results to return (1-100)
+        filter_config: Optional Notion filter object
+        timeout: Request timeout in seconds
+        start_cursor: Optional cursor from a previous response's next_cursor
+        sorts: Optional list of Notion sort objects
+
+    Returns:
+        Raw JSON response from Notion API (includes has_more and next_cursor)
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    validate_config()
+
+    payload = {"page_size": min(max(1, page_size), 100)}
+    if filter_config:
+        payload["filter"] = filter_config
+    if sorts:
+        payload["sorts"] = sorts
+    if start_cursor:
+        payload["start_cursor"] = start_cursor
+
+    return await _request(
+        "POST",
+        f"databases/{NOTION_DATABASE_ID}/query",
+        json=payload,
+        timeout=timeout
+    )
+
+
+async def iter_database(
+    filter_config: Optional[Dict[str, Any]] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None,
+    page_size: int = 100,
+    timeout: float = 10.0
+) -> AsyncIterator[Idea]:
+    """
+    Lazily iterate over every idea in the Notion database.
+
+    The next batch is requested as a task while the current one is consumed;
+    it is cancelled if the caller stops early.
+
+    Yields:
+        Parsed Idea records
+
+    Raises:
+        httpx.HTTPError: If a request fails
+    """
+    def fetch(cursor: Optional[str]) -> "asyncio.Task[Dict[str, Any]]":
+        return asyncio.ensure_future(query_database(
+            page_size=page_size,
+            filter_config=filter_config,
+            timeout=timeout,
+            start_cursor=cursor,
+            sorts=sorts
+        ))
+
+    pending = fetch(None)
+    try:
+        while pending is not None:
+            result = await pending
+            cursor = result.get("next_cursor") if result.get("has_more") else None
+            pending = fetch(cursor) if cursor else None
+            for page in result.get("results", []):
+                yield parse_idea(page)
+    finally:
+        if pending is not None:
+            pending.cancel()
+
+
+async def get_page(page_id: str, timeout: float = 10.0) -> Dict[str, Any]:
+    """
+    Retrieve a single Notion page by ID.
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    validate_config()
+
+    return await _request("GET", f"pages/{page_id}", timeout=timeout)
+
+
+async def update_page(
+    page_id: str,
+    properties: Dict[str, Any],
+    timeout: float = 10.0
+) -> Dict[str, Any]:
+    """
+    Update a Notion page's properties.
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    validate_config()
+
+    page = await _request("PATCH", f"pages/{page_id}", json={"properties": properties}, timeout=timeout)
+    notion_client._invalidate_schema_on_new_tags(properties)
+    # Listeners write the SQLite mirror and indexes (and may wait for a mirror sync): off the loop
+    await asyncio.to_thread(notion_client._notify_page_written, page)
+    return page
+
+
+async def create_page(
+    properties: Dict[str, Any],
+    timeout: float = 10.0
+) -> Dict[str, Any]:
+    """
+    Create a new page in the Notion database.
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    validate_config()
+
+    payload = {
+        "parent": {"database_id": NOTION_DATABASE_ID},
+        "properties": properties
+    }
+
+    page = await _request("POST", "pages", json=payload, timeout=timeout)
+    notion_client._invalidate_schema_on_new_tags(properties)
+    await asyncio.to_thread(notion_client._notify_page_written, page)
+    return page
+
+
+async def append_block_children(
+    block_id: str,
+    children: List[Dict[str, Any]],
+    timeout: float = 10.0
+) -> List[Dict[str, Any]]:
+    """
+    Append child blocks to a page (or block) without touching its properties.
+
+    Not retried on server errors, since appending is not idempotent.
+
+    Raises:
+        httpx.HTTPError: If a request fails
+    """
+    validate_config()
+
+    created = []
+    for start in range(0, len(children), NOTION_APPEND_BLOCK_LIMIT):
+        result = await _request(
+            "PATCH",
+            f"blocks/{block_id}/children",
+            json={"children": children[start:start + NOTION_APPEND_BLOCK_LIMIT]},
+            timeout=timeout
+        )
+        created.extend(result.get("results", []))
+    return created
+
+
+async def iter_block_children(
+    block_id: str,
+    page_size: int = 100,
+    timeout: float = 10.0
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Lazily iterate over the child blocks of a page (or block).
+
+    Yields:
+        Raw block objects, in page order
+
+    Raises:
+        httpx.HTTPError: If a request fails
+    """
+    validate_config()
+
+    params = {"page_size": min(max(1, page_size), 100)}
+    while True:
+        result = await _request("GET", f"blocks/{block_id}/children", params=params, timeout=timeout)
+        for block in result.get("results", []):
+            yield block
+        if not result.get("has_more"):
+            return
+        params["start_cursor"] = result["next_cursor"]
+
+
+async def get_database_schema(timeout: float = 10.0) -> Dict[str, Any]:
+    """
+    Retrieve the database schema/metadata.
+
+    Shares notion_client's schema cache (TTL, ETag revalidation and
+    invalidation on new tags); only the fetch itself is async.
+
+    Raises:
+        httpx.HTTPError: If the request fails
+    """
+    validate_config()
+
+    cached, etag = notion_client._lookup_schema_cache()
+    if cached is not None and etag is None:
+        return cached
+
+    headers = {"If-None-Match": etag} if etag else {}
+    response = await _send("GET", f"databases/{NOTION_DATABASE_ID}", timeout=timeout, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        with notion_client._schema_lock:
+            notion_client._schema_stats["revalidated"] += 1
+            notion_client._schema_cache["fetched_at"] = time.time()
+        return cached
+
+    schema = _handle_response(response)
+    notion_client._store_schema(schema, response.headers.get("ETag"))
+    return schema
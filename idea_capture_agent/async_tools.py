@@ -0,0 +1,242 @@
+"""
+Async versions of the idea tools registered on the root agent.
+
+ADK runs tools inside its event loop, so these never block it:
+- update_idea / expand_idea / get_idea_content talk to Notion through
+  async_notion_client
+- list_ideas / query_ideas / semantic_query_ideas / get_idea_details /
+  get_random_ideas read the local mirror and indexes; any mirror sync they trigger runs in a worker
+  thread via asyncio.to_thread
+
+Tool names, parameters and results match tools.py exactly.
+"""
+from typing import Dict, Any, List, Optional
+import asyncio
+import httpx
+from async_notion_client import append_block_children, iter_block_children, update_page
+from notion_client import blocks_to_text, text_to_blocks
+from . import tools
+from .tools import _build_update_properties, _describe_update
+from tool_budget import track_tokens
+
+
+async def list_ideas(
+    limit: int = 10,
+    filter_by_tag: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    List ideas from the Notion database (served from the local mirror).
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
+
+    Args:
+        limit: Maximum number of ideas to retrieve (default: 10)
+        filter_by_tag: Optional tag to filter ideas by (e.g., "feature-request")
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
+
+    Returns:
+        Dictionary with list of ideas containing title, description, tags, and page_id
+    """
+    return await asyncio.to_thread(tools.list_ideas, limit, filter_by_tag, fields)
+
+
+async def query_ideas(
+    search_text: str,
+    limit: int = 100,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Search for ideas in the Notion database by keywords.
+    Ranks ideas with BM25 over title, tags, description and raw text (in that
+    order of importance). Keywords can match in any order, search is
+    case-insensitive and word forms are folded ("automate" finds "automation").
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
+
+    Args:
+        search_text: Text to search for (e.g., "delete blog automation")
+        limit: Maximum number of matching ideas to return (default: 100)
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
+
+    Returns:
+        Dictionary with list of matching ideas containing title, description, tags, page_id and score
+    """
+    return await asyncio.to_thread(tools.query_ideas, search_text, limit, fields)
+
+
+async def semantic_query_ideas(
+    search_text: str,
+    limit: int = 10,
+    min_score: float = 0.0,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Search for ideas by meaning rather than exact keywords.
+    Finds ideas that are phrased differently but about the same thing
+    (e.g., "write posts automatically" finds "Blog automation pipeline").
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
+
+    Args:
+        search_text: Description of what to look for
+        limit: Maximum number of ideas to return (default: 10)
+        min_score: Minimum similarity between 0 and 1 (default: 0.0)
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
+
+    Returns:
+        Dictionary with list of similar ideas containing title, description, tags, page_id and similarity
+    """
+    return await asyncio.to_thread(tools.semantic_query_ideas, search_text, limit, min_score, fields)
+
+
+async def get_idea_details(page_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get the full, untruncated details of specific ideas.
+    Use after list_ideas/query_ideas when an idea's full description or raw
+    text is needed.
+
+    Args:
+        page_ids: Notion page IDs of the ideas (max 10)
+
+    Returns:
+        Dictionary with the full ideas (title, description, tags, raw_text, page_id)
+    """
+    return await asyncio.to_thread(tools.get_idea_details, page_ids)
+
+
+async def update_idea(
+    page_id: str,
+    title: Optional[str] = None,
+    description: Optional[str] = None,
+    tags: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Update an existing idea in the Notion database.
+
+    Args:
+        page_id: The Notion page ID of the idea to update
+        title: New title (optional)
+        description: New description (optional)
+        tags: New list of tags (optional)
+
+    Returns:
+        Dictionary with success status and confirmation message
+    """
+    properties = _build_update_properties(title, description, tags)
+
+    # If no fields to update, return error
+    if not properties:
+        return {
+            "success": False,
+            "message": "No fields provided to update"
+        }
+
+    try:
+        result = await update_page(page_id, properties)
+
+        return {
+            "success": True,
+            "page_id": result["id"],
+            "message": _describe_update(title, description, tags)
+        }
+
+    except httpx.HTTPError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to update idea: {str(e)}"
+        }
+
+
+async def expand_idea(
+    page_id: str,
+    expanded_content: str
+) -> Dict[str, Any]:
+    """
+    Expand an existing idea by appending new content to its page.
+    Useful for adding details, thoughts, or elaborations to an idea.
+    The content is added below the idea's properties in a single request;
+    long content is split automatically. Use get_idea_content to read it back.
+
+    Args:
+        page_id: The Notion page ID of the idea to expand
+        expanded_content: New content to append to the idea
+
+    Returns:
+        Dictionary with success status and confirmation message
+    """
+    try:
+        await append_block_children(page_id, text_to_blocks(expanded_content, divider=True))
+
+        return {
+            "success": True,
+            "page_id": page_id,
+            "message": f"Expanded idea with new content ({len(expanded_content)} characters added)"
+        }
+
+    except httpx.HTTPError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to expand idea: {str(e)}"
+        }
+
+
+@track_tokens
+async def get_idea_content(page_id: str) -> Dict[str, Any]:
+    """
+    Read the expansions and discussions appended to an idea.
+    Only call this when the full content is needed; list and search results
+    contain the title, description and tags but not the appended content.
+
+    Args:
+        page_id: The Notion page ID of the idea
+
+    Returns:
+        Dictionary with the appended content as text
+    """
+    try:
+        content = blocks_to_text([block async for block in iter_block_children(page_id)])
+
+        return {
+            "success": True,
+            "page_id": page_id,
+            "content": content,
+            "message": f"Retrieved {len(content)} characters of content" if content else "Idea has no appended content"
+        }
+
+    except httpx.HTTPError as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to read idea content: {str(e)}"
+        }
+
+
+async def get_random_ideas(
+    count: int = 3,
+    exclude_ids: Optional[List[str]] = None,
+    strategy: str = "uniform",
+    tag: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Get random ideas from the Notion database for creative combination.
+    Used by the idea_alchemy agent to synthesize novel insights.
+    Draws from every idea in the database; returned ideas are remembered as
+    combined for the "least_combined" strategy.
+
+    Args:
+        count: Number of random ideas to retrieve (default: 3, max: 10)
+        exclude_ids: Optional list of page IDs to exclude from selection
+        strategy: "uniform" (default), "recent" (favour recently edited ideas)
+                  or "least_combined" (favour ideas not combined recently)
+        tag: Optional tag to favour (e.g., "fitness")
+
+    Returns:
+        Dictionary with randomly selected ideas
+    """
+    return await asyncio.to_thread(tools.get_random_ideas, count, exclude_ids, strategy, tag)
@@ -0,0 +1,142 @@
+"""
+Benchmark: event-loop responsiveness of sync vs async idea tools.
+
+Runs N concurrent "sessions" inside one event loop against a local stub
+Notion server (with artificial latency) and measures how late a 10 ms
+heartbeat task wakes up. Sync tools block the loop for every HTTP round
+trip; the async tools should keep the lag near zero.
+
+Usage (from the repo root):
+    python idea_capture_agent/benchmark_async_tools.py [sessions] [latency_ms]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Configure before the clients are imported: fake credentials, a throwaway
+# mirror, and no rate limiting (this measures the loop, not the limiter).
+_tmp = tempfile.mkdtemp()
+os.environ.update({
+    "NOTION_API_KEY": "benchmark",
+    "NOTION_IDEAS_DATABASE_ID": "benchmark-db",
+    "IDEA_MIRROR_PATH": os.path.join(_tmp, "mirror.sqlite3"),
+    "NOTION_RATE_LIMIT_PER_SECOND": "100000",
+    "NOTION_RATE_LIMIT_BURST": "100000",
+    "NOTION_POOL_MAXSIZE": "64",
+    "NOTION_ASYNC_MAX_CONNECTIONS": "64"
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import notion_client  # noqa: E402
+from idea_capture_agent import async_tools, tools  # noqa: E402
+
+STUB_LATENCY_SECONDS = 0.05
+
+
+class StubNotionHandler(BaseHTTPRequestHandler):
+    """Minimal Notion stand-in: echoes pages back after a fixed delay."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, body):
+        time.sleep(STUB_LATENCY_SECONDS)
+        payload = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _page(self, page_id, properties=None):
+        return {
+            "id": page_id,
+            "last_edited_time": "2026-01-01T00:00:00.000Z",
+            "properties": properties or {
+                "Title": {"title": [{"text": {"content": "Benchmark idea"}}]},
+                "Description": {"rich_text": [{"text": {"content": "Existing description"}}]}
+            }
+        }
+
+    def do_GET(self):
+        self._reply(self._page(self.path.rsplit("/", 1)[-1]))
+
+    def do_PATCH(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path.endswith("/children"):
+            self._reply({"object": "list", "results": body.get("children", [])})
+        else:
+            self._reply(self._page(self.path.rsplit("/", 1)[-1], body.get("properties")))
+
+    def log_message(self, *args):
+        pass
+
+
+async def _heartbeat(stop: asyncio.Event, lags: list, interval: float = 0.01) -> None:
+    """Record how late each 10 ms sleep wakes up."""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append((time.perf_counter() - started - interval) * 1000)
+
+
+async def _session_sync(i: int) -> None:
+    # What a sync tool does when called directly on the event loop
+    tools.expand_idea(f"page-{i}", "More thoughts")
+
+
+async def _session_async(i: int) -> None:
+    await async_tools.expand_idea(f"page-{i}", "More thoughts")
+
+
+async def _run(session, sessions: int) -> dict:
+    stop = asyncio.Event()
+    lags: list = []
+    heartbeat = asyncio.create_task(_heartbeat(stop, lags))
+    await asyncio.sleep(0.05)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - started
+
+    stop.set()
+    await heartbeat
+    lags.sort()
+    return {
+        "elapsed_s": elapsed,
+        "lag_p50_ms": statistics.median(lags),
+        "lag_p99_ms": lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else lags[-1],
+        "lag_max_ms": lags[-1]
+    }
+
+
+def main() -> None:
+    global STUB_LATENCY_SECONDS
+    sessions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    STUB_LATENCY_SECONDS = (float(sys.argv[2]) if len(sys.argv) > 2 else 50) / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubNotionHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    notion_client.NOTION_BASE_URL = f"http://127.0.0.1:{server.server_port}"
+
+    print(f"{sessions} concurrent sessions, expand_idea (block append), "
+          f"stub latency {STUB_LATENCY_SECONDS * 1000:.0f} ms\n")
+    for name, session in (("sync tools ", _session_sync), ("async tools", _session_async)):
+        result = asyncio.run(_run(session, sessions))
+        print(
+            f"{name}: total {result['elapsed_s']:.2f}s | loop lag "
+            f"p50 {result['lag_p50_ms']:.1f} ms, p99 {result['lag_p99_ms']:.1f} ms, "
+            f"max {result['lag_max_ms']:.1f} ms"
+        )
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Micro-benchmark: parsing Notion pages into ideas.
+
+Parses 10k synthetic pages (multi-fragment descriptions, like Notion returns
+for long or formatted text) with:
+- the previous dict parser (first rich_text fragment only, so it truncates)
+- the same dict parser fixed to join every fragment (the fair baseline)
+- parse_idea, reading only title/tags (what filtering and sampling need)
+- parse_idea followed by to_dict (tool output)
+
+and reports time per page and the memory retained by the parsed results.
+
+Usage (from the repo root):
+    python idea_capture_agent/benchmark_idea_parsing.py [pages]
+"""
+import gc
+import os
+import sys
+import timeit
+import tracemalloc
+
+os.environ.setdefault("NOTION_API_KEY", "benchmark")
+os.environ.setdefault("NOTION_IDEAS_DATABASE_ID", "benchmark-db")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from notion_client import parse_idea  # noqa: E402
+
+
+def _fragments(text: str, size: int = 120) -> list:
+    return [
+        {"type": "text", "text": {"content": text[i:i + size]}, "plain_text": text[i:i + size]}
+        for i in range(0, len(text), size)
+    ]
+
+
+def synthetic_pages(count: int) -> list:
+    """Notion-shaped pages with 4-6 fragment descriptions and raw text."""
+    pages = []
+    for i in range(count):
+        description = f"Idea {i}: " + "automate the weekly blog pipeline and measure results. " * (8 + i % 4)
+        raw_text = f"raw note {i} " + "yo we should really do this at some point " * (6 + i % 3)
+        pages.append({
+            "object": "page",
+            "id": f"page-{i:05d}",
+            "created_time": "2026-01-01T00:00:00.000Z",
+            "last_edited_time": "2026-01-02T00:00:00.000Z",
+            "properties": {
+                "Title": {"id": "title", "type": "title", "title": _fragments(f"Benchmark idea {i}")},
+                "Description": {"id": "d", "type": "rich_text", "rich_text": _fragments(description)},
+                "Raw Text": {"id": "r", "type": "rich_text", "rich_text": _fragments(raw_text)},
+                "Tags": {"id": "t", "type": "multi_select", "multi_select": [
+                    {"id": "a", "name": "automation", "color": "blue"},
+                    {"id": "b", "name": f"tag-{i % 20}", "color": "red"}
+                ]},
+                "Date": {"id": "x", "type": "date", "date": {"start": "2026-01-01"}}
+            }
+        })
+    return pages
+
+
+def legacy_parse(page):
+    """The parser before the Idea record (first fragment only)."""
+    properties = page.get("properties", {})
+    title_property = properties.get("Title", {}).get("title", [])
+    title = title_property[0].get("text", {}).get("content", "") if title_property else "Untitled"
+    desc_property = properties.get("Description", {}).get("rich_text", [])
+    description = desc_property[0].get("text", {}).get("content", "") if desc_property else ""
+    tags_property = properties.get("Tags", {}).get("multi_select", [])
+    tags = [tag.get("name", "") for tag in tags_property]
+    raw_property = properties.get("Raw Text", {}).get("rich_text", [])
+    raw_text = raw_property[0].get("text", {}).get("content", "") if raw_property else ""
+    return {
+        "page_id": page.get("id", ""),
+        "title": title,
+        "description": description,
+        "tags": tags,
+        "raw_text": raw_text
+    }
+
+
+def joined_dict_parse(page):
+    """The dict parser with every fragment joined (same output as parse_idea + to_dict)."""
+    properties = page.get("properties", {})
+
+    def join(fragments):
+        return "".join(fragment.get("text", {}).get("content", "") for fragment in fragments)
+
+    title_property = properties.get("Title", {}).get("title", [])
+    return {
+        "page_id": page.get("id", ""),
+        "title": join(title_property) if title_property else "Untitled",
+        "description": join(properties.get("Description", {}).get("rich_text", [])),
+        "tags": [tag.get("name", "") for tag in properties.get("Tags", {}).get("multi_select", [])],
+        "raw_text": join(properties.get("Raw Text", {}).get("rich_text", []))
+    }
+
+
+def idea_title_tags(page):
+    idea = parse_idea(page)
+    idea.title, idea.tags
+    return idea
+
+
+def idea_to_dict(page):
+    return parse_idea(page).to_dict()
+
+
+def _retained_bytes(parse, pages) -> int:
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [parse(page) for page in pages]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del results
+    return retained
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    pages = synthetic_pages(count)
+
+    truncated = legacy_parse(pages[0])["description"]
+    full = parse_idea(pages[0]).description
+    print(f"{count} pages | description length: legacy {len(truncated)} chars, joined {len(full)} chars\n")
+
+    candidates = (
+        ("legacy dict (truncating)", legacy_parse),
+        ("dict, all fragments", joined_dict_parse),
+        ("Idea, title/tags only", idea_title_tags),
+        ("Idea + to_dict", idea_to_dict),
+    )
+    for name, parse in candidates:
+        seconds = min(timeit.repeat(lambda: [parse(page) for page in pages], number=1, repeat=5))
+        retained = _retained_bytes(parse, pages)
+        print(f"{name:26s} {seconds / count * 1e6:6.2f} us/page | retained {retained / count:7.1f} B/page")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+"""
+Bulk import of backlog notes into the Notion ideas database.
+
+The source is streamed through three stages, so large files are never held
+in memory and each stage runs at its own pace:
+
+1. parse  - read ideas from a JSONL or Markdown file
+2. label  - tag untagged ideas in batches, one LLM call per batch (the label
+            agent's model with BATCH_LABEL_PROMPT), against the existing tag
+            list fetched once from the cached database schema
+3. create - create pages concurrently in a thread pool; every request goes
+            through notion_client's shared rate limiter at background
+            priority, so interactive agent calls are served first
+
+Every created idea is appended to a checkpoint file; rerunning the same
+import skips ideas that were already created. Ideas that look like an
+existing idea (semantic index) are skipped unless --allow-duplicates is set.
+
+Source formats:
+- JSONL: one object per line with "raw_text" (or "text"), and optionally
+  "title", "description" and "tags"
+- Markdown: each heading starts an idea (heading = title, body = text);
+  before the first heading, every paragraph or top-level bullet is an idea
+
+Usage (from the repo root):
+    python idea_capture_agent/bulk_import.py backlog.jsonl [--workers 4] [--batch-size 20]
+    python idea_capture_agent/bulk_import.py notes.md --checkpoint notes.checkpoint.jsonl
+"""
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+import argparse
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import requests  # noqa: E402
+from notion_client import (  # noqa: E402
+    PRIORITY_BACKGROUND,
+    Idea,
+    create_page,
+    get_database_schema,
+    get_scheduler_stats,
+    get_tag_options,
+    request_priority
+)
+from idea_mirror import get_fresh_mirror  # noqa: E402
+from embeddings import get_semantic_index  # noqa: E402
+from agents.add_idea.tools import build_idea_properties  # noqa: E402
+from agents.label.prompt import BATCH_LABEL_PROMPT  # noqa: E402
+
+BULK_IMPORT_WORKERS = int(os.getenv("BULK_IMPORT_WORKERS", "4"))
+BULK_IMPORT_BATCH_SIZE = int(os.getenv("BULK_IMPORT_BATCH_SIZE", "20"))
+# Characters of each idea sent to the labelling model
+LABEL_TEXT_LIMIT = 1000
+
+
+# ── parsing ─────────────────────────────────────────────────
+
+def _fallback_title(text: str, max_words: int = 8) -> str:
+    """Title from the first line of the text, for sources without one."""
+    first_line = text.strip().split("\n", 1)[0].lstrip("#-* ").strip()
+    words = first_line.split()
+    title = " ".join(words[:max_words])
+    return f"{title}..." if len(words) > max_words else title or "Untitled"
+
+
+def _normalize(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Complete a source record into title/description/raw_text/tags, or None if empty."""
+    raw_text = (record.get("raw_text") or record.get("text") or record.get("description") or "").strip()
+    title = (record.get("title") or "").strip()
+    if not raw_text and not title:
+        return None
+    raw_text = raw_text or title
+    return {
+        "title": title or _fallback_title(raw_text),
+        "description": (record.get("description") or raw_text).strip(),
+        "raw_text": raw_text,
+        "tags": list(record.get("tags") or [])
+    }
+
+
+def iter_jsonl(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield raw records from JSONL lines, skipping blank lines."""
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON on line {number}: {e}") from e
+
+
+def iter_markdown(lines: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """Yield raw records from Markdown lines (see module docstring)."""
+    title: Optional[str] = None
+    body: List[str] = []
+
+    def flush() -> Iterator[Dict[str, Any]]:
+        text = "\n".join(body).strip()
+        if title or text:
+            yield {"title": title, "raw_text": text}
+        body.clear()
+
+    for line in lines:
+        line = line.rstrip("\n")
+        heading = re.match(r"^#{1,6}\s+(.*)", line)
+        if heading:
+            yield from flush()
+            title = heading.group(1).strip()
+        elif title is None and (not line.strip() or re.match(r"^[-*]\s+", line)):
+            # Before the first heading, blank lines and bullets separate ideas
+            yield from flush()
+            if line.strip():
+                body.append(re.sub(r"^[-*]\s+", "", line).strip())
+        else:
+            body.append(line)
+    yield from flush()
+
+
+def iter_source(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Stream normalized ideas from a JSONL or Markdown file.
+
+    Args:
+        path: Source file; ".jsonl"/".json" is read as JSONL, anything else as Markdown
+
+    Yields:
+        Idea dictionaries with title, description, raw_text and tags
+    """
+    parser = iter_jsonl if path.endswith((".jsonl", ".json")) else iter_markdown
+    with open(path, encoding="utf-8") as f:
+        for record in parser(f):
+            idea = _normalize(record)
+            if idea is not None:
+                yield idea
+
+
+def idea_key(idea: Dict[str, Any]) -> str:
+    """Stable identity of a source idea, used by the checkpoint."""
+    return hashlib.sha256(f"{idea['title']}\n{idea['raw_text']}".encode("utf-8")).hexdigest()
+
+
+# ── checkpoint ──────────────────────────────────────────────
+
+class Checkpoint:
+    """
+    Append-only record of imported ideas (one JSON line per created page).
+
+    Each line is flushed and fsynced when written, so after a crash at most
+    the pages that were in flight are unaccounted for.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        self._done.add(json.loads(line)["key"])
+                    except (json.JSONDecodeError, KeyError):
+                        continue  # torn final line from a crash
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._done
+
+    def __len__(self) -> int:
+        return len(self._done)
+
+    def record(self, key: str, page_id: str) -> None:
+        with self._lock:
+            self._done.add(key)
+            self._file.write(json.dumps({"key": key, "page_id": page_id}) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+# ── labelling ───────────────────────────────────────────────
+
+class BatchLabeller:
+    """
+    Tags ideas in batches with one LLM call per batch.
+
+    The existing tags are fetched once; tags created by earlier batches are
+    added to the list so later batches reuse them too.
+    """
+
+    def __init__(self, model: Optional[str] = None, tags: Optional[Iterable[str]] = None):
+        if model is None:
+            from agents.label.agent import label
+            model = label.model
+        self.model = model
+        self.tags = set(tags) if tags is not None else set(get_tag_options(get_database_schema()))
+        self._client = None
+
+    def _generate(self, prompt: str) -> str:
+        from google import genai
+        from google.genai import types
+
+        if self._client is None:
+            self._client = genai.Client()
+        response = self._client.models.generate_content(
+            model=self.model,
+            contents=prompt,
+            config=types.GenerateContentConfig(response_mime_type="application/json", temperature=0)
+        )
+        return response.text or ""
+
+    def label(self, ideas: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        Suggest tags for a batch of ideas.
+
+        Args:
+            ideas: Ideas with title and raw_text
+
+        Returns:
+            One tag list per idea, in order
+
+        Raises:
+            ValueError: If the model response cannot be parsed
+        """
+        prompt = BATCH_LABEL_PROMPT.format(
+            existing_tags=json.dumps(sorted(self.tags)),
+            ideas="\n\n".join(
+                f"[{i}] {idea['title']}\n{idea['raw_text'][:LABEL_TEXT_LIMIT]}"
+                for i, idea in enumerate(ideas)
+            )
+        )
+        try:
+            results = json.loads(self._generate(prompt))
+            by_id = {int(item["id"]): [str(tag) for tag in item["tags"]] for item in results}
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Unparseable labelling response: {e}") from e
+
+        suggestions = [by_id.get(i, [])[:5] for i in range(len(ideas))]
+        for tags in suggestions:
+            self.tags.update(tags)
+        return suggestions
+
+
+# ── import ──────────────────────────────────────────────────
+
+class ImportStats:
+    """Counters and per-stage latencies for an import run."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.counts = {"created": 0, "resumed": 0, "duplicates": 0, "failed": 0, "label_failures": 0}
+        self.latencies: Dict[str, List[float]] = {"label_batch": [], "dedupe": [], "create": []}
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counts[name] += n
+
+    def time(self, stage: str, elapsed_s: float) -> None:
+        with self._lock:
+            self.latencies[stage].append(elapsed_s * 1000)
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            elapsed = time.perf_counter() - self.started
+            stages = {}
+            for stage, values in self.latencies.items():
+                if not values:
+                    continue
+                ordered = sorted(values)
+                stages[stage] = {
+                    "count": len(ordered),
+                    "p50_ms": round(statistics.median(ordered), 1),
+                    "p95_ms": round(ordered[max(0, int(len(ordered) * 0.95) - 1)], 1),
+                    "max_ms": round(ordered[-1], 1)
+                }
+            return {
+                **self.counts,
+                "elapsed_s": round(elapsed, 1),
+                "ideas_per_minute": round(self.counts["created"] / elapsed * 60, 1) if elapsed else 0.0,
+                "stages": stages,
+                "rate_limiter": get_scheduler_stats()
+            }
+
+
+def _create(idea: Dict[str, Any], checkpoint: Checkpoint, stats: ImportStats) -> None:
+    """Worker: create one page and checkpoint it."""
+    started = time.perf_counter()
+    # Runs in a pool thread, so the priority is set here rather than by the caller
+    with request_priority(PRIORITY_BACKGROUND):
+        page = create_page(build_idea_properties(
+            idea["title"], idea["description"], idea["raw_text"], idea["tags"]
+        ))
+    stats.time("create", time.perf_counter() - started)
+    checkpoint.record(idea["key"], page["id"])
+    stats.count("created")
+
+
+def bulk_import(
+    ideas: Iterable[Dict[str, Any]],
+    checkpoint: Checkpoint,
+    labeller: Optional[BatchLabeller] = None,
+    workers: int = BULK_IMPORT_WORKERS,
+    batch_size: int = BULK_IMPORT_BATCH_SIZE,
+    allow_duplicates: bool = False,
+    progress_every: int = 100
+) -> Dict[str, Any]:
+    """
+    Import ideas into Notion (see module docstring for the pipeline).
+
+    Args:
+        ideas: Normalized ideas, e.g. from iter_source
+        checkpoint: Checkpoint of already imported ideas
+        labeller: Tags ideas without tags (created on first need if omitted)
+        workers: Concurrent page creations; the rate limiter still bounds throughput
+        batch_size: Ideas per labelling call
+        allow_duplicates: Create ideas even if a near-identical idea exists
+        progress_every: Print progress after this many created ideas (0 = never)
+
+    Returns:
+        The stats report (counts, ideas_per_minute, per-stage latency)
+    """
+    stats = ImportStats()
+    index = None
+    if not allow_duplicates:
+        get_fresh_mirror()
+        index = get_semantic_index()
+
+    in_flight: set = set()
+    next_progress = progress_every
+
+    def drain(limit: int) -> None:
+        nonlocal next_progress
+        while len(in_flight) > limit:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.discard(future)
+                error = future.exception()
+                if error is not None:
+                    stats.count("failed")
+                    print(f"❌ {error}", file=sys.stderr)
+                elif progress_every and stats.counts["created"] >= next_progress:
+                    next_progress += progress_every
+                    report = stats.report()
+                    print(f"… {report['created']} created ({report['ideas_per_minute']} ideas/min)")
+
+    def flush(batch: List[Dict[str, Any]], pool: ThreadPoolExecutor) -> None:
+        nonlocal labeller
+        untagged = [idea for idea in batch if not idea["tags"]]
+        if untagged:
+            if labeller is None:
+                labeller = BatchLabeller()
+            started = time.perf_counter()
+            try:
+                for idea, tags in zip(untagged, labeller.label(untagged)):
+                    idea["tags"] = tags
+            except Exception as e:
+                # Import untagged rather than stall the whole run; tags can be added later
+                stats.count("label_failures", len(untagged))
+                print(f"⚠️ Labelling failed for {len(untagged)} ideas: {e}", file=sys.stderr)
+            stats.time("label_batch", time.perf_counter() - started)
+
+        for idea in batch:
+            if index is not None:
+                started = time.perf_counter()
+                candidate = Idea(title=idea["title"], description=idea["description"], tags=idea["tags"])
+                duplicates = index.find_duplicates(candidate, top_k=1)
+                stats.time("dedupe", time.perf_counter() - started)
+                if duplicates:
+                    stats.count("duplicates")
+                    continue
+            drain(workers * 2)
+            in_flight.add(pool.submit(_create, idea, checkpoint, stats))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bulk-import") as pool:
+        batch: List[Dict[str, Any]] = []
+        for idea in ideas:
+            idea["key"] = idea_key(idea)
+            if idea["key"] in checkpoint:
+                stats.count("resumed")
+                continue
+            batch.append(idea)
+            if len(batch) >= batch_size:
+                flush(batch, pool)
+                batch = []
+        if batch:
+            flush(batch, pool)
+        drain(0)
+
+    return stats.report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Bulk import ideas into the Notion ideas database.")
+    parser.add_argument("source", help="JSONL or Markdown file with ideas")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <source>.checkpoint.jsonl)")
+    parser.add_argument("--workers", type=int, default=BULK_IMPORT_WORKERS)
+    parser.add_argument("--batch-size", type=int, default=BULK_IMPORT_BATCH_SIZE)
+    parser.add_argument("--allow-duplicates", action="store_true",
+                        help="Create ideas even if a near-identical idea already exists")
+    args = parser.parse_args()
+
+    checkpoint = Checkpoint(args.checkpoint or f"{args.source}.checkpoint.jsonl")
+    print(f"📥 Importing {args.source} ({len(checkpoint)} ideas already imported)")
+    try:
+        report = bulk_import(
+            iter_source(args.source),
+            checkpoint,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            allow_duplicates=args.allow_duplicates
+        )
+    except (requests.exceptions.RequestException, ValueError) as e:
+        print(f"❌ Import stopped: {e}\nRerun the same command to resume.")
+        sys.exit(1)
+    finally:
+        checkpoint.close()
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
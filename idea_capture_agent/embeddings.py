@@ -0,0 +1,346 @@
+"""
+Embedding-based semantic index over ideas.
+
+Ideas are embedded into a NumPy matrix (one L2-normalised row per idea) so a
+query is a single matrix-vector product followed by a top-k selection. The
+index follows the local ideas mirror through its listener hook; changed
+ideas are queued and embedded in batches on the next query. Embeddings are
+cached on disk by content hash, so an idea is only re-embedded when its
+text actually changes.
+
+Backends:
+- "local": deterministic feature-hashing embedder, no network (default)
+- "vertex": Vertex AI text-embedding-004, batched like create_vertex.py
+"""
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import os
+import sqlite3
+import threading
+import numpy as np
+from notion_client import Idea
+from idea_mirror import get_mirror
+from search_index import tokenize
+
+IDEA_EMBEDDING_BACKEND = os.getenv("IDEA_EMBEDDING_BACKEND", "local")
+IDEA_EMBEDDING_CACHE_PATH = os.getenv(
+    "IDEA_EMBEDDING_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ideas_embeddings.sqlite3")
+)
+# Cosine similarity at or above which a new idea is treated as a duplicate
+IDEA_DUPLICATE_THRESHOLD = float(os.getenv("IDEA_DUPLICATE_THRESHOLD", "0.9"))
+
+
+class EmbeddingError(Exception):
+    """The embedding backend failed (e.g. a Vertex AI timeout or quota error)."""
+
+
+def idea_text(idea: Idea) -> str:
+    """Text that represents an idea for embedding purposes."""
+    return "\n".join([idea.title, " ".join(idea.tags), idea.description]).strip()
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of embedding input text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class HashingEmbedder:
+    """
+    Deterministic local embedder using the hashing trick.
+
+    Stemmed words and character trigrams are hashed (with a stable hash, not
+    Python's salted hash()) into a fixed number of signed buckets. It captures
+    lexical overlap only, but needs no model or network and gives identical
+    vectors across processes, which is what tests and offline use need.
+    """
+
+    name = "local-hashing-v1"
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+
+    def _features(self, text: str) -> List[Tuple[str, float]]:
+        words = tokenize(text)
+        features = [(f"w:{word}", 1.0) for word in words]
+        for word in words:
+            padded = f"#{word}#"
+            features.extend((f"c:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2))
+        return features
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, weight in self._features(text):
+                digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+                value = int.from_bytes(digest, "little")
+                sign = 1.0 if value & 1 else -1.0
+                vectors[row, (value >> 1) % self.dimensions] += sign * weight
+        return _normalize(vectors)
+
+
+class VertexEmbedder:
+    """Vertex AI text-embedding-004 backend (requires google-cloud-aiplatform)."""
+
+    name = "vertex-text-embedding-004"
+    batch_size = 100  # Batch to stay under request limits
+
+    def __init__(self, model_name: str = "text-embedding-004"):
+        from vertexai.preview import language_models
+        self._model = language_models.TextEmbeddingModel.from_pretrained(model_name)
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = []
+        for i in range(0, len(texts), self.batch_size):
+            batch = texts[i:i + self.batch_size]
+            result = self._model.get_embeddings(batch)
+            vectors.extend(embedding.values for embedding in result)
+        return _normalize(np.asarray(vectors, dtype=np.float32))
+
+
+EMBEDDING_BACKENDS = {
+    "local": HashingEmbedder,
+    "vertex": VertexEmbedder
+}
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+class EmbeddingCache:
+    """On-disk embedding cache keyed by (backend name, content hash)."""
+
+    def __init__(self, path: str = IDEA_EMBEDDING_CACHE_PATH):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "backend TEXT NOT NULL, hash TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (backend, hash))"
+        )
+        self._conn.commit()
+
+    def get_many(self, backend: str, hashes: List[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for digest, blob in self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE backend = ? AND hash IN ({placeholders})",
+                    [backend, *chunk]
+                ):
+                    found[digest] = np.frombuffer(blob, dtype=np.float32)
+        return found
+
+    def put_many(self, backend: str, items: Dict[str, np.ndarray]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (backend, hash, vector) VALUES (?, ?, ?)",
+                [(backend, digest, vector.astype(np.float32).tobytes()) for digest, vector in items.items()]
+            )
+            self._conn.commit()
+
+
+class SemanticIndex:
+    """
+    Matrix of idea embeddings with batched cosine top-k search.
+
+    Rows are kept dense: removing an idea moves the last row into its slot.
+    """
+
+    def __init__(self, embedder: Any, cache: Optional[EmbeddingCache] = None):
+        self.embedder = embedder
+        self.cache = cache
+        self._lock = threading.RLock()
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._rows: Dict[str, int] = {}      # page_id -> row
+        self._page_ids: List[str] = []       # row -> page_id
+        self._hashes: Dict[str, str] = {}    # page_id -> content hash of the embedded text
+        self._pending: Dict[str, Optional[str]] = {}  # page_id -> text to embed (None = remove)
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._flush()
+            return self._size
+
+    # ── updates ─────────────────────────────────────────────
+
+    def queue(self, page_id: str, idea: Optional[Idea]) -> None:
+        """Schedule an idea for (re-)embedding, or removal when idea is None."""
+        with self._lock:
+            self._pending[page_id] = idea_text(idea) if idea is not None else None
+
+    def on_mirror_change(self, page_id: str, idea: Optional[Idea], version: str) -> None:
+        """IdeaMirror listener: queue the change, embed lazily on the next query."""
+        self.queue(page_id, idea)
+
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts, reusing cached vectors for content seen before.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Array of shape (len(texts), dimensions) with unit-length rows
+
+        Raises:
+            EmbeddingError: If the backend fails
+        """
+        hashes = [content_hash(text) for text in texts]
+        cached = self.cache.get_many(self.embedder.name, hashes) if self.cache else {}
+
+        missing = {digest: text for digest, text in zip(hashes, texts) if digest not in cached}
+        if missing:
+            digests = list(missing)
+            try:
+                vectors = self.embedder.embed([missing[digest] for digest in digests])
+            except Exception as e:
+                raise EmbeddingError(f"{self.embedder.name} embedding failed: {e}") from e
+            computed = dict(zip(digests, vectors))
+            if self.cache:
+                self.cache.put_many(self.embedder.name, computed)
+            cached.update(computed)
+
+        if not texts:
+            return np.zeros((0, getattr(self.embedder, "dimensions", 0)), dtype=np.float32)
+        return np.vstack([cached[digest] for digest in hashes])
+
+    def _flush(self) -> None:
+        """Apply queued changes, embedding all new/changed texts in one batch."""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+
+        for page_id, text in pending.items():
+            if text is None:
+                self._remove(page_id)
+
+        to_embed = [
+            (page_id, text) for page_id, text in pending.items()
+            if text is not None and self._hashes.get(page_id) != content_hash(text)
+        ]
+        if not to_embed:
+            return
+
+        try:
+            vectors = self.embed_texts([text for _, text in to_embed])
+        except EmbeddingError:
+            # Keep the changes for the next flush; anything queued since is newer
+            for page_id, text in pending.items():
+                self._pending.setdefault(page_id, text)
+            raise
+        for (page_id, text), vector in zip(to_embed, vectors):
+            self._set_row(page_id, vector)
+            self._hashes[page_id] = content_hash(text)
+
+    def _set_row(self, page_id: str, vector: np.ndarray) -> None:
+        row = self._rows.get(page_id)
+        if row is None:
+            if self._matrix is None:
+                self._matrix = np.zeros((64, vector.shape[0]), dtype=np.float32)
+            elif self._size == self._matrix.shape[0]:
+                grown = np.zeros((self._matrix.shape[0] * 2, self._matrix.shape[1]), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+            row = self._size
+            self._size += 1
+            self._rows[page_id] = row
+            self._page_ids.append(page_id)
+        self._matrix[row] = vector
+
+    def _remove(self, page_id: str) -> None:
+        row = self._rows.pop(page_id, None)
+        self._hashes.pop(page_id, None)
+        if row is None:
+            return
+        last = self._size - 1
+        if row != last:
+            moved = self._page_ids[last]
+            self._matrix[row] = self._matrix[last]
+            self._page_ids[row] = moved
+            self._rows[moved] = row
+        self._page_ids.pop()
+        self._size -= 1
+
+    # ── search ──────────────────────────────────────────────
+
+    def search_vectors(self, queries: np.ndarray, top_k: int = 10) -> List[List[Tuple[str, float]]]:
+        """
+        Cosine top-k for a batch of unit-length query vectors.
+
+        Args:
+            queries: Array of shape (n_queries, dimensions)
+            top_k: Results per query
+
+        Returns:
+            One list of (page_id, similarity) pairs per query, best first
+        """
+        with self._lock:
+            self._flush()
+            if self._size == 0 or top_k <= 0:
+                return [[] for _ in range(len(queries))]
+
+            scores = queries @ self._matrix[:self._size].T
+            k = min(top_k, self._size)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            results = []
+            for query_scores, candidates in zip(scores, top):
+                ordered = candidates[np.argsort(-query_scores[candidates])]
+                results.append([(self._page_ids[row], float(query_scores[row])) for row in ordered])
+            return results
+
+    def search(self, text: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """Cosine top-k for a single query text."""
+        return self.search_vectors(self.embed_texts([text]), top_k)[0]
+
+    def find_duplicates(
+        self,
+        idea: Idea,
+        threshold: float = IDEA_DUPLICATE_THRESHOLD,
+        top_k: int = 3
+    ) -> List[Tuple[str, float]]:
+        """
+        Existing ideas whose embedding is at least `threshold` similar to `idea`.
+
+        Args:
+            idea: Candidate idea with title, description and tags
+            threshold: Minimum cosine similarity
+            top_k: Maximum number of duplicates to report
+
+        Returns:
+            List of (page_id, similarity) pairs, most similar first
+        """
+        return [(page_id, score) for page_id, score in self.search(idea_text(idea), top_k) if score >= threshold]
+
+
+_index: Optional[SemanticIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_semantic_index() -> SemanticIndex:
+    """
+    Return the process-wide semantic index.
+
+    Created on first use with the configured backend, seeded from the mirror
+    and subscribed to mirror changes.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                backend = EMBEDDING_BACKENDS.get(IDEA_EMBEDDING_BACKEND)
+                if backend is None:
+                    raise ValueError(f"Unknown IDEA_EMBEDDING_BACKEND: {IDEA_EMBEDDING_BACKEND}")
+                index = SemanticIndex(backend(), EmbeddingCache())
+                mirror = get_mirror()
+                mirror.add_listener(index.on_mirror_change)
+                for idea in mirror.iter_ideas():
+                    index.queue(idea.page_id, idea)
+                _index = index
+    return _index
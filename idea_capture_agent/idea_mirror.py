@@ -0,0 +1,466 @@
+"""
+Local SQLite mirror of the Notion ideas database.
+
+Reads (listing, searching, sampling) are served from an on-disk copy of
+the database. The copy is refreshed incrementally: each sync only asks Notion
+for pages whose last_edited_time is at or after the newest one already
+mirrored. Pages written through notion_client.create_page/update_page are
+applied to the mirror immediately. Deleted or archived pages never appear in
+a delta, so every IDEA_MIRROR_FULL_SYNC_SECONDS a read starts a full sync in
+the background (at PRIORITY_BACKGROUND), which drops them.
+"""
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from notion_client import (
+    PRIORITY_BACKGROUND,
+    Idea,
+    add_page_listener,
+    iter_database_pages,
+    parse_idea,
+    request_priority,
+)
+
+# Mirror configuration
+IDEA_MIRROR_PATH = os.getenv(
+    "IDEA_MIRROR_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ideas_mirror.sqlite3")
+)
+# Reads trigger a delta sync when the last one is older than this
+IDEA_MIRROR_MAX_AGE_SECONDS = float(os.getenv("IDEA_MIRROR_MAX_AGE_SECONDS", "60"))
+# Deletions and archivals only show up in a full sync; reads start one in the
+# background when the last is older than this
+IDEA_MIRROR_FULL_SYNC_SECONDS = float(os.getenv("IDEA_MIRROR_FULL_SYNC_SECONDS", str(6 * 3600)))
+# Bump when parse_idea output changes, so existing mirrors re-download every page
+MIRROR_PARSER_VERSION = "2"
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ideas (
+    page_id TEXT PRIMARY KEY,
+    title TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    raw_text TEXT NOT NULL DEFAULT '',
+    tags TEXT NOT NULL DEFAULT '[]',
+    created_time TEXT NOT NULL DEFAULT '',
+    last_edited_time TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS ideas_last_edited ON ideas (last_edited_time);
+CREATE TABLE IF NOT EXISTS idea_tags (
+    page_id TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (page_id, tag)
+);
+CREATE INDEX IF NOT EXISTS idea_tags_tag ON idea_tags (tag);
+CREATE TABLE IF NOT EXISTS idea_combinations (
+    page_id TEXT PRIMARY KEY,
+    last_combined_at REAL NOT NULL,
+    times_combined INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+class IdeaMirror:
+    """
+    SQLite-backed copy of the ideas database.
+
+    A single connection is shared between threads and guarded by a lock;
+    every public method is safe to call concurrently.
+    """
+
+    def __init__(self, path: str = IDEA_MIRROR_PATH, max_age_seconds: float = IDEA_MIRROR_MAX_AGE_SECONDS):
+        self.path = path
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.RLock()
+        # Serialises syncs (not reads), so concurrent callers do not fetch the same pages
+        self._sync_lock = threading.Lock()
+        self._full_sync_running = False
+        self._listeners: List[Callable[[str, Optional[Idea], str], None]] = []
+        # Changes listeners hear about once the transaction holding them commits
+        self._pending: List[Tuple[str, Optional[Idea], str]] = []
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        if self._get_meta("parser_version") != MIRROR_PARSER_VERSION:
+            # Rows were parsed differently; the next refresh does a full sync
+            self._conn.execute("DELETE FROM meta WHERE key IN ('sync_cursor', 'last_synced_at')")
+            self._set_meta("parser_version", MIRROR_PARSER_VERSION)
+        self._conn.commit()
+
+    # ── metadata ────────────────────────────────────────────
+
+    def _get_meta(self, key: str, default: Optional[str] = None) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else default
+
+    def _set_meta(self, key: str, value: str) -> None:
+        self._conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    def last_synced_at(self) -> float:
+        """Unix timestamp of the last successful sync (0 if never synced)."""
+        with self._lock:
+            return float(self._get_meta("last_synced_at", "0"))
+
+    def is_stale(self, max_age_seconds: Optional[float] = None) -> bool:
+        """Whether the mirror is older than the freshness bound."""
+        max_age = self.max_age_seconds if max_age_seconds is None else max_age_seconds
+        return time.time() - self.last_synced_at() > max_age
+
+    # ── writes ──────────────────────────────────────────────
+
+    def add_listener(self, callback: Callable[[str, Optional[Idea], str], None]) -> None:
+        """
+        Register a callback fired for every idea inserted, updated or removed.
+
+        Args:
+            callback: Called as callback(page_id, idea, last_edited_time);
+                      idea is None when the page was removed
+        """
+        with self._lock:
+            if callback not in self._listeners:
+                self._listeners.append(callback)
+
+    def _notify(self, page_id: str, idea: Optional[Idea], last_edited_time: str) -> None:
+        self._pending.append((page_id, idea, last_edited_time))
+
+    def _commit(self) -> None:
+        """Commit, then tell the listeners about the committed changes."""
+        self._conn.commit()
+        pending, self._pending = self._pending, []
+        for change in pending:
+            for callback in self._listeners:
+                callback(*change)
+
+    def _rollback(self) -> None:
+        self._conn.rollback()
+        self._pending = []
+
+    def _delete(self, page_ids: List[str]) -> None:
+        self._conn.executemany("DELETE FROM ideas WHERE page_id = ?", [(i,) for i in page_ids])
+        self._conn.executemany("DELETE FROM idea_tags WHERE page_id = ?", [(i,) for i in page_ids])
+        self._conn.executemany("DELETE FROM idea_combinations WHERE page_id = ?", [(i,) for i in page_ids])
+        for page_id in page_ids:
+            self._notify(page_id, None, "")
+
+    def upsert_page(self, page: Dict[str, Any]) -> None:
+        """
+        Insert or replace a single raw Notion page.
+
+        Archived/trashed pages are removed from the mirror instead.
+
+        Args:
+            page: Raw Notion page object
+        """
+        with self._lock:
+            self._upsert(page)
+            self._commit()
+
+    def _upsert(self, page: Dict[str, Any]) -> None:
+        page_id = page.get("id")
+        if not page_id:
+            return
+
+        if page.get("archived") or page.get("in_trash"):
+            self._delete([page_id])
+            return
+
+        idea = parse_idea(page)
+        self._conn.execute(
+            "INSERT INTO ideas (page_id, title, description, raw_text, tags, created_time, last_edited_time) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT(page_id) DO UPDATE SET title = excluded.title, description = excluded.description, "
+            "raw_text = excluded.raw_text, tags = excluded.tags, created_time = excluded.created_time, "
+            "last_edited_time = excluded.last_edited_time",
+            (
+                page_id,
+                idea.title,
+                idea.description,
+                idea.raw_text,
+                json.dumps(idea.tags),
+                idea.created_time,
+                idea.last_edited_time
+            )
+        )
+        self._notify(page_id, idea, idea.last_edited_time)
+        self._conn.execute("DELETE FROM idea_tags WHERE page_id = ?", (page_id,))
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO idea_tags (page_id, tag) VALUES (?, ?)",
+            [(page_id, tag) for tag in idea.tags]
+        )
+
+    def record_combined(self, page_ids: List[str], combined_at: Optional[float] = None) -> None:
+        """
+        Remember that ideas were handed out together for combination.
+
+        Args:
+            page_ids: Notion page IDs of the combined ideas
+            combined_at: Unix timestamp (default: now)
+        """
+        combined_at = time.time() if combined_at is None else combined_at
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO idea_combinations (page_id, last_combined_at) VALUES (?, ?) "
+                "ON CONFLICT(page_id) DO UPDATE SET last_combined_at = excluded.last_combined_at, "
+                "times_combined = times_combined + 1",
+                [(page_id, combined_at) for page_id in page_ids]
+            )
+            self._conn.commit()
+
+    # ── sync ────────────────────────────────────────────────
+
+    def refresh(
+        self,
+        force: bool = False,
+        full: bool = False,
+        max_age_seconds: Optional[float] = None
+    ) -> int:
+        """
+        Bring the mirror up to date with Notion.
+
+        Pages are fetched without holding the mirror's lock, so reads keep
+        being served from the current copy during the sync; the lock is only
+        taken to apply the result.
+
+        Args:
+            force: Sync even if the mirror is within its freshness bound
+            full: Re-download every page and drop ideas no longer in Notion
+                  (catches deletions, which a delta sync cannot see)
+            max_age_seconds: Override for the freshness bound
+
+        Returns:
+            Number of pages pulled from Notion
+
+        Raises:
+            requests.exceptions.RequestException: If a Notion request fails
+        """
+        with self._sync_lock:
+            with self._lock:
+                if not (force or full) and not self.is_stale(max_age_seconds):
+                    return 0
+                since = None if full else self._get_meta("sync_cursor")
+                # Without a cursor every page is downloaded anyway
+                full = full or not since
+                # Ideas written through while the sync runs are not in it, but are not stale
+                known_ids = {row["page_id"] for row in self._conn.execute("SELECT page_id FROM ideas")}
+
+            filter_config = None
+            if since:
+                # on_or_after re-reads pages edited in the same instant; upserts are idempotent
+                filter_config = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {"on_or_after": since}
+                }
+            pages = list(iter_database_pages(
+                filter_config=filter_config,
+                sorts=[{"timestamp": "last_edited_time", "direction": "ascending"}],
+                prefetch=True
+            ))
+
+            with self._lock:
+                try:
+                    newest = since or ""
+                    for page in pages:
+                        newest = max(newest, page.get("last_edited_time", ""))
+                        # A write-through during the sync may have stored a newer version
+                        if (self._version(page.get("id")) or "") <= page.get("last_edited_time", ""):
+                            self._upsert(page)
+
+                    if full:
+                        self._delete(sorted(known_ids - {page.get("id") for page in pages}))
+                        self._set_meta("last_full_sync_at", str(time.time()))
+
+                    if newest:
+                        self._set_meta("sync_cursor", newest)
+                    self._set_meta("last_synced_at", str(time.time()))
+                    self._commit()
+                    return len(pages)
+                except Exception:
+                    self._rollback()
+                    raise
+
+    def _version(self, page_id: Optional[str]) -> Optional[str]:
+        row = self._conn.execute("SELECT last_edited_time FROM ideas WHERE page_id = ?", (page_id,)).fetchone()
+        return row["last_edited_time"] if row else None
+
+    def needs_full_sync(self, interval_seconds: float = IDEA_MIRROR_FULL_SYNC_SECONDS) -> bool:
+        """Whether the last full sync (the only one that sees deletions) is older than the interval."""
+        with self._lock:
+            return time.time() - float(self._get_meta("last_full_sync_at", "0")) > interval_seconds
+
+    def full_sync_in_background(self) -> bool:
+        """
+        Start a full sync in a daemon thread at background priority, unless one is running.
+
+        Returns:
+            Whether a sync was started
+        """
+        with self._lock:
+            if self._full_sync_running:
+                return False
+            self._full_sync_running = True
+
+        def run() -> None:
+            try:
+                with request_priority(PRIORITY_BACKGROUND):
+                    self.refresh(full=True)
+            except Exception as e:
+                logger.warning("Background full sync of the ideas mirror failed: %s", e)
+            finally:
+                with self._lock:
+                    self._full_sync_running = False
+
+        threading.Thread(target=run, name="idea-mirror-full-sync", daemon=True).start()
+        return True
+
+    # ── reads ───────────────────────────────────────────────
+
+    @staticmethod
+    def _row_to_idea(row: sqlite3.Row) -> Idea:
+        return Idea(
+            row["page_id"],
+            row["title"],
+            row["description"],
+            row["raw_text"],
+            json.loads(row["tags"]),
+            row["last_edited_time"],
+            row["created_time"]
+        )
+
+    def list_ideas(self, limit: int = 10, tag: Optional[str] = None) -> List[Idea]:
+        """
+        Most recently edited ideas, optionally restricted to a tag.
+
+        Args:
+            limit: Maximum number of ideas to return
+            tag: Optional tag name the ideas must carry
+
+        Returns:
+            List of Idea records
+        """
+        with self._lock:
+            if tag:
+                rows = self._conn.execute(
+                    "SELECT ideas.* FROM ideas JOIN idea_tags USING (page_id) "
+                    "WHERE idea_tags.tag = ? ORDER BY last_edited_time DESC LIMIT ?",
+                    (tag, limit)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM ideas ORDER BY last_edited_time DESC LIMIT ?",
+                    (limit,)
+                ).fetchall()
+        return [self._row_to_idea(row) for row in rows]
+
+    def iter_ideas(self) -> Iterator[Idea]:
+        """Yield every mirrored idea."""
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM ideas ORDER BY last_edited_time DESC").fetchall()
+        for row in rows:
+            yield self._row_to_idea(row)
+
+    def get_ideas(self, page_ids: List[str]) -> Dict[str, Idea]:
+        """
+        Look up ideas by page ID.
+
+        Args:
+            page_ids: Notion page IDs
+
+        Returns:
+            Dictionary mapping page_id to Idea (missing IDs are omitted)
+        """
+        ideas = {}
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(page_ids), 500):
+                chunk = page_ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                for row in self._conn.execute(
+                    f"SELECT * FROM ideas WHERE page_id IN ({placeholders})", chunk
+                ):
+                    ideas[row["page_id"]] = self._row_to_idea(row)
+        return ideas
+
+    def iter_versions(self) -> Iterator[Tuple[str, str]]:
+        """Yield (page_id, last_edited_time) for every mirrored idea."""
+        with self._lock:
+            rows = self._conn.execute("SELECT page_id, last_edited_time FROM ideas").fetchall()
+        for row in rows:
+            yield row["page_id"], row["last_edited_time"]
+
+    def iter_sampling_rows(self) -> Iterator[Tuple[str, List[str], str, Optional[float]]]:
+        """
+        Yield the fields needed to sample ideas, without their text.
+
+        Yields:
+            (page_id, tags, last_edited_time, last_combined_at or None)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT ideas.page_id, tags, last_edited_time, last_combined_at "
+                "FROM ideas LEFT JOIN idea_combinations USING (page_id)"
+            ).fetchall()
+        for row in rows:
+            yield row["page_id"], json.loads(row["tags"]), row["last_edited_time"], row["last_combined_at"]
+
+    def count(self) -> int:
+        """Number of mirrored ideas."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM ideas").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_mirror: Optional[IdeaMirror] = None
+_mirror_lock = threading.Lock()
+
+
+def get_mirror() -> IdeaMirror:
+    """Return the process-wide ideas mirror, opening it on first use."""
+    global _mirror
+    if _mirror is None:
+        with _mirror_lock:
+            if _mirror is None:
+                _mirror = IdeaMirror()
+    return _mirror
+
+
+def get_fresh_mirror(max_age_seconds: Optional[float] = None) -> IdeaMirror:
+    """
+    Return the mirror after syncing it if it is older than the freshness bound.
+
+    Args:
+        max_age_seconds: Override for IDEA_MIRROR_MAX_AGE_SECONDS
+
+    Raises:
+        requests.exceptions.RequestException: If the sync fails
+    """
+    mirror = get_mirror()
+    mirror.refresh(max_age_seconds=max_age_seconds)
+    if mirror.needs_full_sync():
+        mirror.full_sync_in_background()
+    return mirror
+
+
+def _on_page_written(page: Dict[str, Any]) -> None:
+    """Write-through hook: apply pages created/updated via notion_client."""
+    get_mirror().upsert_page(page)
+
+
+add_page_listener(_on_page_written)
@@ -0,0 +1,245 @@
+"""
+Random sampling over every idea for alchemy.
+
+The sampler keeps a compact in-memory index of the mirrored ideas (page ID,
+tags, last edit and last combination time), kept current through the
+mirror's listener hook. A draw picks page IDs from that index; only the
+chosen ideas are then loaded from the mirror.
+
+Strategies:
+- "uniform": every idea equally likely
+- "recent": favours recently edited ideas (weight halves every
+  IDEA_SAMPLER_RECENCY_HALF_LIFE_DAYS)
+- "least_combined": favours ideas that were never, or not recently, handed
+  out for combination
+A tag can be given with any strategy to make ideas carrying it
+IDEA_SAMPLER_TAG_BOOST times more likely.
+"""
+from typing import Dict, List, Optional, Set
+from datetime import datetime
+import os
+import random
+import threading
+import time
+import numpy as np
+from notion_client import Idea
+from idea_mirror import IdeaMirror, get_mirror
+
+IDEA_SAMPLER_RECENCY_HALF_LIFE_DAYS = float(os.getenv("IDEA_SAMPLER_RECENCY_HALF_LIFE_DAYS", "30"))
+# An idea combined this many days ago is half as likely as a never-combined one
+IDEA_SAMPLER_COMBINED_HALF_LIFE_DAYS = float(os.getenv("IDEA_SAMPLER_COMBINED_HALF_LIFE_DAYS", "7"))
+IDEA_SAMPLER_TAG_BOOST = float(os.getenv("IDEA_SAMPLER_TAG_BOOST", "5"))
+
+SAMPLING_STRATEGIES = ("uniform", "recent", "least_combined")
+
+_DAY_SECONDS = 86400.0
+
+
+def _timestamp(iso_time: str) -> float:
+    """Unix timestamp of a Notion ISO time (0 if missing)."""
+    if not iso_time:
+        return 0.0
+    return datetime.fromisoformat(iso_time.replace("Z", "+00:00")).timestamp()
+
+
+class IdeaSampler:
+    """
+    Page-ID index with uniform and weighted sampling without replacement.
+
+    Entries are kept in dense parallel lists (removal moves the last entry
+    into the freed slot), so uniform draws are O(count) and weighted draws
+    are one vectorised pass over the index.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._page_ids: List[str] = []            # row -> page_id
+        self._rows: Dict[str, int] = {}           # page_id -> row
+        self._edited: List[float] = []            # row -> last edit timestamp
+        self._combined: Dict[str, float] = {}     # page_id -> last combined timestamp
+        self._by_tag: Dict[str, Set[str]] = {}    # tag -> page_ids
+        self._tags: Dict[str, List[str]] = {}     # page_id -> tags
+
+    def __len__(self) -> int:
+        return len(self._page_ids)
+
+    # ── updates ─────────────────────────────────────────────
+
+    def set(self, page_id: str, tags: List[str], last_edited_time: str) -> None:
+        """Add or update an idea in the index."""
+        with self._lock:
+            self._untag(page_id)
+            row = self._rows.get(page_id)
+            if row is None:
+                self._rows[page_id] = len(self._page_ids)
+                self._page_ids.append(page_id)
+                self._edited.append(_timestamp(last_edited_time))
+            else:
+                self._edited[row] = _timestamp(last_edited_time)
+            self._tags[page_id] = list(tags)
+            for tag in tags:
+                self._by_tag.setdefault(tag, set()).add(page_id)
+
+    def remove(self, page_id: str) -> None:
+        """Drop an idea from the index."""
+        with self._lock:
+            row = self._rows.pop(page_id, None)
+            if row is None:
+                return
+            self._untag(page_id)
+            self._combined.pop(page_id, None)
+            last = len(self._page_ids) - 1
+            if row != last:
+                moved = self._page_ids[last]
+                self._page_ids[row] = moved
+                self._edited[row] = self._edited[last]
+                self._rows[moved] = row
+            self._page_ids.pop()
+            self._edited.pop()
+
+    def _untag(self, page_id: str) -> None:
+        for tag in self._tags.pop(page_id, []):
+            members = self._by_tag.get(tag)
+            if members is not None:
+                members.discard(page_id)
+                if not members:
+                    del self._by_tag[tag]
+
+    def on_mirror_change(self, page_id: str, idea: Optional[Idea], version: str) -> None:
+        """IdeaMirror listener."""
+        if idea is None:
+            self.remove(page_id)
+        else:
+            self.set(page_id, idea.tags, version)
+
+    def sync_with(self, mirror: IdeaMirror) -> None:
+        """Load every mirrored idea, with its combination history."""
+        with self._lock:
+            for page_id, tags, last_edited_time, combined_at in mirror.iter_sampling_rows():
+                self.set(page_id, tags, last_edited_time)
+                if combined_at is not None:
+                    self._combined[page_id] = combined_at
+
+    def mark_combined(self, page_ids: List[str], combined_at: Optional[float] = None) -> None:
+        """Record that ideas were handed out for combination (used by "least_combined")."""
+        combined_at = time.time() if combined_at is None else combined_at
+        with self._lock:
+            for page_id in page_ids:
+                if page_id in self._rows:
+                    self._combined[page_id] = combined_at
+
+    # ── sampling ────────────────────────────────────────────
+
+    def sample(
+        self,
+        count: int,
+        exclude: Optional[Set[str]] = None,
+        strategy: str = "uniform",
+        tag: Optional[str] = None
+    ) -> List[str]:
+        """
+        Draw distinct page IDs.
+
+        Args:
+            count: Number of ideas to draw
+            exclude: Page IDs that must not be drawn
+            strategy: One of SAMPLING_STRATEGIES
+            tag: Optional tag whose ideas are IDEA_SAMPLER_TAG_BOOST times more likely
+
+        Returns:
+            `count` page IDs in draw order
+
+        Raises:
+            ValueError: If the strategy is unknown or fewer than `count` ideas are available
+        """
+        if strategy not in SAMPLING_STRATEGIES:
+            raise ValueError(f"Unknown strategy '{strategy}', expected one of {', '.join(SAMPLING_STRATEGIES)}")
+        exclude = exclude or set()
+
+        with self._lock:
+            available = len(self._page_ids) - sum(1 for page_id in exclude if page_id in self._rows)
+            if available < count:
+                raise ValueError(f"Not enough ideas in database. Have {available}, need {count}")
+            if count <= 0:
+                return []
+            if strategy == "uniform" and not tag:
+                return self._sample_uniform(count, exclude, available)
+            return self._sample_weighted(count, exclude, self._weights(strategy, tag))
+
+    def _sample_uniform(self, count: int, exclude: Set[str], available: int) -> List[str]:
+        if available < 2 * count or 2 * available < len(self._page_ids):
+            # Rejection would mostly miss; draw from the explicit candidates instead
+            candidates = [page_id for page_id in self._page_ids if page_id not in exclude]
+            return random.sample(candidates, count)
+
+        chosen: List[str] = []
+        seen: Set[str] = set()
+        while len(chosen) < count:
+            page_id = self._page_ids[random.randrange(len(self._page_ids))]
+            if page_id in exclude or page_id in seen:
+                continue
+            seen.add(page_id)
+            chosen.append(page_id)
+        return chosen
+
+    def _weights(self, strategy: str, tag: Optional[str]) -> np.ndarray:
+        now = time.time()
+        if strategy == "recent":
+            age_days = (now - np.asarray(self._edited)) / _DAY_SECONDS
+            weights = 0.5 ** (np.maximum(age_days, 0) / IDEA_SAMPLER_RECENCY_HALF_LIFE_DAYS)
+        elif strategy == "least_combined":
+            weights = np.ones(len(self._page_ids))
+            for page_id, combined_at in self._combined.items():
+                days = max(now - combined_at, 0) / _DAY_SECONDS
+                weights[self._rows[page_id]] = 1 - 0.5 ** (days / IDEA_SAMPLER_COMBINED_HALF_LIFE_DAYS)
+        else:
+            weights = np.ones(len(self._page_ids))
+
+        # Keep every idea drawable, however low its weight
+        weights = np.maximum(weights, 1e-6)
+        for page_id in self._by_tag.get(tag, ()) if tag else ():
+            weights[self._rows[page_id]] *= IDEA_SAMPLER_TAG_BOOST
+        return weights
+
+    def _sample_weighted(self, count: int, exclude: Set[str], weights: np.ndarray) -> List[str]:
+        for page_id in exclude:
+            row = self._rows.get(page_id)
+            if row is not None:
+                weights[row] = 0.0
+
+        # Efraimidis-Spirakis: the `count` largest u^(1/w) keys are a weighted
+        # sample without replacement; log(u)/w gives the same order stably
+        with np.errstate(divide="ignore"):
+            keys = np.log(np.random.random_sample(len(weights))) / weights
+        top = np.argpartition(-keys, count - 1)[:count]
+        return [self._page_ids[row] for row in top[np.argsort(-keys[top])]]
+
+
+_sampler: Optional[IdeaSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_sampler() -> IdeaSampler:
+    """
+    Return the process-wide sampler.
+
+    Built from the mirror on first use and kept current through its
+    listener hook.
+    """
+    global _sampler
+    if _sampler is None:
+        with _sampler_lock:
+            if _sampler is None:
+                sampler = IdeaSampler()
+                mirror = get_mirror()
+                mirror.add_listener(sampler.on_mirror_change)
+                sampler.sync_with(mirror)
+                _sampler = sampler
+    return _sampler
+
+
+def mark_combined(page_ids: List[str]) -> None:
+    """Record a combination in the sampler and persist it in the mirror."""
+    combined_at = time.time()
+    get_sampler().mark_combined(page_ids, combined_at)
+    get_mirror().record_combined(page_ids, combined_at)
@@ -2,9 +2,19 @@
 Centralized Notion API client for idea management.
 Provides reusable functions for interacting with the Notion API.
 """
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+import bisect
+import contextvars
+import heapq
+import itertools
 import os
+import random
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -22,6 +32,163 @@ HEADERS = {
     "Notion-Version": NOTION_API_VERSION
 }
 
+# Connection pool configuration. Notion is a single host, so pool_connections
+# bounds the number of per-host pools and pool_maxsize bounds the keep-alive
+# connections held open per host (roughly the number of concurrent callers).
+NOTION_POOL_CONNECTIONS = int(os.getenv("NOTION_POOL_CONNECTIONS", "4"))
+NOTION_POOL_MAXSIZE = int(os.getenv("NOTION_POOL_MAXSIZE", "10"))
+
+# How long a fetched database schema (and its tag options) is served from cache
+NOTION_SCHEMA_TTL_SECONDS = float(os.getenv("NOTION_SCHEMA_TTL_SECONDS", "300"))
+
+# Request scheduling. Notion allows roughly 3 requests/second per integration;
+# every call waits for a token from a shared bucket refilled at this rate.
+NOTION_RATE_LIMIT_PER_SECOND = float(os.getenv("NOTION_RATE_LIMIT_PER_SECOND", "3"))
+NOTION_RATE_LIMIT_BURST = float(os.getenv("NOTION_RATE_LIMIT_BURST", "3"))
+NOTION_MAX_RETRIES = int(os.getenv("NOTION_MAX_RETRIES", "5"))
+NOTION_BACKOFF_BASE_SECONDS = float(os.getenv("NOTION_BACKOFF_BASE_SECONDS", "0.5"))
+NOTION_BACKOFF_MAX_SECONDS = float(os.getenv("NOTION_BACKOFF_MAX_SECONDS", "30"))
+
+# Notion limits for page content writes
+NOTION_RICH_TEXT_LIMIT = 2000      # characters per rich_text object
+NOTION_RICH_TEXT_PER_BLOCK = 100   # rich_text objects per block
+NOTION_APPEND_BLOCK_LIMIT = 100    # children per append request
+
+# Request priorities (lower is served first)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+# Status codes worth retrying: rate limited, plus transient server errors
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Upper bounds (milliseconds) of the request latency histogram buckets
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+# Callbacks notified with the page object returned by create_page/update_page
+_page_listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+# Process-wide database schema cache
+_schema_lock = threading.Lock()
+_schema_cache: Dict[str, Any] = {"schema": None, "etag": None, "fetched_at": 0.0, "tags": frozenset()}
+_schema_stats = {"hits": 0, "misses": 0, "revalidated": 0, "invalidations": 0}
+
+_request_priority: contextvars.ContextVar[int] = contextvars.ContextVar(
+    "notion_request_priority", default=PRIORITY_INTERACTIVE
+)
+
+_stats_lock = threading.Lock()
+_latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+_request_count = 0
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared, pooled HTTP session used for every Notion API call.
+
+    The session is created lazily on first use and keeps connections to
+    api.notion.com alive between calls, so consecutive tool invocations skip
+    the TCP/TLS handshake. requests.Session is safe to share between threads
+    for this usage; the lock only guards its creation.
+
+    Returns:
+        The process-wide requests.Session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(HEADERS)
+                adapter = HTTPAdapter(
+                    pool_connections=NOTION_POOL_CONNECTIONS,
+                    pool_maxsize=NOTION_POOL_MAXSIZE
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def close_session() -> None:
+    """Close the shared session and drop its pooled connections."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+def add_page_listener(callback: Callable[[Dict[str, Any]], None]) -> None:
+    """
+    Register a callback that receives every page written through this module.
+
+    Used by local caches (e.g. the ideas mirror) to stay consistent with
+    create_page/update_page without another round trip to Notion.
+
+    Args:
+        callback: Function called with the raw Notion page object
+    """
+    if callback not in _page_listeners:
+        _page_listeners.append(callback)
+
+
+def _notify_page_written(page: Dict[str, Any]) -> None:
+    """Pass a freshly written page to every registered listener."""
+    for callback in list(_page_listeners):
+        callback(page)
+
+
+def _record_latency(elapsed_ms: float) -> None:
+    """Add a request duration to the latency histogram."""
+    global _request_count
+    bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, elapsed_ms)
+    with _stats_lock:
+        _latency_counts[bucket] += 1
+        _request_count += 1
+
+
+def get_client_stats() -> Dict[str, Any]:
+    """
+    Report connection reuse and latency counters for the shared session.
+
+    Returns:
+        Dictionary containing:
+        - requests: Number of Notion API requests made
+        - connections_opened: New TCP/TLS connections established
+        - connections_reused: Requests served over an already open connection
+        - latency_histogram_ms: Request counts keyed by bucket upper bound
+          ("+Inf" collects anything slower than the last bucket)
+    """
+    opened = 0
+    pool_requests = 0
+    session = _session
+    if session is not None:
+        # The same adapter is mounted for http:// and https://
+        for adapter in {id(a): a for a in session.adapters.values()}.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    pool_requests += pool.num_requests
+
+    with _stats_lock:
+        counts = list(_latency_counts)
+        request_count = _request_count
+
+    histogram = {str(bound): count for bound, count in zip(LATENCY_BUCKETS_MS, counts)}
+    histogram["+Inf"] = counts[-1]
+
+    return {
+        "requests": request_count,
+        "connections_opened": opened,
+        "connections_reused": max(0, pool_requests - opened),
+        "latency_histogram_ms": histogram
+    }
+
 
 def validate_config() -> None:
     """
@@ -61,6 +228,367 @@ def _handle_response(response: requests.Response) -> Dict[str, Any]:
     return response.json()
 
 
+class RequestScheduler:
+    """
+    Token-bucket rate limiter with a priority queue of waiting callers.
+
+    Tokens refill continuously at `rate` per second up to `burst`. Waiting
+    callers are served strictly by (priority, arrival order), so a
+    user-facing read queued behind a background sync goes first. pause()
+    blocks all callers, e.g. for the duration of a 429 Retry-After.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._cond = threading.Condition()
+        self._waiting: List[tuple] = []
+        self._sequence = itertools.count()
+        self._stats = {
+            "acquired": 0,
+            "max_queue_depth": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "retries": 0,
+            "rate_limited": 0
+        }
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """
+        Block until the caller may send a request.
+
+        Args:
+            priority: Lower values are served first
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        with self._cond:
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, entry)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._waiting))
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                if self._waiting[0] is entry:
+                    if now >= self._paused_until and self._tokens >= 1:
+                        heapq.heappop(self._waiting)
+                        self._tokens -= 1
+                        # Wake the next caller in line
+                        self._cond.notify_all()
+                        break
+                    delay = max(self._paused_until - now, (1 - self._tokens) / self.rate, 0.001)
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+
+            waited = time.monotonic() - started
+            self._stats["acquired"] += 1
+            self._stats["total_wait_seconds"] += waited
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+            return waited
+
+    def try_acquire(self, priority: int = PRIORITY_INTERACTIVE) -> bool:
+        """
+        Take a token without waiting, if one is free and nobody is queued.
+
+        Args:
+            priority: Lower values are served first
+
+        Returns:
+            True if a token was taken
+        """
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            if self._waiting or now < self._paused_until or self._tokens < 1:
+                return False
+            self._tokens -= 1
+            self._stats["acquired"] += 1
+            return True
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (e.g. after a 429)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def record_retry(self, rate_limited: bool) -> None:
+        with self._cond:
+            self._stats["retries"] += 1
+            if rate_limited:
+                self._stats["rate_limited"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats)
+            stats["queue_depth"] = len(self._waiting)
+        acquired = stats["acquired"]
+        stats["avg_wait_ms"] = stats["total_wait_seconds"] * 1000 / acquired if acquired else 0.0
+        stats["max_wait_ms"] = stats.pop("max_wait_seconds") * 1000
+        return stats
+
+
+_scheduler = RequestScheduler(NOTION_RATE_LIMIT_PER_SECOND, NOTION_RATE_LIMIT_BURST)
+
+
+@contextmanager
+def request_priority(priority: int) -> Iterator[None]:
+    """
+    Run the enclosed Notion calls at the given scheduler priority.
+
+    Example:
+        with request_priority(PRIORITY_BACKGROUND):
+            mirror.refresh(full=True)
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def get_scheduler_stats() -> Dict[str, Any]:
+    """
+    Report request scheduler metrics.
+
+    Returns:
+        Dictionary with queue_depth (callers waiting now), max_queue_depth,
+        acquired, avg_wait_ms, max_wait_ms, total_wait_seconds, retries and
+        rate_limited (429 responses)
+    """
+    return _scheduler.stats()
+
+
+def _retry_delay(attempt: int, response: Optional[requests.Response]) -> float:
+    """Seconds to wait before retry number `attempt` (1-based)."""
+    if response is not None and response.status_code == 429:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return min(float(retry_after), NOTION_BACKOFF_MAX_SECONDS)
+        except (TypeError, ValueError):
+            pass
+    # Exponential backoff with full jitter
+    ceiling = min(NOTION_BACKOFF_MAX_SECONDS, NOTION_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    return random.uniform(0, ceiling)
+
+
+def _send(method: str, path: str, timeout: float = 10.0, **kwargs: Any) -> requests.Response:
+    """
+    Send a request to the Notion API over the shared session.
+
+    Every attempt first waits for a token from the rate limiter, at the
+    priority set by request_priority(). 429 responses are retried after
+    their Retry-After delay (pausing all callers meanwhile). Transient
+    server and connection errors are retried with exponential backoff and
+    jitter, but only for requests that are safe to repeat.
+
+    Args:
+        method: HTTP method (GET, POST, PATCH, ...)
+        path: API path relative to NOTION_BASE_URL (e.g. "pages/<id>")
+        timeout: Request timeout in seconds
+        **kwargs: Extra arguments passed to requests (json, params, headers, ...)
+
+    Returns:
+        The raw response (status is not checked)
+
+    Raises:
+        requests.exceptions.RequestException: If the request cannot be sent
+    """
+    # Queries are POSTs but only read; PATCHing properties is idempotent,
+    # but appending block children is not (a retry would append twice)
+    idempotent = (
+        method == "GET"
+        or path.endswith("/query")
+        or (method == "PATCH" and not path.endswith("/children"))
+    )
+    priority = _request_priority.get()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        _scheduler.acquire(priority)
+        started = time.perf_counter()
+        try:
+            response = get_session().request(
+                method,
+                f"{NOTION_BASE_URL}/{path}",
+                timeout=timeout,
+                **kwargs
+            )
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if not idempotent or attempt > NOTION_MAX_RETRIES:
+                raise
+            _scheduler.record_retry(rate_limited=False)
+            time.sleep(_retry_delay(attempt, None))
+            continue
+        finally:
+            _record_latency((time.perf_counter() - started) * 1000)
+
+        if response.status_code not in RETRYABLE_STATUS_CODES or attempt > NOTION_MAX_RETRIES:
+            return response
+
+        rate_limited = response.status_code == 429
+        if not rate_limited and not idempotent:
+            return response
+
+        delay = _retry_delay(attempt, response)
+        response.close()
+        _scheduler.record_retry(rate_limited)
+        if rate_limited:
+            # Notion rejected the integration as a whole; hold everyone back
+            _scheduler.pause(delay)
+        else:
+            time.sleep(delay)
+
+
+def _request(method: str, path: str, timeout: float = 10.0, **kwargs: Any) -> Dict[str, Any]:
+    """
+    Send a request to the Notion API and parse the JSON response.
+
+    Args:
+        method: HTTP method (GET, POST, PATCH, ...)
+        path: API path relative to NOTION_BASE_URL (e.g. "pages/<id>")
+        timeout: Request timeout in seconds
+        **kwargs: Extra arguments passed to requests (json, params, ...)
+
+    Returns:
+        Parsed JSON response
+
+    Raises:
+        requests.exceptions.RequestException: If the request fails
+    """
+    return _handle_response(_send(method, path, timeout=timeout, **kwargs))
+
+
+def _join_rich_text(fragments: List[Dict[str, Any]]) -> str:
+    """Concatenate every fragment of a Notion rich_text/title array."""
+    try:
+        # API responses always carry plain_text (covers mentions and equations too)
+        return "".join([fragment["plain_text"] for fragment in fragments])
+    except KeyError:
+        # Request-shaped fragments (e.g. echoed properties) only have text.content
+        return "".join([fragment.get("text", {}).get("content", "") for fragment in fragments])
+
+
+class Idea:
+    """
+    Parsed idea record.
+
+    description and raw_text are kept as the page's rich_text fragments
+    until first read, so ideas that are only filtered or indexed by title
+    and tags never pay for joining their text.
+    """
+
+    __slots__ = ("page_id", "title", "tags", "last_edited_time", "created_time", "_description", "_raw_text")
+
+    def __init__(
+        self,
+        page_id: str = "",
+        title: str = "Untitled",
+        description: Any = "",
+        raw_text: Any = "",
+        tags: Optional[List[str]] = None,
+        last_edited_time: str = "",
+        created_time: str = ""
+    ):
+        self.page_id = page_id
+        self.title = title
+        self.tags = tags if tags is not None else []
+        self.last_edited_time = last_edited_time
+        self.created_time = created_time
+        # Either the text or the list of rich_text fragments it is joined from
+        self._description = description
+        self._raw_text = raw_text
+
+    @property
+    def description(self) -> str:
+        value = self._description
+        if value.__class__ is not str:
+            value = self._description = _join_rich_text(value)
+        return value
+
+    @property
+    def raw_text(self) -> str:
+        value = self._raw_text
+        if value.__class__ is not str:
+            value = self._raw_text = _join_rich_text(value)
+        return value
+
+    def to_dict(self, **extra: Any) -> Dict[str, Any]:
+        """
+        Tool-output dictionary (page_id, title, description, tags, raw_text).
+
+        Args:
+            **extra: Additional keys to include (e.g. score)
+        """
+        description = self._description
+        if description.__class__ is not str:
+            description = self.description
+        raw_text = self._raw_text
+        if raw_text.__class__ is not str:
+            raw_text = self.raw_text
+        result = {
+            "page_id": self.page_id,
+            "title": self.title,
+            "description": description,
+            "tags": list(self.tags),
+            "raw_text": raw_text
+        }
+        if extra:
+            result.update(extra)
+        return result
+
+    def __repr__(self) -> str:
+        return f"Idea(page_id={self.page_id!r}, title={self.title!r}, tags={self.tags!r})"
+
+
+def parse_idea(page: Dict[str, Any]) -> Idea:
+    """
+    Parse a Notion page object into an Idea.
+
+    Each property is looked up once; description and raw text are joined
+    lazily from all of their rich_text fragments (Notion splits long or
+    formatted text into several), not just the first.
+
+    Args:
+        page: Raw Notion page object from API response
+
+    Returns:
+        The parsed Idea
+    """
+    properties = page.get("properties") or {}
+
+    title_property = properties.get("Title")
+    title_fragments = title_property.get("title") if title_property else None
+    desc_property = properties.get("Description")
+    raw_property = properties.get("Raw Text")
+    tags_property = properties.get("Tags")
+
+    title = _join_rich_text(title_fragments) if title_fragments else "Untitled"
+    description = (desc_property.get("rich_text") or "") if desc_property else ""
+    raw_text = (raw_property.get("rich_text") or "") if raw_property else ""
+    tags = [tag["name"] for tag in tags_property.get("multi_select") or ()] if tags_property else []
+
+    return Idea(
+        page.get("id", ""),
+        title,
+        description,
+        raw_text,
+        tags,
+        page.get("last_edited_time", ""),
+        page.get("created_time", "")
+    )
+
+
 def parse_idea_from_page(page: Dict[str, Any]) -> Dict[str, Any]:
     """
     Extract and parse idea properties from a Notion page object.
@@ -76,48 +604,30 @@ def parse_idea_from_page(page: Dict[str, Any]) -> Dict[str, Any]:
         - tags: List of tag names
         - raw_text: Raw text content
     """
-    properties = page.get("properties", {})
-
-    # Extract title
-    title_property = properties.get("Title", {}).get("title", [])
-    title = title_property[0].get("text", {}).get("content", "") if title_property else "Untitled"
-
-    # Extract description
-    desc_property = properties.get("Description", {}).get("rich_text", [])
-    description = desc_property[0].get("text", {}).get("content", "") if desc_property else ""
-
-    # Extract tags
-    tags_property = properties.get("Tags", {}).get("multi_select", [])
-    tags = [tag.get("name", "") for tag in tags_property]
-
-    # Extract raw text
-    raw_property = properties.get("Raw Text", {}).get("rich_text", [])
-    raw_text = raw_property[0].get("text", {}).get("content", "") if raw_property else ""
-
-    return {
-        "page_id": page.get("id", ""),
-        "title": title,
-        "description": description,
-        "tags": tags,
-        "raw_text": raw_text
-    }
+    return parse_idea(page).to_dict()
 
 
 def query_database(
     page_size: int = 100,
     filter_config: Optional[Dict[str, Any]] = None,
-    timeout: float = 10.0
+    timeout: float = 10.0,
+    start_cursor: Optional[str] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None
 ) -> Dict[str, Any]:
     """
     Query the Notion database with optional filters.
 
+    Returns a single page of results; use iter_database to walk every page.
+
     Args:
         page_size: Number of results to return (1-100)
         filter_config: Optional Notion filter object
         timeout: Request timeout in seconds
+        start_cursor: Optional cursor from a previous response's next_cursor
+        sorts: Optional list of Notion sort objects
 
     Returns:
-        Raw JSON response from Notion API
+        Raw JSON response from Notion API (includes has_more and next_cursor)
 
     Raises:
         requests.exceptions.RequestException: If the request fails
@@ -131,14 +641,112 @@ def query_database(
     payload = {"page_size": page_size}
     if filter_config:
         payload["filter"] = filter_config
+    if sorts:
+        payload["sorts"] = sorts
+    if start_cursor:
+        payload["start_cursor"] = start_cursor
 
-    response = requests.post(
-        f"{NOTION_BASE_URL}/databases/{NOTION_DATABASE_ID}/query",
-        headers=HEADERS,
+    return _request(
+        "POST",
+        f"databases/{NOTION_DATABASE_ID}/query",
         json=payload,
         timeout=timeout
     )
-    return _handle_response(response)
+
+
+def iter_database_pages(
+    filter_config: Optional[Dict[str, Any]] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None,
+    page_size: int = 100,
+    prefetch: bool = False,
+    timeout: float = 10.0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily iterate over every raw page in the Notion database.
+
+    Follows has_more/next_cursor one request at a time, so a caller that stops
+    iterating early never fetches the remaining pages. With prefetch enabled
+    the next batch is requested in a background thread while the current one
+    is being consumed.
+
+    Args:
+        filter_config: Optional Notion filter object
+        sorts: Optional list of Notion sort objects
+        page_size: Number of results per request (1-100)
+        prefetch: Fetch the next batch concurrently with processing the current one
+        timeout: Request timeout in seconds
+
+    Yields:
+        Raw Notion page objects
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    def fetch(cursor: Optional[str]) -> Dict[str, Any]:
+        return query_database(
+            page_size=page_size,
+            filter_config=filter_config,
+            timeout=timeout,
+            start_cursor=cursor,
+            sorts=sorts
+        )
+
+    if not prefetch:
+        cursor = None
+        while True:
+            result = fetch(cursor)
+            yield from result.get("results", [])
+            if not result.get("has_more") or not result.get("next_cursor"):
+                return
+            cursor = result["next_cursor"]
+
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-prefetch")
+    pending = None
+    try:
+        result = fetch(None)
+        while True:
+            cursor = result.get("next_cursor") if result.get("has_more") else None
+            # Run the prefetch with the caller's context so it keeps its request priority
+            pending = executor.submit(contextvars.copy_context().run, fetch, cursor) if cursor else None
+            yield from result.get("results", [])
+            if pending is None:
+                return
+            result = pending.result()
+            pending = None
+    finally:
+        # Caller stopped early: drop the in-flight request instead of waiting on it
+        if pending is not None:
+            pending.cancel()
+        executor.shutdown(wait=False)
+
+
+def iter_database(
+    filter_config: Optional[Dict[str, Any]] = None,
+    sorts: Optional[List[Dict[str, Any]]] = None,
+    page_size: int = 100,
+    prefetch: bool = False,
+    timeout: float = 10.0
+) -> Iterator[Idea]:
+    """
+    Lazily iterate over every idea in the Notion database.
+
+    Same as iter_database_pages, but yields parsed ideas (see parse_idea).
+
+    Args:
+        filter_config: Optional Notion filter object
+        sorts: Optional list of Notion sort objects
+        page_size: Number of results per request (1-100)
+        prefetch: Fetch the next batch concurrently with processing the current one
+        timeout: Request timeout in seconds
+
+    Yields:
+        Parsed Idea records
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    for page in iter_database_pages(filter_config, sorts, page_size, prefetch, timeout):
+        yield parse_idea(page)
 
 
 def get_page(page_id: str, timeout: float = 10.0) -> Dict[str, Any]:
@@ -157,12 +765,7 @@ def get_page(page_id: str, timeout: float = 10.0) -> Dict[str, Any]:
     """
     validate_config()
 
-    response = requests.get(
-        f"{NOTION_BASE_URL}/pages/{page_id}",
-        headers=HEADERS,
-        timeout=timeout
-    )
-    return _handle_response(response)
+    return _request("GET", f"pages/{page_id}", timeout=timeout)
 
 
 def update_page(
@@ -188,13 +791,10 @@ def update_page(
 
     payload = {"properties": properties}
 
-    response = requests.patch(
-        f"{NOTION_BASE_URL}/pages/{page_id}",
-        headers=HEADERS,
-        json=payload,
-        timeout=timeout
-    )
-    return _handle_response(response)
+    page = _request("PATCH", f"pages/{page_id}", json=payload, timeout=timeout)
+    _invalidate_schema_on_new_tags(properties)
+    _notify_page_written(page)
+    return page
 
 
 def create_page(
@@ -221,21 +821,208 @@ def create_page(
         "properties": properties
     }
 
-    response = requests.post(
-        f"{NOTION_BASE_URL}/pages",
-        headers=HEADERS,
-        json=payload,
-        timeout=timeout
-    )
-    return _handle_response(response)
+    page = _request("POST", "pages", json=payload, timeout=timeout)
+    _invalidate_schema_on_new_tags(properties)
+    _notify_page_written(page)
+    return page
+
+
+def chunk_text(text: str, limit: int = NOTION_RICH_TEXT_LIMIT) -> List[str]:
+    """
+    Split text into segments of at most `limit` characters.
+
+    Cuts at the last newline or space inside each window when there is one,
+    so words are not split across segments. Joining the segments gives back
+    the original text.
+
+    Args:
+        text: Text to split
+        limit: Maximum segment length
+
+    Returns:
+        List of segments (empty for empty text)
+    """
+    segments = []
+    while len(text) > limit:
+        cut = max(text.rfind("\n", 0, limit), text.rfind(" ", 0, limit)) + 1
+        if cut <= 0:
+            cut = limit
+        segments.append(text[:cut])
+        text = text[cut:]
+    if text:
+        segments.append(text)
+    return segments
+
+
+def text_to_blocks(
+    content: str,
+    heading: Optional[str] = None,
+    divider: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Convert text into Notion paragraph blocks that respect the API limits.
+
+    Paragraphs are separated by blank lines; a paragraph longer than
+    NOTION_RICH_TEXT_LIMIT is chunked into several rich_text segments.
+
+    Args:
+        content: Text to convert
+        heading: Optional heading_2 text placed before the content
+        divider: Whether to start with a divider block
+
+    Returns:
+        List of block objects for append_block_children
+    """
+    blocks: List[Dict[str, Any]] = []
+    if divider:
+        blocks.append({"object": "block", "type": "divider", "divider": {}})
+    if heading:
+        blocks.append({
+            "object": "block",
+            "type": "heading_2",
+            "heading_2": {"rich_text": [{"type": "text", "text": {"content": heading}}]}
+        })
+
+    for paragraph in content.strip().split("\n\n"):
+        segments = chunk_text(paragraph.strip("\n"))
+        for start in range(0, len(segments), NOTION_RICH_TEXT_PER_BLOCK):
+            blocks.append({
+                "object": "block",
+                "type": "paragraph",
+                "paragraph": {"rich_text": [
+                    {"type": "text", "text": {"content": segment}}
+                    for segment in segments[start:start + NOTION_RICH_TEXT_PER_BLOCK]
+                ]}
+            })
+    return blocks
+
+
+def blocks_to_text(blocks: Iterable[Dict[str, Any]]) -> str:
+    """
+    Reassemble plain text from Notion blocks (inverse of text_to_blocks).
+
+    Args:
+        blocks: Block objects, e.g. from iter_block_children
+
+    Returns:
+        Text with one paragraph per block, headings as "## " lines and
+        dividers as "---"
+    """
+    parts = []
+    for block in blocks:
+        block_type = block.get("type", "")
+        if block_type == "divider":
+            parts.append("---")
+            continue
+        rich_text = block.get(block_type, {}).get("rich_text")
+        if rich_text is None:
+            continue
+        text = "".join(
+            item.get("plain_text") or item.get("text", {}).get("content", "")
+            for item in rich_text
+        )
+        if block_type.startswith("heading_"):
+            text = f"{'#' * int(block_type[-1])} {text}"
+        parts.append(text)
+    return "\n\n".join(parts)
+
+
+def append_block_children(
+    block_id: str,
+    children: List[Dict[str, Any]],
+    timeout: float = 10.0
+) -> List[Dict[str, Any]]:
+    """
+    Append child blocks to a page (or block) without touching its properties.
+
+    Up to NOTION_APPEND_BLOCK_LIMIT blocks are sent in a single request, so
+    typical content is written in one round trip. Appending is not
+    idempotent, so failed requests are not retried on server errors.
+
+    Args:
+        block_id: Notion page or block ID
+        children: Block objects, e.g. from text_to_blocks
+        timeout: Request timeout in seconds
+
+    Returns:
+        The created blocks
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    validate_config()
+
+    created = []
+    for start in range(0, len(children), NOTION_APPEND_BLOCK_LIMIT):
+        result = _request(
+            "PATCH",
+            f"blocks/{block_id}/children",
+            json={"children": children[start:start + NOTION_APPEND_BLOCK_LIMIT]},
+            timeout=timeout
+        )
+        created.extend(result.get("results", []))
+    return created
+
+
+def iter_block_children(
+    block_id: str,
+    page_size: int = 100,
+    timeout: float = 10.0
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily iterate over the child blocks of a page (or block).
+
+    Args:
+        block_id: Notion page or block ID
+        page_size: Blocks fetched per request (1-100)
+        timeout: Request timeout in seconds
+
+    Yields:
+        Raw block objects, in page order
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    validate_config()
+
+    params = {"page_size": min(max(1, page_size), 100)}
+    while True:
+        result = _request("GET", f"blocks/{block_id}/children", params=params, timeout=timeout)
+        yield from result.get("results", [])
+        if not result.get("has_more"):
+            return
+        params["start_cursor"] = result["next_cursor"]
 
 
-def get_database_schema(timeout: float = 10.0) -> Dict[str, Any]:
+def get_page_content(page_id: str, timeout: float = 10.0) -> str:
+    """
+    Read the text appended to a page as blocks.
+
+    Args:
+        page_id: Notion page ID
+        timeout: Request timeout in seconds
+
+    Returns:
+        The page body as plain text (see blocks_to_text)
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails
+    """
+    return blocks_to_text(iter_block_children(page_id, timeout=timeout))
+
+
+def get_database_schema(timeout: float = 10.0, force_refresh: bool = False) -> Dict[str, Any]:
     """
     Retrieve the database schema/metadata.
 
+    Served from a process-wide cache for NOTION_SCHEMA_TTL_SECONDS. When the
+    entry expires and Notion sent an ETag, the schema is revalidated with
+    If-None-Match so an unchanged schema is not downloaded again. The cache is
+    invalidated when create_page/update_page writes a tag it has not seen.
+
     Args:
         timeout: Request timeout in seconds
+        force_refresh: Skip the cache and fetch the schema from Notion
 
     Returns:
         Raw JSON response from Notion API containing database schema
@@ -245,9 +1032,103 @@ def get_database_schema(timeout: float = 10.0) -> Dict[str, Any]:
     """
     validate_config()
 
-    response = requests.get(
-        f"{NOTION_BASE_URL}/databases/{NOTION_DATABASE_ID}",
-        headers=HEADERS,
-        timeout=timeout
-    )
-    return _handle_response(response)
+    cached, etag = _lookup_schema_cache(force_refresh)
+    if cached is not None and etag is None:
+        return cached
+
+    headers = {"If-None-Match": etag} if etag else {}
+    response = _send("GET", f"databases/{NOTION_DATABASE_ID}", timeout=timeout, headers=headers)
+
+    if response.status_code == 304 and cached is not None:
+        with _schema_lock:
+            _schema_stats["revalidated"] += 1
+            _schema_cache["fetched_at"] = time.time()
+        return cached
+
+    schema = _handle_response(response)
+    _store_schema(schema, response.headers.get("ETag"))
+    return schema
+
+
+def _lookup_schema_cache(force_refresh: bool = False) -> tuple:
+    """
+    Check the schema cache and record a hit or miss.
+
+    Returns:
+        (schema, None) on a fresh hit; (stale_schema, etag) when the expired
+        entry can be revalidated with If-None-Match; (None, None) otherwise
+    """
+    with _schema_lock:
+        cached = _schema_cache["schema"]
+        fresh = time.time() - _schema_cache["fetched_at"] < NOTION_SCHEMA_TTL_SECONDS
+        if cached is not None and fresh and not force_refresh:
+            _schema_stats["hits"] += 1
+            return cached, None
+        _schema_stats["misses"] += 1
+        if cached is not None and _schema_cache["etag"]:
+            return cached, _schema_cache["etag"]
+        return None, None
+
+
+def _store_schema(schema: Dict[str, Any], etag: Optional[str]) -> None:
+    """Put a freshly fetched schema into the cache."""
+    with _schema_lock:
+        _schema_cache.update(
+            schema=schema,
+            etag=etag,
+            fetched_at=time.time(),
+            tags=frozenset(get_tag_options(schema))
+        )
+
+
+def get_tag_options(schema: Dict[str, Any]) -> List[str]:
+    """
+    Extract the Tags multi-select option names from a database schema.
+
+    Args:
+        schema: Database schema as returned by get_database_schema
+
+    Returns:
+        List of tag names (empty if Tags is missing or not a multi-select)
+    """
+    tags_property = schema.get("properties", {}).get("Tags", {})
+    if tags_property.get("type") != "multi_select":
+        return []
+    return [
+        option["name"]
+        for option in tags_property.get("multi_select", {}).get("options", [])
+    ]
+
+
+def invalidate_schema_cache() -> None:
+    """Drop the cached database schema so the next read fetches it again."""
+    with _schema_lock:
+        if _schema_cache["schema"] is not None:
+            _schema_stats["invalidations"] += 1
+        _schema_cache.update(schema=None, etag=None, fetched_at=0.0, tags=frozenset())
+
+
+def _invalidate_schema_on_new_tags(properties: Dict[str, Any]) -> None:
+    """Invalidate the schema cache if a write used a tag the cache does not know."""
+    names = {option.get("name") for option in properties.get("Tags", {}).get("multi_select", [])}
+    with _schema_lock:
+        known = _schema_cache["tags"]
+        stale = _schema_cache["schema"] is not None and not names <= known
+    if stale:
+        # Notion creates the new option on write, so the cached list is now outdated
+        invalidate_schema_cache()
+
+
+def get_schema_cache_stats() -> Dict[str, Any]:
+    """
+    Report schema cache effectiveness.
+
+    Returns:
+        Dictionary with hits, misses, revalidated (304 responses),
+        invalidations and hit_rate (hits / lookups)
+    """
+    with _schema_lock:
+        stats = dict(_schema_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
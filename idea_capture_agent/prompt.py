@@ -62,6 +62,20 @@ You have access to the following tools:
     - Returns: List of matching ideas
     - Use when: User asks to find specific ideas, search by tag, or filter by date
 
+2b. `semantic_query_ideas`: Search for ideas by meaning instead of exact keywords.
+    - Parameters:
+        - search_text (str): Description of what to look for
+        - limit (int, optional): Maximum number of results (default: 10)
+    - Returns: Similar ideas with a similarity score (0-1)
+    - Use when: `query_ideas` finds nothing, or the user describes an idea in their own words ("that thing about posting automatically")
+
+2c. `get_idea_details`: Get the full details of specific ideas.
+    - Parameters:
+        - page_ids (list[str]): IDs of the ideas (max 10)
+    - Returns: Full title, description, tags and raw text
+    - Use when: A listed idea is marked `truncated` and you need its full description or raw text
+    - Note: `list_ideas`, `query_ideas` and `semantic_query_ideas` return shortened descriptions and may leave out lower-ranked results; they accept an optional `fields` list (e.g. ["title"]) when only some fields are needed
+
 3. `add_idea`: Add a new idea by delegating to the `add_idea` for processing.
     - Parameters:
         - raw_text (str): The original, unmodified idea text from the user
@@ -80,6 +94,12 @@ You have access to the following tools:
         - tags (list[str], optional): New tags to replace existing ones
     - Use when: User wants to modify an existing idea
 
+4b. `get_idea_content`: Read the discussions and expansions saved on an idea.
+    - Parameters:
+        - page_id (str): The ID of the idea
+    - Returns: The appended content as text
+    - Use when: User asks what was discussed or added to an idea before (list and search results do not include it)
+
 5. `delete_idea`: Remove an idea from the database.
     - Parameters:
         - idea_id (str): The ID of the idea to delete
@@ -96,6 +116,9 @@ You have access to the following tools:
 7. `get_random_ideas`: Get random ideas from the database for creative synthesis.
     - Parameters:
         - count (int, optional): Number of random ideas to retrieve (default: 3, max: 10)
+        - exclude_ids (list[str], optional): Ideas to leave out (e.g., ones just combined)
+        - strategy (str, optional): "uniform" (default), "recent" (favour recently edited ideas) or "least_combined" (favour ideas that haven't been combined lately)
+        - tag (str, optional): Favour ideas with this tag
     - Returns: Randomly selected ideas for combination
     - Use when: User wants random idea combinations or creative synthesis
 
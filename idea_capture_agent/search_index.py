@@ -0,0 +1,363 @@
+"""
+Inverted index with BM25F ranking over idea fields.
+
+Built from the local ideas mirror and kept current through the mirror's
+listener hook, so ideas created or updated through notion_client are
+searchable immediately. The index is pickled to disk and reconciled against
+the mirror on load, so a restart only re-tokenizes ideas that changed.
+"""
+from typing import Dict, List, Optional, Tuple
+import atexit
+import heapq
+import math
+import os
+import pickle
+import re
+import threading
+from notion_client import Idea
+from idea_mirror import MIRROR_PARSER_VERSION, IdeaMirror, get_mirror
+
+IDEA_INDEX_PATH = os.getenv(
+    "IDEA_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".ideas_index.pickle")
+)
+
+# Indexed fields and their BM25F weights (title > tags > description > raw_text)
+FIELDS = ("title", "tags", "description", "raw_text")
+FIELD_WEIGHTS = (3.0, 2.0, 1.0, 0.5)
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_INDEX_FORMAT = 1
+
+STOP_WORDS = frozenset({
+    "the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by",
+    "is", "are", "was", "were", "be", "it", "this", "that", "as", "from", "my", "about"
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SUFFIXES = ("ingly", "edly", "ings", "ing", "ions", "ion", "ies", "ied", "ed", "ly", "s")
+
+
+def stem(token: str) -> str:
+    """
+    Light suffix-stripping stemmer.
+
+    Folds common inflections together ("automate", "automates",
+    "automated", "automating", "automation" -> "automat"). It is deliberately
+    simple: consistency between indexing and querying matters more than
+    linguistic accuracy.
+    """
+    if len(token) <= 3 or token.isdigit():
+        return token
+    for suffix in _SUFFIXES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            if suffix == "s" and token.endswith(("ss", "us", "is")):
+                break
+            token = token[:-len(suffix)]
+            if suffix in ("ies", "ied"):
+                token += "y"
+            elif len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                # running -> runn -> run
+                token = token[:-1]
+            break
+    if len(token) > 3 and token.endswith("e"):
+        token = token[:-1]
+    return token
+
+
+def tokenize(text: str, keep_stop_words: bool = False) -> List[str]:
+    """
+    Lowercase, split on non-alphanumerics, drop stop words and stem.
+
+    Args:
+        text: Text to tokenize
+        keep_stop_words: Keep stop words (used when a query has nothing else)
+
+    Returns:
+        List of stemmed tokens
+    """
+    return [
+        stem(token)
+        for token in _TOKEN_RE.findall(text.lower())
+        if keep_stop_words or token not in STOP_WORDS
+    ]
+
+
+def query_terms(text: str) -> List[str]:
+    """
+    The words a query is searched for, as the user wrote them (lowercased, unstemmed).
+
+    Stop words are dropped unless the query has nothing else, like in search().
+    """
+    words = _TOKEN_RE.findall(text.lower())
+    return [word for word in words if word not in STOP_WORDS] or words
+
+
+class SearchIndex:
+    """
+    In-memory inverted index over ideas, scored with BM25F.
+
+    Postings map term -> {doc_number: per-field term frequencies}. Documents
+    are numbered internally so postings stay small; page IDs are only
+    resolved for the final top-k.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[int, Tuple[int, ...]]] = {}
+        self._doc_ids: Dict[str, int] = {}          # page_id -> doc number
+        self._page_ids: Dict[int, str] = {}         # doc number -> page_id
+        self._doc_terms: Dict[int, List[str]] = {}  # doc number -> distinct terms (for removal)
+        self._doc_lengths: Dict[int, Tuple[int, ...]] = {}
+        self._versions: Dict[str, str] = {}         # page_id -> last_edited_time
+        self._field_totals = [0] * len(FIELDS)
+        self._next_doc = 0
+        # Per-document length normalisation and per-term score contributions,
+        # recomputed lazily after writes (queries vastly outnumber writes)
+        self._norms: Optional[Dict[int, Tuple[float, ...]]] = None
+        self._term_scores: Dict[str, List[Tuple[int, float]]] = {}
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._doc_ids)
+
+    # ── updates ─────────────────────────────────────────────
+
+    def add(self, page_id: str, idea: Idea, version: str = "") -> None:
+        """
+        Index (or re-index) one idea.
+
+        Args:
+            page_id: Notion page ID
+            idea: Parsed idea
+            version: The page's last_edited_time, used to skip unchanged ideas on reload
+        """
+        field_tokens = [
+            tokenize(idea.title),
+            tokenize(" ".join(idea.tags)),
+            tokenize(idea.description),
+            tokenize(idea.raw_text)
+        ]
+
+        with self._lock:
+            self._remove(page_id)
+
+            doc = self._next_doc
+            self._next_doc += 1
+            self._doc_ids[page_id] = doc
+            self._page_ids[doc] = page_id
+            self._versions[page_id] = version
+
+            frequencies: Dict[str, List[int]] = {}
+            for field, tokens in enumerate(field_tokens):
+                for token in tokens:
+                    frequencies.setdefault(token, [0] * len(FIELDS))[field] += 1
+
+            for term, tf in frequencies.items():
+                self._postings.setdefault(term, {})[doc] = tuple(tf)
+            self._doc_terms[doc] = list(frequencies)
+
+            lengths = tuple(len(tokens) for tokens in field_tokens)
+            self._doc_lengths[doc] = lengths
+            for field, length in enumerate(lengths):
+                self._field_totals[field] += length
+
+            self._invalidate()
+
+    def remove(self, page_id: str) -> None:
+        """Drop an idea from the index (no-op if it is not indexed)."""
+        with self._lock:
+            self._remove(page_id)
+
+    def _remove(self, page_id: str) -> None:
+        doc = self._doc_ids.pop(page_id, None)
+        if doc is None:
+            return
+        del self._page_ids[doc]
+        self._versions.pop(page_id, None)
+        for term in self._doc_terms.pop(doc):
+            postings = self._postings[term]
+            del postings[doc]
+            if not postings:
+                del self._postings[term]
+        for field, length in enumerate(self._doc_lengths.pop(doc)):
+            self._field_totals[field] -= length
+        self._invalidate()
+
+    def _invalidate(self) -> None:
+        self._norms = None
+        self._term_scores = {}
+        self._dirty = True
+
+    def on_mirror_change(self, page_id: str, idea: Optional[Idea], version: str) -> None:
+        """IdeaMirror listener: keep the index in step with the mirror."""
+        if idea is None:
+            self.remove(page_id)
+        else:
+            self.add(page_id, idea, version)
+
+    def sync_with(self, mirror: IdeaMirror) -> int:
+        """
+        Reconcile with the mirror: index changed ideas and drop removed ones.
+
+        Args:
+            mirror: The ideas mirror to compare against
+
+        Returns:
+            Number of ideas (re)indexed or removed
+        """
+        with self._lock:
+            versions = dict(mirror.iter_versions())
+            removed = [page_id for page_id in self._versions if page_id not in versions]
+            for page_id in removed:
+                self._remove(page_id)
+
+            changed = [
+                page_id for page_id, version in versions.items()
+                if self._versions.get(page_id) != version
+            ]
+            ideas = mirror.get_ideas(changed)
+            for page_id in changed:
+                if page_id in ideas:
+                    self.add(page_id, ideas[page_id], versions[page_id])
+            return len(removed) + len(changed)
+
+    # ── search ──────────────────────────────────────────────
+
+    def _compute_norms(self) -> Dict[int, Tuple[float, ...]]:
+        count = max(1, len(self._doc_ids))
+        averages = [max(total / count, 1e-9) for total in self._field_totals]
+        return {
+            doc: tuple(
+                weight / (1 - B + B * length / average)
+                for weight, length, average in zip(FIELD_WEIGHTS, lengths, averages)
+            )
+            for doc, lengths in self._doc_lengths.items()
+        }
+
+    def _score_term(
+        self,
+        term: str,
+        norms: Dict[int, Tuple[float, ...]],
+        total_docs: int
+    ) -> List[Tuple[int, float]]:
+        """BM25F contribution of one term to every document containing it."""
+        postings = self._postings.get(term)
+        if not postings:
+            return []
+        idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+        contributions = []
+        for doc, tf in postings.items():
+            # BM25F: combine length-normalised, weighted field frequencies first
+            weighted_tf = sum(f * n for f, n in zip(tf, norms[doc]) if f)
+            contributions.append((doc, idf * weighted_tf / (K1 + weighted_tf)))
+        return contributions
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Rank ideas against a free-text query.
+
+        Args:
+            query: Search text
+            top_k: Number of results to return
+
+        Returns:
+            List of (page_id, score) pairs, best first
+        """
+        terms = tokenize(query) or tokenize(query, keep_stop_words=True)
+        if not terms:
+            return []
+
+        with self._lock:
+            if self._norms is None:
+                self._norms = self._compute_norms()
+            norms = self._norms
+            total_docs = len(self._doc_ids)
+
+            scores: Dict[int, float] = {}
+            for term in set(terms):
+                contributions = self._term_scores.get(term)
+                if contributions is None:
+                    contributions = self._score_term(term, norms, total_docs)
+                    self._term_scores[term] = contributions
+                for doc, score in contributions:
+                    scores[doc] = scores.get(doc, 0.0) + score
+
+            best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+            return [(self._page_ids[doc], score) for doc, score in best]
+
+    # ── persistence ─────────────────────────────────────────
+
+    def save(self, path: str = IDEA_INDEX_PATH) -> None:
+        """Pickle the index to disk if it changed since the last save."""
+        with self._lock:
+            if not self._dirty:
+                return
+            state = {
+                "format": _INDEX_FORMAT,
+                # Rows re-parsed under a new parser keep their versions, so sync_with cannot see the change
+                "parser_version": MIRROR_PARSER_VERSION,
+                "postings": self._postings,
+                "doc_ids": self._doc_ids,
+                "doc_terms": self._doc_terms,
+                "doc_lengths": self._doc_lengths,
+                "versions": self._versions,
+                "field_totals": self._field_totals,
+                "next_doc": self._next_doc
+            }
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+            self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = IDEA_INDEX_PATH) -> "SearchIndex":
+        """Load a pickled index, or return an empty one if none is usable."""
+        index = cls()
+        try:
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return index
+        if state.get("format") != _INDEX_FORMAT or state.get("parser_version") != MIRROR_PARSER_VERSION:
+            return index
+
+        index._postings = state["postings"]
+        index._doc_ids = state["doc_ids"]
+        index._page_ids = {doc: page_id for page_id, doc in index._doc_ids.items()}
+        index._doc_terms = state["doc_terms"]
+        index._doc_lengths = state["doc_lengths"]
+        index._versions = state["versions"]
+        index._field_totals = state["field_totals"]
+        index._next_doc = state["next_doc"]
+        return index
+
+
+_index: Optional[SearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Return the process-wide search index.
+
+    On first use the index is loaded from disk, reconciled with the mirror
+    and subscribed to mirror changes; it is saved again at exit.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                mirror = get_mirror()
+                index = SearchIndex.load()
+                # Subscribe before reconciling so no change slips in between
+                mirror.add_listener(index.on_mirror_change)
+                index.sync_with(mirror)
+                index.save()
+                atexit.register(index.save)
+                _index = index
+    return _index
@@ -0,0 +1,170 @@
+"""
+Size control for idea tool results.
+
+Tool results go straight into the model's context and stay there for every
+following turn, so the listing/search tools return a projection of each
+idea instead of the full record:
+- only the selected fields (IDEA_TOOL_FIELDS by default)
+- long text fields truncated at a word boundary
+- no more ideas than fit in IDEA_TOOL_TOKEN_BUDGET estimated tokens
+The full idea is available through the get_idea_details tool.
+
+Every tool result's estimated size is logged (logger "idea_capture_agent.tools")
+and aggregated per tool in get_tool_token_stats().
+"""
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+from notion_client import Idea
+
+PROJECTABLE_FIELDS = ("page_id", "title", "description", "tags", "raw_text")
+
+# Fields returned by the listing/search tools unless the caller asks otherwise
+IDEA_TOOL_FIELDS = tuple(
+    field.strip()
+    for field in os.getenv("IDEA_TOOL_FIELDS", "page_id,title,description,tags").split(",")
+    if field.strip() in PROJECTABLE_FIELDS
+)
+# Maximum characters per text field in listing/search results
+IDEA_TOOL_FIELD_LIMITS = {
+    "title": int(os.getenv("IDEA_TOOL_TITLE_CHARS", "200")),
+    "description": int(os.getenv("IDEA_TOOL_DESCRIPTION_CHARS", "300")),
+    "raw_text": int(os.getenv("IDEA_TOOL_RAW_TEXT_CHARS", "200"))
+}
+# Estimated tokens allowed for the ideas of a single listing/search result
+IDEA_TOOL_TOKEN_BUDGET = int(os.getenv("IDEA_TOOL_TOKEN_BUDGET", "2500"))
+
+logger = logging.getLogger("idea_capture_agent.tools")
+
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+def estimate_tokens(value: Any) -> int:
+    """
+    Cheap local token estimate (about 4 characters of JSON per token).
+
+    Args:
+        value: A string, or any JSON-serialisable value
+
+    Returns:
+        Estimated token count
+    """
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+    return (len(text) + 3) // 4
+
+
+def truncate(text: str, limit: int) -> Tuple[str, bool]:
+    """
+    Shorten text to at most `limit` characters, at a word boundary.
+
+    Returns:
+        (text, whether it was truncated)
+    """
+    if len(text) <= limit:
+        return text, False
+    cut = text.rfind(" ", 0, limit)
+    return f"{text[:cut if cut > limit // 2 else limit].rstrip()}…", True
+
+
+def resolve_fields(fields: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Valid fields to project, in canonical order; page_id is always included."""
+    wanted = set(fields) if fields else set(IDEA_TOOL_FIELDS)
+    wanted.add("page_id")
+    return tuple(field for field in PROJECTABLE_FIELDS if field in wanted)
+
+
+def project_ideas(
+    ideas: Iterable[Tuple[Idea, Dict[str, Any]]],
+    fields: Optional[Iterable[str]] = None,
+    budget: int = IDEA_TOOL_TOKEN_BUDGET
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Project ideas for a tool result and cut the list to the token budget.
+
+    Args:
+        ideas: (idea, extra keys) pairs in result order, e.g. (idea, {"score": 1.2})
+        fields: Fields to include (default IDEA_TOOL_FIELDS)
+        budget: Estimated token budget for all projected ideas together;
+                the first idea is always returned
+
+    Returns:
+        (projected idea dictionaries, number of ideas left out by the budget)
+    """
+    selected = resolve_fields(fields)
+    projected: List[Dict[str, Any]] = []
+    used = 0
+    total = 0
+    full = False
+
+    for idea, extra in ideas:
+        total += 1
+        if full:
+            continue
+
+        item: Dict[str, Any] = {}
+        truncated = False
+        for field in selected:
+            value = getattr(idea, field)
+            limit = IDEA_TOOL_FIELD_LIMITS.get(field)
+            if limit is not None:
+                value, cut = truncate(value, limit)
+                truncated = truncated or cut
+            elif field == "tags":
+                value = list(value)
+            item[field] = value
+        if truncated:
+            item["truncated"] = True
+        item.update(extra)
+
+        # Results are ranked, so stop at the first idea that does not fit
+        tokens = estimate_tokens(item)
+        if projected and used + tokens > budget:
+            full = True
+            continue
+        used += tokens
+        projected.append(item)
+
+    return projected, total - len(projected)
+
+
+def record_tool_tokens(tool_name: str, result: Dict[str, Any]) -> None:
+    """Log the estimated size of a tool result and add it to the per-tool stats."""
+    tokens = estimate_tokens(result)
+    with _stats_lock:
+        stats = _stats.setdefault(tool_name, {"calls": 0, "tokens": 0, "max_tokens": 0})
+        stats["calls"] += 1
+        stats["tokens"] += tokens
+        stats["max_tokens"] = max(stats["max_tokens"], tokens)
+    logger.info("tool=%s tokens=%d ideas=%s", tool_name, tokens, result.get("count", "-"))
+
+
+def track_tokens(tool: Callable) -> Callable:
+    """Decorator: record_tool_tokens for every result of a (sync or async) tool."""
+    if inspect.iscoroutinefunction(tool):
+        @functools.wraps(tool)
+        async def async_wrapper(*args, **kwargs):
+            result = await tool(*args, **kwargs)
+            record_tool_tokens(tool.__name__, result)
+            return result
+        return async_wrapper
+
+    @functools.wraps(tool)
+    def wrapper(*args, **kwargs):
+        result = tool(*args, **kwargs)
+        record_tool_tokens(tool.__name__, result)
+        return result
+    return wrapper
+
+
+def get_tool_token_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-tool calls, total and max estimated tokens, and the mean per call."""
+    with _stats_lock:
+        return {
+            name: {**stats, "mean_tokens": round(stats["tokens"] / stats["calls"], 1)}
+            for name, stats in _stats.items()
+        }
@@ -1,45 +1,92 @@
 from typing import Dict, Any, List, Optional
 import requests
-import random
-from notion_client import query_database, get_page, update_page, parse_idea_from_page
+from notion_client import update_page, append_block_children, get_page_content, text_to_blocks, chunk_text
+from idea_mirror import get_fresh_mirror
+from search_index import get_search_index, query_terms
+from embeddings import EmbeddingError, get_semantic_index
+from idea_sampler import get_sampler, mark_combined
+from tool_budget import project_ideas, track_tokens
+
+
+def _build_update_properties(
+    title: Optional[str],
+    description: Optional[str],
+    tags: Optional[List[str]]
+) -> Dict[str, Any]:
+    """Build a Notion properties object with only the fields being changed."""
+    properties = {}
+
+    if title is not None:
+        properties["Title"] = {
+            "title": [{"text": {"content": title}}]
+        }
+
+    if description is not None:
+        properties["Description"] = {
+            "rich_text": [{"text": {"content": segment}} for segment in chunk_text(description)]
+        }
+
+    if tags is not None:
+        properties["Tags"] = {
+            "multi_select": [{"name": tag} for tag in tags]
+        }
 
+    return properties
 
+
+def _describe_update(
+    title: Optional[str],
+    description: Optional[str],
+    tags: Optional[List[str]]
+) -> str:
+    """Confirmation message listing the fields an update changed."""
+    updated_fields = []
+    if title is not None:
+        updated_fields.append(f"title to '{title}'")
+    if description is not None:
+        updated_fields.append("description")
+    if tags is not None:
+        updated_fields.append(f"tags to {tags}")
+    return f"Updated {', '.join(updated_fields)}"
+
+
+def _omitted_note(omitted: int) -> str:
+    """Message suffix telling the model that the budget cut the result list."""
+    if not omitted:
+        return ""
+    return f" ({omitted} lower-ranked idea(s) left out to keep the response short; narrow the search to see them)"
+
+
+@track_tokens
 def list_ideas(
     limit: int = 10,
-    filter_by_tag: Optional[str] = None
+    filter_by_tag: Optional[str] = None,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
-    List ideas from the Notion database.
+    List ideas from the Notion database (served from the local mirror).
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
 
     Args:
-        limit: Maximum number of ideas to retrieve (default: 10, max: 100)
+        limit: Maximum number of ideas to retrieve (default: 10)
         filter_by_tag: Optional tag to filter ideas by (e.g., "feature-request")
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
 
     Returns:
         Dictionary with list of ideas containing title, description, tags, and page_id
     """
-    # Build filter if tag is specified
-    filter_config = None
-    if filter_by_tag:
-        filter_config = {
-            "property": "Tags",
-            "multi_select": {
-                "contains": filter_by_tag
-            }
-        }
-
     try:
-        result = query_database(page_size=limit, filter_config=filter_config)
-
-        # Parse and format the results
-        ideas = [parse_idea_from_page(page) for page in result.get("results", [])]
+        ideas = get_fresh_mirror().list_ideas(limit=max(1, limit), tag=filter_by_tag)
+        projected, omitted = project_ideas(((idea, {}) for idea in ideas), fields)
 
         filter_msg = f" with tag '{filter_by_tag}'" if filter_by_tag else ""
         return {
             "success": True,
-            "count": len(ideas),
-            "ideas": ideas,
-            "message": f"Retrieved {len(ideas)} idea(s){filter_msg}"
+            "count": len(projected),
+            "ideas": projected,
+            "message": f"Retrieved {len(projected)} idea(s){filter_msg}{_omitted_note(omitted)}"
         }
 
     except requests.exceptions.RequestException as e:
@@ -52,66 +99,54 @@ def list_ideas(
         }
 
 
+@track_tokens
 def query_ideas(
     search_text: str,
-    limit: int = 100
+    limit: int = 100,
+    fields: Optional[List[str]] = None
 ) -> Dict[str, Any]:
     """
     Search for ideas in the Notion database by keywords.
-    Extracts keywords from search_text and finds ideas matching any of them.
-    Keywords can match in any order and search is case-insensitive.
+    Ranks ideas with BM25 over title, tags, description and raw text (in that
+    order of importance). Keywords can match in any order, search is
+    case-insensitive and word forms are folded ("automate" finds "automation").
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
 
     Args:
         search_text: Text to search for (e.g., "delete blog automation")
-        limit: Maximum number of ideas to retrieve (default: 100, max: 100)
+        limit: Maximum number of matching ideas to return (default: 100)
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
 
     Returns:
-        Dictionary with list of matching ideas containing title, description, tags, and page_id
+        Dictionary with list of matching ideas containing title, description, tags, page_id and score
     """
-    # Extract keywords - split by spaces and filter out common words
-    stop_words = {"the", "a", "an", "and", "or", "but", "in", "on", "at", "to", "for", "of", "with", "by"}
-    keywords = [
-        word.lower().strip()
-        for word in search_text.split()
-        if word.lower().strip() and word.lower().strip() not in stop_words
-    ]
-
-    # If no valid keywords, use the original search text
-    if not keywords:
-        keywords = [search_text.lower()]
+    keywords = query_terms(search_text)
 
     try:
-        result = query_database(page_size=limit)
-
-        # Parse and filter results client-side with keyword matching
-        matching_ideas = []
-        for page in result.get("results", []):
-            idea = parse_idea_from_page(page)
-
-            # Combine all searchable text (lowercase for case-insensitive search)
-            searchable_text = f"{idea['title']} {idea['description']} {idea['raw_text']} {' '.join(idea['tags'])}".lower()
+        index = get_search_index()
+        mirror = get_fresh_mirror()
 
-            # Check if ANY keyword matches (flexible matching)
-            keyword_matches = sum(1 for keyword in keywords if keyword in searchable_text)
+        results = index.search(search_text, top_k=max(1, limit))
+        ideas_by_id = mirror.get_ideas([page_id for page_id, _ in results])
 
-            # Include idea if at least one keyword matches
-            if keyword_matches > 0:
-                idea["match_score"] = keyword_matches
-                matching_ideas.append(idea)
-
-        # Sort by match score (most matching keywords first)
-        matching_ideas.sort(key=lambda x: x["match_score"], reverse=True)
-
-        # Remove match_score from final results
-        for idea in matching_ideas:
-            del idea["match_score"]
+        matching_ideas, omitted = project_ideas(
+            (
+                (ideas_by_id[page_id], {"score": round(score, 3)})
+                for page_id, score in results
+                if page_id in ideas_by_id
+            ),
+            fields
+        )
 
         return {
             "success": True,
             "count": len(matching_ideas),
             "ideas": matching_ideas,
             "keywords": keywords,
-            "message": f"Found {len(matching_ideas)} idea(s) matching keywords: {', '.join(keywords)}"
+            "message": f"Found {len(matching_ideas) + omitted} idea(s) matching keywords: "
+                       f"{', '.join(keywords)}{_omitted_note(omitted)}"
         }
 
     except requests.exceptions.RequestException as e:
@@ -124,6 +159,109 @@ def query_ideas(
         }
 
 
+@track_tokens
+def semantic_query_ideas(
+    search_text: str,
+    limit: int = 10,
+    min_score: float = 0.0,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Search for ideas by meaning rather than exact keywords.
+    Finds ideas that are phrased differently but about the same thing
+    (e.g., "write posts automatically" finds "Blog automation pipeline").
+    Long descriptions are shortened (marked "truncated"); use get_idea_details
+    for the full text.
+
+    Args:
+        search_text: Description of what to look for
+        limit: Maximum number of ideas to return (default: 10)
+        min_score: Minimum similarity between 0 and 1 (default: 0.0)
+        fields: Optional fields to return, from page_id, title, description, tags,
+                raw_text (default: page_id, title, description, tags)
+
+    Returns:
+        Dictionary with list of similar ideas containing title, description, tags, page_id and similarity
+    """
+    try:
+        index = get_semantic_index()
+        mirror = get_fresh_mirror()
+
+        results = [
+            (page_id, score)
+            for page_id, score in index.search(search_text, top_k=max(1, limit))
+            if score >= min_score
+        ]
+        ideas_by_id = mirror.get_ideas([page_id for page_id, _ in results])
+
+        similar_ideas, omitted = project_ideas(
+            (
+                (ideas_by_id[page_id], {"similarity": round(score, 3)})
+                for page_id, score in results
+                if page_id in ideas_by_id
+            ),
+            fields
+        )
+
+        return {
+            "success": True,
+            "count": len(similar_ideas),
+            "ideas": similar_ideas,
+            "message": f"Found {len(similar_ideas) + omitted} idea(s) similar to '{search_text}'"
+                       f"{_omitted_note(omitted)}"
+        }
+
+    except (requests.exceptions.RequestException, EmbeddingError) as e:
+        return {
+            "success": False,
+            "count": 0,
+            "ideas": [],
+            "error": str(e),
+            "message": f"Failed to search ideas: {str(e)}"
+        }
+
+
+@track_tokens
+def get_idea_details(page_ids: List[str]) -> Dict[str, Any]:
+    """
+    Get the full, untruncated details of specific ideas.
+    Use after list_ideas/query_ideas when an idea's full description or raw
+    text is needed.
+
+    Args:
+        page_ids: Notion page IDs of the ideas (max 10)
+
+    Returns:
+        Dictionary with the full ideas (title, description, tags, raw_text, page_id)
+    """
+    page_ids = list(dict.fromkeys(page_ids))[:10]
+
+    try:
+        ideas_by_id = get_fresh_mirror().get_ideas(page_ids)
+        ideas = [ideas_by_id[page_id].to_dict() for page_id in page_ids if page_id in ideas_by_id]
+        missing = [page_id for page_id in page_ids if page_id not in ideas_by_id]
+
+        result = {
+            "success": bool(ideas),
+            "count": len(ideas),
+            "ideas": ideas,
+            "message": f"Retrieved details for {len(ideas)} idea(s)"
+        }
+        if missing:
+            result["not_found"] = missing
+            result["message"] += f"; not found: {', '.join(missing)}"
+        return result
+
+    except requests.exceptions.RequestException as e:
+        return {
+            "success": False,
+            "count": 0,
+            "ideas": [],
+            "error": str(e),
+            "message": f"Failed to get idea details: {str(e)}"
+        }
+
+
 def update_idea(
     page_id: str,
     title: Optional[str] = None,
@@ -142,23 +280,7 @@ def update_idea(
     Returns:
         Dictionary with success status and confirmation message
     """
-    # Build properties object with only the fields to update
-    properties = {}
-
-    if title is not None:
-        properties["Title"] = {
-            "title": [{"text": {"content": title}}]
-        }
-
-    if description is not None:
-        properties["Description"] = {
-            "rich_text": [{"text": {"content": description}}]
-        }
-
-    if tags is not None:
-        properties["Tags"] = {
-            "multi_select": [{"name": tag} for tag in tags]
-        }
+    properties = _build_update_properties(title, description, tags)
 
     # If no fields to update, return error
     if not properties:
@@ -170,18 +292,10 @@ def update_idea(
     try:
         result = update_page(page_id, properties)
 
-        updated_fields = []
-        if title is not None:
-            updated_fields.append(f"title to '{title}'")
-        if description is not None:
-            updated_fields.append("description")
-        if tags is not None:
-            updated_fields.append(f"tags to {tags}")
-
         return {
             "success": True,
             "page_id": result["id"],
-            "message": f"Updated {', '.join(updated_fields)}"
+            "message": _describe_update(title, description, tags)
         }
 
     except requests.exceptions.RequestException as e:
@@ -197,37 +311,20 @@ def expand_idea(
     expanded_content: str
 ) -> Dict[str, Any]:
     """
-    Expand an existing idea by appending new content to its description.
+    Expand an existing idea by appending new content to its page.
     Useful for adding details, thoughts, or elaborations to an idea.
+    The content is added below the idea's properties in a single request;
+    long content is split automatically. Use get_idea_content to read it back.
 
     Args:
         page_id: The Notion page ID of the idea to expand
-        expanded_content: New content to append to the existing description
+        expanded_content: New content to append to the idea
 
     Returns:
         Dictionary with success status and confirmation message
     """
     try:
-        # First, fetch the current idea to get existing description
-        page = get_page(page_id)
-
-        # Extract current description
-        properties = page.get("properties", {})
-        desc_property = properties.get("Description", {}).get("rich_text", [])
-        current_description = desc_property[0].get("text", {}).get("content", "") if desc_property else ""
-
-        # Append new content with a separator
-        separator = "\n\n---\n\n" if current_description else ""
-        new_description = f"{current_description}{separator}{expanded_content}"
-
-        # Update the page with expanded description
-        properties = {
-            "Description": {
-                "rich_text": [{"text": {"content": new_description}}]
-            }
-        }
-
-        update_page(page_id, properties)
+        append_block_children(page_id, text_to_blocks(expanded_content, divider=True))
 
         return {
             "success": True,
@@ -243,17 +340,56 @@ def expand_idea(
         }
 
 
+@track_tokens
+def get_idea_content(page_id: str) -> Dict[str, Any]:
+    """
+    Read the expansions and discussions appended to an idea.
+    Only call this when the full content is needed; list and search results
+    contain the title, description and tags but not the appended content.
+
+    Args:
+        page_id: The Notion page ID of the idea
+
+    Returns:
+        Dictionary with the appended content as text
+    """
+    try:
+        content = get_page_content(page_id)
+
+        return {
+            "success": True,
+            "page_id": page_id,
+            "content": content,
+            "message": f"Retrieved {len(content)} characters of content" if content else "Idea has no appended content"
+        }
+
+    except requests.exceptions.RequestException as e:
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Failed to read idea content: {str(e)}"
+        }
+
+
+@track_tokens
 def get_random_ideas(
     count: int = 3,
-    exclude_ids: Optional[List[str]] = None
+    exclude_ids: Optional[List[str]] = None,
+    strategy: str = "uniform",
+    tag: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Get random ideas from the Notion database for creative combination.
     Used by the idea_alchemy agent to synthesize novel insights.
+    Draws from every idea in the database; returned ideas are remembered as
+    combined for the "least_combined" strategy.
 
     Args:
         count: Number of random ideas to retrieve (default: 3, max: 10)
         exclude_ids: Optional list of page IDs to exclude from selection
+        strategy: "uniform" (default), "recent" (favour recently edited ideas)
+                  or "least_combined" (favour ideas not combined recently)
+        tag: Optional tag to favour (e.g., "fitness")
 
     Returns:
         Dictionary with randomly selected ideas
@@ -269,24 +405,13 @@ def get_random_ideas(
         count = 10
 
     try:
-        # Fetch all ideas (or a large sample)
-        result = query_database(page_size=100)
-        all_ideas = [parse_idea_from_page(page) for page in result.get("results", [])]
+        mirror = get_fresh_mirror()
 
-        # Filter out excluded IDs
-        if exclude_ids:
-            all_ideas = [idea for idea in all_ideas if idea["page_id"] not in exclude_ids]
-
-        # Check if we have enough ideas
-        if len(all_ideas) < count:
-            return {
-                "success": False,
-                "ideas": [],
-                "message": f"Not enough ideas in database. Have {len(all_ideas)}, need {count}"
-            }
-
-        # Randomly select ideas
-        selected_ideas = random.sample(all_ideas, count)
+        # Draw page IDs from the sampling index, then load only those ideas
+        page_ids = get_sampler().sample(count, exclude=set(exclude_ids or ()), strategy=strategy, tag=tag)
+        ideas = mirror.get_ideas(page_ids)
+        selected_ideas = [ideas[page_id].to_dict() for page_id in page_ids if page_id in ideas]
+        mark_combined(page_ids)
 
         return {
             "success": True,
@@ -295,6 +420,13 @@ def get_random_ideas(
             "message": f"Selected {len(selected_ideas)} random ideas for alchemy"
         }
 
+    except ValueError as e:
+        return {
+            "success": False,
+            "ideas": [],
+            "message": str(e)
+        }
+
     except requests.exceptions.RequestException as e:
         return {
             "success": False,
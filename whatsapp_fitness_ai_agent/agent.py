@@ -4,9 +4,26 @@ from google.adk.tools import AgentTool
 from google.adk.agents import Agent
 from .sub_agents.workouts_agent.agent import workouts_agent
 from .sub_agents.diet_agent.agent import diet_agent
+from .idempotency import remember_origin
+from workout_coach_agent.intent_router import (
+    SETS_X_REPS,
+    TODAYS_WORKOUT,
+    FastPathRouter,
+    register_router,
+    rule,
+)
 
 MODEL_GEMINI_2_0_FLASH = "gemini-2.0-flash"
 
+# Unambiguous messages go straight to the specialist, skipping the coordinator's model
+fast_path = register_router(FastPathRouter("fitness_coach", [
+    rule("workouts", 0.9, [SETS_X_REPS], excludes=[r"\?", r"\b(was|not|actually|delete|remove)\b"]),
+    rule("workouts", 0.95, TODAYS_WORKOUT, excludes=[SETS_X_REPS]),
+    # A meal photo with at most a short caption
+    rule("diet", 0.95, media=True, max_words=8),
+    rule("diet", 0.85, [r"\b(calories|kcal|macros)\b.*\btoday\b", r"\bwhat did i eat today\b"]),
+]))
+
 root_agent = Agent(
     name="fitness_coach",
     model=MODEL_GEMINI_2_0_FLASH,
@@ -22,4 +39,8 @@ root_agent = Agent(
         AgentTool(agent=workouts_agent),
         AgentTool(agent=diet_agent),
     ],
+    # The specialists' writes are keyed on this message (see idempotency.remember_origin)
+    before_agent_callback=remember_origin,
+    before_model_callback=fast_path.before_model,
+    after_model_callback=fast_path.after_model,
 )
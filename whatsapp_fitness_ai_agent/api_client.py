@@ -0,0 +1,155 @@
+"""
+Shared async Laravel API client for the WhatsApp agents' tools.
+
+The workouts and diet tools used blocking `requests` calls with a fresh
+connection per call, inside ADK's event loop: every backend round trip
+stalled all other users' messages. The async tools send through one pooled,
+keep-alive httpx.AsyncClient per event loop instead, with a timeout per
+endpoint (short for reads, longer for writes and the full plan).
+
+post_idempotent_sync is the idempotent write for the sync `requests` tools.
+"""
+from __future__ import annotations
+import asyncio
+import os
+import re
+from typing import Any, Dict, Optional
+
+import httpx
+import requests
+
+from whatsapp_fitness_ai_agent.idempotency import IDEMPOTENCY_HEADER, get_idempotency_cache, mark_duplicate
+
+API_BASE = os.getenv("LARAVEL_API_BASE_URL", "http://localhost:8000/api").rstrip("/")
+TIMEOUT = float(os.getenv("API_TIMEOUT_SECONDS", "12.0"))
+# Reads answer quickly; a stuck one should fail fast rather than hold the reply
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT_SECONDS", "5.0"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT_SECONDS", "3.0"))
+
+# Connection pool shared by all users' tool calls. More connections than the
+# backend has workers only adds pool overhead (httpcore scans every connection
+# per request); requests beyond the limit wait their turn.
+API_MAX_CONNECTIONS = int(os.getenv("API_MAX_CONNECTIONS", "20"))
+API_MAX_KEEPALIVE = int(os.getenv("API_MAX_KEEPALIVE", "20"))
+API_KEEPALIVE_EXPIRY = float(os.getenv("API_KEEPALIVE_EXPIRY", "30"))
+
+# "METHOD path" (IDs folded into {id}) -> timeout in seconds; other endpoints use API_READ_TIMEOUT.
+# Writes get the full TIMEOUT so a slow commit is not cut off (and then re-sent by the user).
+ENDPOINT_TIMEOUTS: Dict[str, float] = {
+    "GET workouts/schema": TIMEOUT,
+    "POST workouts/log": TIMEOUT,
+    "DELETE workouts/log/{id}": TIMEOUT,
+    "POST diet/food_entries": TIMEOUT,
+    "DELETE diet/meals/{id}": TIMEOUT,
+}
+
+# Numeric path segments (record IDs)
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+# Requests in flight on _client. httpcore rescans its whole queue of waiting
+# requests on every pool change, which gets quadratic with hundreds waiting;
+# they wait on this semaphore instead, so the pool only sees what it can serve.
+_slots: Optional[asyncio.Semaphore] = None
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the shared async client for the running event loop.
+
+    An AsyncClient is bound to the loop it was first used on, so a new one is
+    created when the loop changes.
+    """
+    global _client, _client_loop, _slots
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        _client = httpx.AsyncClient(
+            base_url=f"{API_BASE}/",
+            limits=httpx.Limits(
+                max_connections=API_MAX_CONNECTIONS,
+                max_keepalive_connections=API_MAX_KEEPALIVE,
+                keepalive_expiry=API_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(API_READ_TIMEOUT, connect=API_CONNECT_TIMEOUT)
+        )
+        _client_loop = loop
+        _slots = asyncio.Semaphore(API_MAX_CONNECTIONS)
+    return _client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client and its pooled connections."""
+    global _client, _client_loop, _slots
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _client_loop = None
+        _slots = None
+
+
+def endpoint_timeout(method: str, path: str) -> httpx.Timeout:
+    """Timeout for a request, from ENDPOINT_TIMEOUTS."""
+    key = f"{method} {_ID_SEGMENT.sub('/{id}', path.strip('/'))}"
+    seconds = ENDPOINT_TIMEOUTS.get(key, API_READ_TIMEOUT)
+    return httpx.Timeout(seconds, connect=min(seconds, API_CONNECT_TIMEOUT))
+
+
+async def api_request(
+    method: str,
+    path: str,
+    params: Optional[Dict[str, Any]] = None,
+    json: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict[str, Any]:
+    """
+    Send a request to the Laravel API and parse the JSON response.
+
+    Args:
+        method: GET, POST or DELETE
+        path: Path relative to LARAVEL_API_BASE_URL (e.g. "workouts/today")
+        params: Query parameters
+        json: JSON body
+        headers: Extra headers (e.g. Idempotency-Key)
+
+    Returns:
+        Parsed JSON response
+
+    Raises:
+        httpx.HTTPError: If the request fails or the API answers with an error status
+    """
+    client = get_async_client()
+    async with _slots:
+        response = await client.request(
+            method, path, params=params, json=json, headers=headers, timeout=endpoint_timeout(method, path)
+        )
+    response.raise_for_status()
+    return response.json()
+
+
+async def post_idempotent(
+    path: str, user: str, payload: Dict[str, Any], origin: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    POST a write with an Idempotency-Key; a repeat for the same message
+    (origin, see idempotency.write_origin) returns the first result.
+    """
+    cache = get_idempotency_cache()
+    key, previous = cache.check(path, user, payload, origin)
+    if previous is not None:
+        return mark_duplicate(previous)
+    result = await api_request("POST", path, json=payload, headers={IDEMPOTENCY_HEADER: key})
+    if not (isinstance(result, dict) and "error" in result):
+        cache.remember(path, key, result)
+    return result
+
+
+def post_idempotent_sync(
+    path: str, user: str, payload: Dict[str, Any], origin: Optional[str] = None
+) -> Dict[str, Any]:
+    """Blocking post_idempotent, for the sync `requests` tools."""
+    def send(key: str) -> Dict[str, Any]:
+        r = requests.post(f"{API_BASE}/{path}", json=payload, headers={IDEMPOTENCY_HEADER: key}, timeout=TIMEOUT)
+        r.raise_for_status()
+        return r.json()
+    return get_idempotency_cache().run(path, user, payload, send, origin)
@@ -0,0 +1,157 @@
+"""
+Load test: sync vs async WhatsApp workout/diet tools under concurrent users.
+
+Simulates N WhatsApp users messaging at the same time, all served by one
+event loop (as under the ADK API server). Each message runs the tool calls
+a typical turn makes (today's workout, log a set, today's logs, today's
+macros) against a local stub Laravel server with a fixed latency:
+- sync tools:  the `requests` versions, called on the loop like ADK calls a
+               sync tool (fresh connection per call, loop blocked meanwhile)
+- async tools: the async versions on the shared pooled keep-alive client
+
+Users send their next message as soon as the previous reply arrives; a
+message's latency runs from when it was sent (so time spent waiting behind
+other users' blocking calls counts). The stub server runs in its own process.
+Reports per-message latency p50/p99 and throughput for both.
+
+Usage (from the repo root):
+    python -m whatsapp_fitness_ai_agent.benchmark_async_tools [--users 200] [--messages 2] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+from urllib.parse import urlparse
+
+from whatsapp_fitness_ai_agent import api_client, idempotency
+from whatsapp_fitness_ai_agent.sub_agents.diet_agent import async_tools as diet_async, tools as diet_sync
+from whatsapp_fitness_ai_agent.sub_agents.workouts_agent import async_tools as workouts_async, tools as workouts_sync
+
+STUB_RESPONSES = {
+    "/api/workouts/today": {"plan": "Push", "exercises": [{"exercise_id": 1, "name": "Bench Press", "sets": 3}]},
+    "/api/workouts/log": {"log": {"id": 1, "sets": 3, "reps": 8, "weight_kg": 80.0}},
+    "/api/workouts/logs/today": {"date": "2026-01-01", "logs": [{"id": 1, "exercise": "Bench Press"}]},
+    "/api/diet/macros/today": {"kcal": 1850, "protein_g": 140, "carbs_g": 190, "fat_g": 60},
+}
+
+
+class StubLaravelHandler(BaseHTTPRequestHandler):
+    """Minimal Laravel stand-in: canned JSON after a fixed delay, keep-alive."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    latency_s = 0.02
+
+    def _reply(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        time.sleep(self.latency_s)
+        payload = json.dumps(STUB_RESPONSES.get(urlparse(self.path).path, {"success": True})).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class StubLaravelServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Every simulated user may connect at once
+    request_queue_size = 1024
+
+
+def _serve(latency_s: float, ports: "multiprocessing.Queue[int]") -> None:
+    StubLaravelHandler.latency_s = latency_s
+    server = StubLaravelServer(("127.0.0.1", 0), StubLaravelHandler)
+    ports.put(server.server_port)
+    server.serve_forever()
+
+
+async def _message_sync(user: int, message: int) -> None:
+    ctx = SimpleNamespace(state={"public_id": f"user-{user}"})
+    # What ADK does with a sync tool: call it on the event loop
+    workouts_sync.api_workouts_today(ctx)
+    workouts_sync.api_workouts_log_by_id(f"user-{user}", 1, 3, 8, 80.0 + message, "kg")
+    workouts_sync.api_workouts_logs_today(f"user-{user}")
+    diet_sync.api_diet_macros_today(ctx)
+
+
+async def _message_async(user: int, message: int) -> None:
+    ctx = SimpleNamespace(state={"public_id": f"user-{user}"})
+    await workouts_async.api_workouts_today(ctx)
+    await workouts_async.api_workouts_log_by_id(f"user-{user}", 1, 3, 8, 80.0 + message, "kg")
+    await workouts_async.api_workouts_logs_today(f"user-{user}")
+    await diet_async.api_diet_macros_today(ctx)
+
+
+CALLS_PER_MESSAGE = 4
+
+
+async def _run(handle: Callable, users: int, messages: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    started = time.perf_counter()
+
+    async def user(index: int) -> None:
+        sent = started
+        for message in range(messages):
+            await handle(index, message)
+            replied = time.perf_counter()
+            latencies.append((replied - sent) * 1000)
+            sent = replied
+
+    await asyncio.gather(*(user(index) for index in range(users)))
+    elapsed = time.perf_counter() - started
+    await api_client.aclose_async_client()
+
+    latencies.sort()
+    return {
+        "elapsed_s": elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[max(0, int(len(latencies) * 0.99) - 1)],
+        "messages_per_s": len(latencies) / elapsed,
+        "calls_per_s": len(latencies) * CALLS_PER_MESSAGE / elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200, help="concurrent simulated users")
+    parser.add_argument("--messages", type=int, default=2, help="messages per user")
+    parser.add_argument("--latency-ms", type=float, default=20, help="stub Laravel latency per request")
+    args = parser.parse_args()
+
+    ports: "multiprocessing.Queue[int]" = multiprocessing.Queue()
+    server = multiprocessing.Process(target=_serve, args=(args.latency_ms / 1000, ports), daemon=True)
+    server.start()
+    base = f"http://127.0.0.1:{ports.get()}/api"
+    workouts_sync.API_BASE = diet_sync.API_BASE = api_client.API_BASE = base
+
+    print(f"{args.users} concurrent users x {args.messages} messages, {CALLS_PER_MESSAGE} tool calls per message, "
+          f"stub Laravel {args.latency_ms:.0f} ms/request\n")
+    results = {}
+    for name, handle in (("sync tools ", _message_sync), ("async tools", _message_async)):
+        # Fresh idempotency cache, so the second run's logs are not answered as duplicates
+        idempotency._cache = None
+        results[name] = result = asyncio.run(_run(handle, args.users, args.messages))
+        print(f"{name}: p50 {result['p50_ms']:8.1f} ms | p99 {result['p99_ms']:8.1f} ms | "
+              f"{result['messages_per_s']:7.1f} messages/s | {result['calls_per_s']:7.1f} calls/s | "
+              f"total {result['elapsed_s']:.1f} s")
+    print(f"\nasync vs sync throughput: "
+          f"{results['async tools']['messages_per_s'] / results['sync tools ']['messages_per_s']:.1f}x")
+
+    server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ from google.adk.agents import Agent
 from google.adk.tools import AgentTool
 from .macro_scanner_agent import macro_scan_pipeline
 
-from .tools import (
+from .async_tools import (
     api_diet_calories_today,
     api_diet_macros_today,
     api_diet_add_food_entries,
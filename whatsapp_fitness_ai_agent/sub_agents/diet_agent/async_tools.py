@@ -0,0 +1,64 @@
+"""
+Async versions of the diet tools, on the shared pooled client in
+whatsapp_fitness_ai_agent.api_client (so a backend round trip no longer
+blocks the event loop for every other user).
+
+Tool names, parameters and results match tools.py exactly.
+"""
+from __future__ import annotations
+from typing import Dict, Any, List, Optional
+from google.adk.tools import ToolContext
+from whatsapp_fitness_ai_agent.api_client import api_request, post_idempotent
+from whatsapp_fitness_ai_agent.idempotency import write_origin
+from .tools import MealItem, _pid
+
+async def api_diet_calories_today(tool_context: ToolContext) -> Dict[str, Any]:
+    """Return today's total calories for the current user (reads session.state['public_id'])."""
+    return await api_request("GET", "diet/calories/today", params={"public_id": _pid(tool_context)})
+
+async def api_diet_macros_today(tool_context: ToolContext) -> Dict[str, Any]:
+    """Return today's total macros (kcal, protein_g, carbs_g, fat_g) for the current user."""
+    return await api_request("GET", "diet/macros/today", params={"public_id": _pid(tool_context)})
+
+async def api_diet_add_food_entries(
+    tool_context: ToolContext,
+    items: List[MealItem],
+    label: Optional[str] = None,
+    notes: Optional[str] = None,
+    source: Optional[str] = None,
+    date: Optional[str] = None,  # YYYY-MM-DD; if omitted, backend uses "today"
+) -> Dict[str, Any]:
+    """Create a meal with one or more items.
+
+    Args:
+        items: List of food items. Fill whatever fields you can; macros in grams.
+        label: Optional meal label, e.g. 'breakfast' | 'lunch' | 'dinner' | 'snack'.
+        notes: Optional free text note (e.g. 'from photo').
+        source: Optional origin, e.g. 'vision' or 'manual'.
+        date: Optional YYYY-MM-DD; if missing, backend uses today.
+
+    Returns:
+        dict: {meal_id: int}
+    """
+    payload = {
+        "public_id": _pid(tool_context),
+        "items": items,
+    }
+    if label:  payload["label"]  = label
+    if notes:  payload["notes"]  = notes
+    if source: payload["source"] = source
+    if date:   payload["date"]   = date
+
+    return await post_idempotent("diet/food_entries", payload["public_id"], payload, write_origin(tool_context))
+
+async def api_diet_meals_today(tool_context: ToolContext) -> Dict[str, Any]:
+    """List today's meals (with items) for the current user."""
+    return await api_request("GET", "diet/meals/today", params={"public_id": _pid(tool_context)})
+
+async def api_diet_meals(tool_context: ToolContext, date: str) -> Dict[str, Any]:
+    """List meals for a specific date (YYYY-MM-DD)."""
+    return await api_request("GET", "diet/meals", params={"public_id": _pid(tool_context), "date": date})
+
+async def api_diet_delete_meal(tool_context: ToolContext, meal_id: int) -> Dict[str, Any]:
+    """Delete a meal by ID for the current user."""
+    return await api_request("DELETE", f"diet/meals/{meal_id}", params={"public_id": _pid(tool_context)})
@@ -2,6 +2,8 @@
 from __future__ import annotations
 from typing import Dict, Any, List, Optional, TypedDict
 from google.adk.tools import ToolContext
+from whatsapp_fitness_ai_agent.api_client import post_idempotent_sync
+from whatsapp_fitness_ai_agent.idempotency import write_origin
 import os, requests
 
 API_BASE = os.getenv("LARAVEL_API_BASE_URL", "http://localhost:8000/api").rstrip("/")
@@ -65,9 +67,7 @@ def api_diet_add_food_entries(
     if source: payload["source"] = source
     if date:   payload["date"]   = date
 
-    r = requests.post(f"{API_BASE}/diet/food_entries", json=payload, timeout=TIMEOUT)
-    r.raise_for_status()
-    return r.json()
+    return post_idempotent_sync("diet/food_entries", payload["public_id"], payload, write_origin(tool_context))
 
 def api_diet_meals_today(tool_context: ToolContext) -> Dict[str, Any]:
     """List today's meals (with items) for the current user."""
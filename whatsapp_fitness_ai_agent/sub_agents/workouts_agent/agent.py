@@ -2,7 +2,7 @@
 from __future__ import annotations
 from google.adk.agents import Agent
 
-from .tools import (
+from .async_tools import (
     api_workouts_day,
     api_workouts_today,
     api_workouts_schema,
@@ -2,6 +2,8 @@ from __future__ import annotations
 import os, requests
 from typing import Dict, Any, Optional
 from google.adk.tools import ToolContext
+from whatsapp_fitness_ai_agent.api_client import post_idempotent_sync
+from whatsapp_fitness_ai_agent.idempotency import write_origin
 
 API_BASE = os.getenv("LARAVEL_API_BASE_URL", "http://localhost:8000/api").rstrip("/")
 TIMEOUT = float(os.getenv("API_TIMEOUT_SECONDS", "12.0"))
@@ -34,7 +36,7 @@ def api_workouts_schema(public_id: str) -> Dict[str, Any]:
     r.raise_for_status()
     return r.json()
 
-def api_workouts_log_by_id(public_id: str, exercise_id: int, sets: int, reps: int, weight: float, unit: str) -> Dict[str, Any]:
+def api_workouts_log_by_id(public_id: str, exercise_id: int, sets: int, reps: int, weight: float, unit: str, tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """Log a set for a predefined exercise by exercise_id.
 
     The 'unit' must be "kg" or "lb". If the user logged bodyweight, pass weight=0 and unit="kg".
@@ -46,6 +48,7 @@ def api_workouts_log_by_id(public_id: str, exercise_id: int, sets: int, reps: in
         reps (int): Reps per set.
         weight (float): Weight value as provided by the user (not converted).
         unit (str): "kg" or "lb".
+        tool_context: Provided by ADK; repeats within one message are logged once.
 
     Returns:
         dict: The created log payload and display echo.
@@ -58,11 +61,9 @@ def api_workouts_log_by_id(public_id: str, exercise_id: int, sets: int, reps: in
         "weight": weight,   # Laravel converts to weight_kg internally
         "notes": None
     }
-    r = requests.post(f"{API_BASE}/workouts/log", json=payload, timeout=TIMEOUT)
-    r.raise_for_status()
-    return r.json()
+    return post_idempotent_sync("workouts/log", public_id, payload, write_origin(tool_context))
 
-def api_workouts_log_by_name(whatsapp_id: str, exercise_name: str, sets: int, reps: int, weight: float, unit: str) -> Dict[str, Any]:
+def api_workouts_log_by_name(whatsapp_id: str, exercise_name: str, sets: int, reps: int, weight: float, unit: str, tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """Log a set using a free-text exercise name (when no ID match).
 
     Args:
@@ -72,6 +73,7 @@ def api_workouts_log_by_name(whatsapp_id: str, exercise_name: str, sets: int, re
         reps (int): Reps per set.
         weight (float): Weight value as provided by the user. Use 0 for bodyweight.
         unit (str): "kg" or "lb".
+        tool_context: Provided by ADK; repeats within one message are logged once.
 
     Returns:
         dict: The created log payload and display echo.
@@ -84,9 +86,7 @@ def api_workouts_log_by_name(whatsapp_id: str, exercise_name: str, sets: int, re
         "weight": weight,   # Laravel converts to weight_kg internally
         "notes": None
     }
-    r = requests.post(f"{API_BASE}/workouts/log", json=payload, timeout=TIMEOUT)
-    r.raise_for_status()
-    return r.json()
+    return post_idempotent_sync("workouts/log", whatsapp_id, payload, write_origin(tool_context))
 
 def api_workouts_logs_today(whatsapp_id: str) -> Dict[str, Any]:
     """List today's workout logs for the user.
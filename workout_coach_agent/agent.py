@@ -2,8 +2,18 @@
 Workout Coach Agent - Multi-agent system for workout logging and coaching
 """
 from google.adk.agents import Agent
-from google.adk.tools import AgentTool
 from . import prompt
+from .dispatch import specialist_tool
+from .idempotency import remember_origin
+from .intent_router import (
+    EDIT_WORDS,
+    PROGRESS,
+    SETS_X_REPS,
+    TODAYS_WORKOUT,
+    FastPathRouter,
+    register_router,
+    rule,
+)
 from .sub_agents.hype.agent import hype
 from .sub_agents.analysis.agent import analyst
 from .sub_agents.logger.agent import logger
@@ -12,6 +22,20 @@ from .sub_agents.exercise.agent import exercise
 from .sub_agents.planner.agent import planner
 
 
+# ═══════════════════════════════════════════════════════════
+# FAST PATH (skips the coordinator's model for unambiguous messages)
+# ═══════════════════════════════════════════════════════════
+
+fast_path = register_router(FastPathRouter("workout_coach", [
+    # "bench 3x8 80kg", "squats 5 x 5 @ 100"
+    rule("logger", 0.9, [SETS_X_REPS], excludes=[EDIT_WORDS, r"\?", r"\b(plan|should|how|why|what)\b"]),
+    # "bench was 110kg not 105kg"
+    rule("edit", 0.9, [r"\b(was|were)\s+\d+(\.\d+)?\s*(kg|kgs|kilos?|lbs?|reps?)?\s+not\s+\d+"]),
+    rule("planner", 0.95, TODAYS_WORKOUT, excludes=[SETS_X_REPS]),
+    rule("analyst", 0.85, PROGRESS, excludes=[SETS_X_REPS]),
+]))
+
+
 # ═══════════════════════════════════════════════════════════
 # ROOT COORDINATOR AGENT
 # ═══════════════════════════════════════════════════════════
@@ -22,13 +46,18 @@ workout_coach = Agent(
     instruction=prompt.WORKOUT_COACH_PROMPT,
     description="Main workout coaching coordinator that routes to specialist agents",
     tools=[
-        AgentTool(agent=logger),
-        AgentTool(agent=edit),
-        AgentTool(agent=analyst),
-        AgentTool(agent=hype),
-        AgentTool(agent=exercise),
-        AgentTool(agent=planner),
-    ]
+        # Both rewrite today's workout in the session state: never at the same time
+        specialist_tool(logger, writes_state=True),
+        specialist_tool(edit, writes_state=True),
+        specialist_tool(analyst),
+        specialist_tool(hype),
+        specialist_tool(exercise),
+        specialist_tool(planner),
+    ],
+    # Specialists' writes are keyed on this message (see idempotency.remember_origin)
+    before_agent_callback=remember_origin,
+    before_model_callback=fast_path.before_model,
+    after_model_callback=fast_path.after_model,
 )
 
 
@@ -0,0 +1,180 @@
+"""
+Benchmark: latency per workout log with the LLM validator hop vs local validation.
+
+Runs the logger flow through the ADK runner with a stub model (fixed latency
+per call, scripted replies) and a stub Laravel backend, so the numbers show
+the cost of the flow itself:
+- before: SequentialAgent(validator LLM -> recorder LLM), the previous logger
+- after:  the recorder alone; log_workout validates names locally
+
+Also reports the cost of local validation per log on its own.
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_exercise_validation [--logs 20] [--llm-ms 600]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import timeit
+import warnings
+from typing import AsyncGenerator, List
+
+# Send logs inline so every run includes the (stub) backend round trip
+os.environ.setdefault("WORKOUT_WRITE_BEHIND", "false")
+
+from google.adk.agents import Agent, SequentialAgent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from workout_coach_agent import exercise_catalog
+from workout_coach_agent.exercise_catalog import ExerciseCatalog
+from workout_coach_agent.exercise_matcher import validate_exercise_names
+from workout_coach_agent.sub_agents.logger import agent as logger_agent
+from workout_coach_agent.sub_agents.logger import prompt
+
+CATALOG = [
+    "Bench Press", "Incline Bench Press", "Dumbbell Bench Press", "Squat", "Front Squat",
+    "Deadlift", "Romanian Deadlift", "Overhead Press", "Pull-Ups", "Chin-Ups", "Barbell Row",
+    "Dumbbell Row", "Lat Pulldown", "Seated Cable Row", "Bicep Curl", "Hammer Curl",
+    "Tricep Pushdown", "Skull Crushers", "Dips", "Leg Press", "Leg Curl", "Leg Extension",
+    "Calf Raise", "Hip Thrust", "Lunges", "Face Pull", "Lateral Raise", "Plank",
+]
+
+# What users type, as the model would pass it to log_workout
+WORKOUT_LOGS = [
+    [{"exercise_name": "bench press", "sets": 3, "reps": 8, "weight_kg": 80.0}],
+    [{"exercise_name": "squats", "sets": 5, "reps": 5, "weight_kg": 100.0},
+     {"exercise_name": "RDL", "sets": 3, "reps": 10, "weight_kg": 70.0}],
+    [{"exercise_name": "ohp", "sets": 4, "reps": 6, "weight_kg": 45.0},
+     {"exercise_name": "pullups", "sets": 3, "reps": 10, "weight_kg": 0.0},
+     {"exercise_name": "lat pull-down", "sets": 3, "reps": 12, "weight_kg": 50.0}],
+    [{"exercise_name": "deadlfit", "sets": 1, "reps": 5, "weight_kg": 160.0}],
+]
+
+
+class StubLlm(BaseLlm):
+    """Scripted model: validator says VALID, recorder calls log_workout then confirms."""
+
+    latency_s: float = 0.6
+    exercises: List[dict] = []
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s)
+
+        instruction = str(llm_request.config.system_instruction or "")
+        last = llm_request.contents[-1] if llm_request.contents else None
+        answered = last is not None and any(part.function_response for part in last.parts or ())
+
+        if "exercise validator" in instruction:
+            lines = [f"VALID: {e['exercise_name']} | {e['sets']} | {e['reps']} | {e['weight_kg']} |"
+                     for e in self.exercises]
+            part = types.Part(text="\n".join(lines))
+        elif answered:
+            part = types.Part(text="Logged!")
+        else:
+            part = types.Part(function_call=types.FunctionCall(
+                name="log_workout", args={"exercises": self.exercises}
+            ))
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+received: List[str] = []
+
+
+def stub_backend(backend_s: float):
+    def request(method, endpoint, data=None, timeout=None, headers=None):
+        time.sleep(backend_s)
+        received.extend(e["exercise_name"] for e in data["exercises"])
+        return {
+            "success": True,
+            "workout": {
+                "id": 1,
+                "workout_date": time.strftime("%Y-%m-%d"),
+                "total_volume_kg": 0,
+                "workout_exercises": [
+                    {"id": i, "exercise": {"name": e["exercise_name"]}, "set_number": 1,
+                     "weight_kg": e["weight_kg"], "reps": e["reps"]}
+                    for i, e in enumerate(data["exercises"])
+                ]
+            }
+        }
+    return request
+
+
+def build_flows(model: StubLlm):
+    tools = [logger_agent.log_workout, logger_agent.edit_workout]
+    before = SequentialAgent(name="logger", sub_agents=[
+        Agent(name="validator", model=model, instruction=logger_agent.validator_instruction,
+              tools=[logger_agent.get_allowed_exercises]),
+        Agent(name="recorder", model=model, instruction=prompt.LOGGER_PROMPT, tools=tools),
+    ])
+    after = Agent(name="logger", model=model, instruction=prompt.LOGGER_PROMPT, tools=tools)
+    return before, after
+
+
+async def run_flow(agent, model: StubLlm, logs: int) -> List[float]:
+    runner = InMemoryRunner(agent=agent, app_name="benchmark")
+    timings = []
+    for i in range(logs):
+        model.exercises = WORKOUT_LOGS[i % len(WORKOUT_LOGS)]
+        session = await runner.session_service.create_session(
+            app_name="benchmark", user_id="u1", state={"user_id": 1}
+        )
+        message = types.Content(role="user", parts=[types.Part(text="logged my workout")])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id="u1", session_id=session.id, new_message=message):
+            pass
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def _summary(timings: List[float]) -> str:
+    ordered = sorted(timings)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    return f"p50 {statistics.median(ordered):7.1f} ms | p95 {p95:7.1f} ms"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logs", type=int, default=20, help="workout logs per flow")
+    parser.add_argument("--llm-ms", type=float, default=600, help="stub model latency per call")
+    parser.add_argument("--backend-ms", type=float, default=40, help="stub backend latency")
+    args = parser.parse_args()
+
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    exercise_catalog._catalog = ExerciseCatalog(fetch=lambda: [{"name": name} for name in CATALOG])
+    logger_agent._make_laravel_request = stub_backend(args.backend_ms / 1000)
+
+    names = [e["exercise_name"] for log in WORKOUT_LOGS for e in log]
+    validate_exercise_names(names)  # build the matcher once
+    per_log = min(timeit.repeat(
+        lambda: [validate_exercise_names([e["exercise_name"] for e in log]) for log in WORKOUT_LOGS],
+        number=200, repeat=5
+    )) / (200 * len(WORKOUT_LOGS))
+    print(f"local validation: {per_log * 1e6:.1f} us per log ({len(CATALOG)} catalog exercises)")
+
+    print(f"{args.logs} logs, stub model {args.llm_ms:.0f} ms/call, stub backend {args.backend_ms:.0f} ms\n")
+    for name, index in (("before (LLM validator + recorder)", 0), ("after (local validation)", 1)):
+        model = StubLlm(model="stub", latency_s=args.llm_ms / 1000)
+        agent = build_flows(model)[index]
+        timings = await run_flow(agent, model, args.logs)
+        print(f"{name:34s} {_summary(timings)} | {model.calls / args.logs:.1f} model calls/log")
+
+    print(f"\nnames sent to the backend: {sorted(set(received))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,144 @@
+"""
+Benchmark: the fast-path intent router ahead of the workout coach.
+
+Replays a corpus of typical WhatsApp messages through the coordinator
+(stub models with a fixed latency per call, stub specialists answering with
+text) with the router off and on, and reports the latency per message and
+the router's metrics (share of messages on the fast path, model calls
+skipped, latency saved).
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_intent_router [--llm-ms 600]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import statistics
+import time
+import warnings
+from typing import AsyncGenerator, List
+
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import AgentTool
+from google.genai import types
+
+from workout_coach_agent import agent as coach
+
+# (message, specialist the coordinator model would pick or None to answer itself)
+CORPUS = [
+    ("bench 3x8 80kg", "logger"),
+    ("squat 5x5 100", "logger"),
+    ("bench 3x8@80kg, rows 3x10 60", "logger"),
+    ("pullups 3x12 bw", "logger"),
+    ("did deadlifts 1x5 at 160 kilos", "logger"),
+    ("5 sets of 10 reps leg press 200kg", "logger"),
+    ("ohp 4 x 6 45kg", "logger"),
+    ("what's my workout today", "planner"),
+    ("What is my workout for today?", "planner"),
+    ("what should I do today", "planner"),
+    ("today's workout pls", "planner"),
+    ("how am I doing", "analyst"),
+    ("show me my progress", "analyst"),
+    ("bench was 110kg not 105kg", "edit"),
+    ("squats were 8 reps not 5", "edit"),
+    ("actually I did 4 sets of squats", "edit"),
+    ("how do I brace for a heavy squat?", "exercise"),
+    ("I'm so tired today, not feeling it", "hype"),
+    ("should I take creatine?", None),
+    ("log bench 3x8 80kg and what's my workout today", "logger"),
+]
+
+
+class StubLlm(BaseLlm):
+    """Coordinator: routes to the scripted specialist, then passes its answer on."""
+
+    latency_s: float = 0.6
+    route: dict = {}
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency_s)
+        last = llm_request.contents[-1]
+        responses = [part.function_response for part in last.parts or () if part.function_response]
+        text = " ".join(part.text for part in last.parts or () if part.text)
+        specialist = self.route.get(text)
+        if responses or specialist is None:
+            part = types.Part(text=json.dumps(responses[0].response) if responses else "Sure!")
+        else:
+            part = types.Part(function_call=types.FunctionCall(name=specialist, args={"request": text}))
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+class SpecialistLlm(BaseLlm):
+    latency_s: float = 0.6
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency_s)
+        yield LlmResponse(content=types.Content(role="model", parts=[types.Part(text="Done!")]))
+
+
+def build(llm_s: float) -> Agent:
+    specialists = [
+        AgentTool(agent=Agent(name=name, model=SpecialistLlm(model="stub", latency_s=llm_s),
+                              description=f"The {name} specialist", instruction="Help."))
+        for name in ("logger", "edit", "analyst", "hype", "exercise", "planner")
+    ]
+    model = StubLlm(model="stub", latency_s=llm_s, route={m: s for m, s in CORPUS})
+    return Agent(
+        name="workout_coach", model=model, instruction="Coordinate.", tools=specialists,
+        before_model_callback=coach.fast_path.before_model,
+        after_model_callback=coach.fast_path.after_model,
+    )
+
+
+async def replay(llm_s: float) -> List[float]:
+    runner = InMemoryRunner(agent=build(llm_s), app_name="benchmark")
+    timings = []
+    for message, _ in CORPUS:
+        session = await runner.session_service.create_session(app_name="benchmark", user_id="u1")
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id="u1", session_id=session.id, new_message=content):
+            pass
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--llm-ms", type=float, default=600, help="stub model latency per call")
+    args = parser.parse_args()
+
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    router = coach.fast_path
+    print(f"{len(CORPUS)} messages, stub model {args.llm_ms:.0f} ms/call\n")
+    results = {}
+    for label, enabled in (("router off", False), ("router on", True)):
+        router.enabled = enabled
+        router.reset_stats()
+        timings = await replay(args.llm_ms / 1000)
+        results[label] = timings
+        print(f"{label:11} p50 {statistics.median(timings):7.1f} ms | "
+              f"mean {statistics.mean(timings):7.1f} ms | total {sum(timings) / 1000:5.1f} s")
+
+    print("\nrouter metrics:")
+    print(json.dumps(router.stats(), indent=2))
+    print("\nrouted messages:")
+    for message, expected in CORPUS:
+        route = router.classify(message)
+        marker = "" if route is None or route.tool == expected else "  <-- differs from the model"
+        print(f"  {message[:48]:50} {route.tool if route else '(model)'}{marker}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+"""
+Benchmark: latency of a message that needs several specialists.
+
+"log my bench, show today's plan and how my week went" needs the logger, the
+planner and the analyst. Runs the coordinator through the ADK runner with
+stub models (fixed latency per call, scripted replies) and a stub Laravel
+backend (blocking, like the real HTTP client), in three modes:
+- sequential: the coordinator calls one specialist per turn
+- parallel:   one turn with all three calls, plain AgentTool (sync tools
+              block the event loop, so the backend calls still queue up)
+- concurrent: one turn, ConcurrentAgentTool (sync tools run in threads,
+              bounded per message)
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_parallel_dispatch [--messages 10] [--llm-ms 600] [--backend-ms 150]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import warnings
+from typing import AsyncGenerator, Dict, List
+
+# Send logs inline so every run includes the (stub) backend round trip
+os.environ.setdefault("WORKOUT_WRITE_BEHIND", "false")
+
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import AgentTool
+from google.genai import types
+
+from workout_coach_agent import exercise_matcher
+from workout_coach_agent.dispatch import ConcurrentAgentTool
+from workout_coach_agent.sub_agents.analysis import agent as analysis_agent
+from workout_coach_agent.sub_agents.logger import agent as logger_agent
+from workout_coach_agent.sub_agents.planner import agent as planner_agent
+
+# Specialist -> the tool call its model makes
+SPECIALIST_CALLS = {
+    "logger": ("log_workout", {"exercises": [
+        {"exercise_name": "Bench Press", "sets": 3, "reps": 8, "weight_kg": 80.0}
+    ]}),
+    "planner": ("get_todays_workout", {}),
+    "analyst": ("get_workout_summary", {"days": 7}),
+}
+
+
+class StubLlm(BaseLlm):
+    """Scripted model: makes its scripted call(s), then answers with text."""
+
+    latency_s: float = 0.6
+    calls: List[Dict] = []
+    one_per_turn: bool = False
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency_s)
+        answered = sum(
+            1 for content in llm_request.contents for part in content.parts or () if part.function_response
+        )
+        if self.one_per_turn:
+            pending = self.calls[answered:answered + 1]
+        else:
+            pending = [] if answered else self.calls
+        if pending:
+            parts = [types.Part(function_call=types.FunctionCall(name=call["name"], args=call["args"]))
+                     for call in pending]
+        else:
+            parts = [types.Part(text="Done!")]
+        yield LlmResponse(content=types.Content(role="model", parts=parts))
+
+
+def stub_backend(backend_s: float):
+    """Blocking stand-in for _make_laravel_request."""
+    def request(method, endpoint, data=None, timeout=None, headers=None):
+        time.sleep(backend_s)
+        if endpoint == "workouts/log":
+            return {"success": True, "workout": {
+                "id": 1, "workout_date": time.strftime("%Y-%m-%d"), "total_volume_kg": 1920,
+                "workout_exercises": [
+                    {"id": i, "exercise": {"name": e["exercise_name"]}, "set_number": 1,
+                     "weight_kg": e["weight_kg"], "reps": e["reps"]}
+                    for i, e in enumerate(data["exercises"])
+                ]
+            }}
+        return {"success": True, "endpoint": endpoint}
+    return request
+
+
+def build_coach(mode: str, llm_s: float) -> Agent:
+    tools = {
+        "logger": [logger_agent.log_workout],
+        "planner": [planner_agent.get_todays_workout],
+        "analyst": [analysis_agent.get_workout_summary],
+    }
+    specialists = []
+    for name, (tool_name, args) in SPECIALIST_CALLS.items():
+        model = StubLlm(model="stub", latency_s=llm_s, calls=[{"name": tool_name, "args": args}])
+        agent = Agent(name=name, model=model, instruction=f"You are the {name}.",
+                      description=f"The {name} specialist", tools=list(tools[name]))
+        specialists.append(ConcurrentAgentTool(agent) if mode == "concurrent" else AgentTool(agent=agent))
+
+    root_model = StubLlm(
+        model="stub", latency_s=llm_s, one_per_turn=mode == "sequential",
+        calls=[{"name": name, "args": {"request": "please help"}} for name in SPECIALIST_CALLS]
+    )
+    return Agent(name="workout_coach", model=root_model, instruction="You coordinate.", tools=specialists)
+
+
+async def run(mode: str, messages: int, llm_s: float) -> List[float]:
+    runner = InMemoryRunner(agent=build_coach(mode, llm_s), app_name="benchmark")
+    timings = []
+    for _ in range(messages):
+        session = await runner.session_service.create_session(
+            app_name="benchmark", user_id="u1", state={"user_id": 1}
+        )
+        message = types.Content(role="user", parts=[types.Part(
+            text="log bench 3x8 80kg, what's my workout today and how did my week go?"
+        )])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id="u1", session_id=session.id, new_message=message):
+            pass
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=10, help="messages per mode")
+    parser.add_argument("--llm-ms", type=float, default=600, help="stub model latency per call")
+    parser.add_argument("--backend-ms", type=float, default=150, help="stub backend latency")
+    args = parser.parse_args()
+
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore", category=DeprecationWarning)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    backend = stub_backend(args.backend_ms / 1000)
+    for module in (logger_agent, planner_agent, analysis_agent):
+        module._make_laravel_request = backend
+    # No catalog: names are not validated in this benchmark
+    exercise_matcher.validate_exercise_names = lambda names: {}
+    logger_agent.validate_exercise_names = lambda names: {}
+
+    print(f"stub model {args.llm_ms:.0f} ms/call, stub backend {args.backend_ms:.0f} ms/request, "
+          f"3 specialists per message\n")
+    results = {}
+    for mode in ("sequential", "parallel", "concurrent"):
+        timings = await run(mode, args.messages, args.llm_ms / 1000)
+        results[mode] = statistics.median(timings)
+        print(f"{mode:11} p50 {results[mode]:7.1f} ms | max {max(timings):7.1f} ms")
+    print(f"\nconcurrent vs sequential: {results['sequential'] / results['concurrent']:.2f}x faster")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
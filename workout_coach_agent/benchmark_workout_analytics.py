@@ -0,0 +1,159 @@
+"""
+Benchmark: local workout analytics over 5 years of synthetic sets.
+
+Builds one user's history (4 sessions a week, 4-6 exercises, 3-5 sets each,
+slow progressive overload) and compares, for the same questions:
+- before: the history as the API returns it (JSON the analyst model had to
+  read) and a pure-Python pass over those rows
+- after:  the columnar SetStore and its NumPy aggregates
+
+Reports ingest time (full backfill and an incremental one-day sync), the time
+per aggregate and the size of what the model gets to read.
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_workout_analytics [--years 5] [--seed 7]
+"""
+import argparse
+import json
+import random
+import timeit
+from datetime import date, timedelta
+from typing import Dict, List
+
+import numpy as np
+
+from workout_coach_agent import workout_analytics
+from workout_coach_agent.workout_analytics import (
+    SetStore,
+    WorkoutAnalytics,
+    e1rm_trend,
+    frequency,
+    history_rows,
+    muscle_group_for,
+    personal_records,
+    weekly_volume,
+)
+
+EXERCISES = {
+    "Bench Press": 60, "Back Squat": 80, "Deadlift": 100, "Overhead Press": 40, "Barbell Row": 50,
+    "Pull Up": 0, "Romanian Deadlift": 70, "Incline Bench Press": 50, "Leg Press": 120, "Bicep Curl": 12,
+    "Tricep Pushdown": 20, "Lateral Raise": 8, "Lunge": 30, "Hip Thrust": 80, "Calf Raise": 60
+}
+
+
+def synthetic_history(years: int, seed: int, today: date) -> Dict:
+    """A workouts/history response covering `years` years up to `today`."""
+    rng = random.Random(seed)
+    workouts = []
+    days = years * 365
+    for offset in range(days, -1, -1):
+        if rng.random() > 4 / 7:
+            continue
+        progress = 1 + 0.5 * (days - offset) / days
+        entries = []
+        for name in rng.sample(list(EXERCISES), rng.randint(4, 6)):
+            weight = round(EXERCISES[name] * progress * rng.uniform(0.9, 1.1) / 2.5) * 2.5
+            reps = rng.randint(3, 12)
+            for set_number in range(1, rng.randint(3, 5) + 1):
+                entries.append({
+                    "id": len(workouts) * 100 + len(entries),
+                    "set_number": set_number,
+                    "weight_kg": weight,
+                    "reps": reps,
+                    "exercise": {"name": name}
+                })
+        workouts.append({
+            "id": len(workouts) + 1,
+            "workout_date": (today - timedelta(days=offset)).isoformat() + "T00:00:00.000000Z",
+            "workout_exercises": entries
+        })
+    return {"workouts": workouts}
+
+
+def python_aggregates(rows: List[tuple], today: int, weeks: int) -> Dict:
+    """The same aggregates as plain Python over row tuples, for comparison."""
+    first_week = (today - 1) // 7 - weeks + 1
+    volume: Dict[int, Dict[str, float]] = {}
+    best: Dict[str, float] = {}
+    prs = {}
+    days = set()
+    for day, name, _, weight, reps in sorted(rows, key=lambda row: row[0]):
+        e1rm = weight if reps <= 1 else weight * (1 + reps / 30)
+        week = (day - 1) // 7
+        if week >= first_week:
+            group = muscle_group_for(name)
+            volume.setdefault(week, {}).setdefault(group, 0.0)
+            volume[week][group] += weight * reps
+            days.add(day)
+            if name in best and e1rm > best[name]:
+                prs[name] = e1rm
+        if name not in best or e1rm > best[name]:
+            best[name] = e1rm
+    return {"volume": volume, "prs": prs, "days": len(days)}
+
+
+def numpy_aggregates(store: SetStore, today: int, weeks: int) -> Dict:
+    since = ((today - 1) // 7 - weeks + 1) * 7 + 1
+    return {
+        "volume": weekly_volume(store, today, weeks),
+        "prs": personal_records(store, since),
+        "frequency": frequency(store, today, weeks),
+        "trend": e1rm_trend(store, 0, today, 52),
+    }
+
+
+def ms(statement, number: int = 20) -> float:
+    return timeit.timeit(statement, number=number) / number * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--years", type=int, default=5, help="years of history")
+    parser.add_argument("--weeks", type=int, default=4, help="analysis window in weeks")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    today = date.today()
+    history = synthetic_history(args.years, args.seed, today)
+    raw_json = json.dumps(history)
+    rows = history_rows(history)
+    ordinal = today.toordinal()
+    print(f"{len(history['workouts'])} workouts, {len(rows)} sets over {args.years} years\n")
+
+    def backfill() -> SetStore:
+        store = SetStore()
+        store.replace_from(ordinal - args.years * 365 - 1, rows)
+        return store
+
+    store = backfill()
+    today_rows = [row for row in rows if row[0] == ordinal]
+    print("ingest")
+    print(f"  parse API response:        {ms(lambda: history_rows(history), 3):9.2f} ms")
+    print(f"  full backfill into store:  {ms(backfill, 3):9.2f} ms")
+    print(f"  incremental sync (1 day):  {ms(lambda: store.replace_from(ordinal, today_rows), 200):9.3f} ms")
+
+    analytics = WorkoutAnalytics(fetch=lambda user_id, days: [row for row in rows if row[0] > ordinal - days])
+    workout_analytics._analytics = analytics
+    overview = workout_analytics.training_overview(1, args.weeks)
+
+    print(f"\naggregates over a {args.weeks}-week window (volume per group, PRs, frequency)")
+    print(f"  before (Python loop):      {ms(lambda: python_aggregates(rows, ordinal, args.weeks), 5):9.2f} ms")
+    print(f"  after (NumPy):             {ms(lambda: numpy_aggregates(store, ordinal, args.weeks)):9.2f} ms")
+    print(f"  training_overview tool:    {ms(lambda: workout_analytics.training_overview(1, args.weeks)):9.2f} ms")
+
+    window = {"workouts": [w for w in history["workouts"] if w["workout_date"] >= (today - timedelta(weeks=args.weeks)).isoformat()]}
+    print("\nwhat the model reads")
+    print(f"  raw history, {args.weeks} weeks:     {len(json.dumps(window)) / 1024:9.1f} KB")
+    print(f"  raw history, all:          {len(raw_json) / 1024:9.1f} KB")
+    print(f"  training_overview result:  {len(json.dumps(overview)) / 1024:9.1f} KB")
+
+    # The two implementations must agree on the headline numbers
+    python_result = python_aggregates(rows, ordinal, args.weeks)
+    numpy_volume = sum(sum(groups.values()) for groups in weekly_volume(store, ordinal, args.weeks).values())
+    python_volume = sum(sum(groups.values()) for groups in python_result["volume"].values())
+    assert np.isclose(numpy_volume, python_volume, rtol=1e-4), (numpy_volume, python_volume)
+    assert overview["frequency"]["training_days"] == python_result["days"]
+
+
+if __name__ == "__main__":
+    main()
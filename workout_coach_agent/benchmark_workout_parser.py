@@ -0,0 +1,244 @@
+"""
+Benchmark: accuracy and throughput of the local workout-log parser.
+
+Runs parse_workout_log over a labelled corpus of log messages (with the
+payload log_workout should get) and of messages that are not new logs
+(edits, questions, chat), and reports:
+- coverage:  share of log messages parsed confidently (no model needed)
+- accuracy:  share of confident parses that match the label exactly
+- false logs: non-log messages parsed confidently (should be 0)
+- throughput: messages parsed per second
+Then replays the log messages through the logger agent (stub model with a
+fixed latency, stub backend) with the parser off and on, and reports the
+model calls and latency per message.
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_workout_parser [--repeat 2000] [--llm-ms 600]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import time
+import warnings
+from typing import AsyncGenerator, List, Optional, Tuple
+
+# Send logs inline so the stub backend answers every log
+os.environ.setdefault("WORKOUT_WRITE_BEHIND", "false")
+
+from google.adk.agents import Agent
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from workout_coach_agent import exercise_catalog, workout_parser
+from workout_coach_agent.sub_agents.logger import agent as logger_agent
+from workout_coach_agent.sub_agents.logger import prompt
+from workout_coach_agent.workout_parser import WORKOUT_PARSER_MIN_CONFIDENCE, parse_workout_log
+
+
+def ex(name: str, sets: int, reps: int, weight: float, notes: Optional[str] = None) -> dict:
+    exercise = {"exercise_name": name, "sets": sets, "reps": reps, "weight_kg": weight}
+    if notes:
+        exercise["notes"] = notes
+    return exercise
+
+
+# Stub exercise catalog; the parser leaves names with other words to the model
+CATALOG = [{"name": name} for name in (
+    "Bench Press", "Incline Bench Press", "Back Squat", "Front Squat", "Deadlift", "Romanian Deadlift",
+    "Overhead Press", "Barbell Row", "Pull Up", "Chin Up", "Dip", "Push Up", "Leg Press", "Lat Pulldown",
+    "Bicep Curl", "Lateral Raise", "Cable Flyes", "Hip Thrust", "Calf Raise",
+)] + [{"name": "Incline Dumbbell Press", "aliases": ["incline db press"]}]
+
+
+# (message, expected payload; None: leave to the model)
+LOGS: List[Tuple[str, Optional[List[dict]]]] = [
+    ("squat 5x5 100", [ex("squat", 5, 5, 100.0)]),
+    ("bench 3x8 80kg", [ex("bench", 3, 8, 80.0)]),
+    ("bench 3x8@80kg, rows 3x10 60", [ex("bench", 3, 8, 80.0), ex("rows", 3, 10, 60.0)]),
+    ("pullups 3x12 bw", [ex("pullups", 3, 12, 0.0, "bodyweight")]),
+    ("dips 3x10 bw+20kg", [ex("dips", 3, 10, 20.0, "bodyweight +20kg")]),
+    ("did deadlifts 1x5 at 160 kilos", [ex("deadlifts", 1, 5, 160.0)]),
+    ("5 sets of 10 reps leg press 200kg", [ex("leg press", 5, 10, 200.0)]),
+    ("5 sets of 10 reps deadlifts at 140 kilos", [ex("deadlifts", 5, 10, 140.0)]),
+    ("I did 3 sets of bench press, 8 reps at 80kg", [ex("bench press", 3, 8, 80.0)]),
+    ("Just finished squats 5x5 @ 100kg", [ex("squats", 5, 5, 100.0)]),
+    ("I did bench 3x8x80, squats 5x5x100, rows 3x10x60",
+     [ex("bench", 3, 8, 80.0), ex("squats", 5, 5, 100.0), ex("rows", 3, 10, 60.0)]),
+    ("ohp 4 x 6 45kg", [ex("ohp", 4, 6, 45.0)]),
+    ("ohp 4x6 135lb", [ex("ohp", 4, 6, 61.23)]),
+    ("bench 3x5 225 lbs", [ex("bench", 3, 5, 102.06)]),
+    ("bench 3x8 80kg @8 rpe", [ex("bench", 3, 8, 80.0, "RPE 8")]),
+    ("squat 3x5 120kg rpe 8.5", [ex("squat", 3, 5, 120.0, "RPE 8.5")]),
+    ("bench 80kg 3x8", [ex("bench", 3, 8, 80.0)]),
+    ("curls 3x12 12.5kg and lateral raises 3x15 8kg",
+     [ex("curls", 3, 12, 12.5), ex("lateral raises", 3, 15, 8.0)]),
+    ("leg press 4x12 200", [ex("leg press", 4, 12, 200.0)]),
+    ("rdl 3×10 90kg", [ex("rdl", 3, 10, 90.0)]),
+    ("incline db press 3x10 30kg; cable flyes 3x12 15kg",
+     [ex("incline db press", 3, 10, 30.0), ex("cable flyes", 3, 12, 15.0)]),
+    ("chin ups 4x8 bodyweight", [ex("chin ups", 4, 8, 0.0, "bodyweight")]),
+    ("log bench 3x8 80kg", [ex("bench", 3, 8, 80.0)]),
+    ("squat 5x5 100kg\nbench 5x5 70kg\nrows 5x5 60kg",
+     [ex("squat", 5, 5, 100.0), ex("bench", 5, 5, 70.0), ex("rows", 5, 5, 60.0)]),
+    ("hip thrust 3x10 100kg then calf raises 4x15 60kg",
+     [ex("hip thrust", 3, 10, 100.0), ex("calf raises", 4, 15, 60.0)]),
+    ("front squat 3 x 5 @ 80 kg", [ex("front squat", 3, 5, 80.0)]),
+    ("lat pulldown 3x10 at 55", [ex("lat pulldown", 3, 10, 55.0)]),
+    # Left to the model: ranges, per-set weights, missing numbers
+    ("bench 3x8-10 80kg", None),
+    ("bench 80x8, 85x6, 90x4", None),
+    ("pushups 3x20", None),
+    ("did some bench today, felt strong", None),
+    ("squats 100kg", None),
+    ("bench 3x8 80kg 85kg", None),
+    ("I did 3x8 bench yesterday at 80kg", None),
+    ("bench 3x8 80kg for my chest day", None),
+]
+
+NOT_LOGS = [
+    "bench was 110kg not 105kg",
+    "squats were 8 reps not 5",
+    "actually I did 4 sets of squats",
+    "change the bench to 100kg",
+    "what's my workout today",
+    "how do I brace for a heavy squat?",
+    "should I do 3x8 or 5x5?",
+    "I'm so tired today, not feeling it",
+    "show me my progress",
+    "can I swap bench for dips 3x10?",
+]
+
+
+def evaluate() -> dict:
+    confident = correct = false_logs = deferred_right = 0
+    mistakes = []
+    for message, expected in LOGS:
+        parsed = parse_workout_log(message)
+        if parsed.confidence < WORKOUT_PARSER_MIN_CONFIDENCE:
+            deferred_right += expected is None
+            if expected is not None:
+                mistakes.append(f"not parsed: {message!r} ({'; '.join(parsed.issues)})")
+            continue
+        confident += 1
+        if parsed.exercises == expected:
+            correct += 1
+        else:
+            mistakes.append(f"wrong: {message!r} -> {parsed.exercises}")
+    for message in NOT_LOGS:
+        if parse_workout_log(message).confidence >= WORKOUT_PARSER_MIN_CONFIDENCE:
+            false_logs += 1
+            mistakes.append(f"false log: {message!r}")
+    parseable = sum(1 for _, expected in LOGS if expected is not None)
+    return {
+        "parseable": parseable, "confident": confident, "correct": correct,
+        "deferred_right": deferred_right, "false_logs": false_logs, "mistakes": mistakes,
+    }
+
+
+def throughput(repeat: int) -> float:
+    messages = [message for message, _ in LOGS] + NOT_LOGS
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            parse_workout_log(message)
+    return repeat * len(messages) / (time.perf_counter() - started)
+
+
+class StubLlm(BaseLlm):
+    """Logger model: logs a fixed payload, then confirms; counts its calls."""
+
+    latency_s: float = 0.6
+    calls: int = 0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        await asyncio.sleep(self.latency_s)
+        StubLlm.calls += 1
+        last = llm_request.contents[-1]
+        if any(part.function_response for part in last.parts or ()):
+            part = types.Part(text="Logged!")
+        else:
+            part = types.Part(function_call=types.FunctionCall(name="log_workout", args={"exercises": [
+                {"exercise_name": "Bench Press", "sets": 3, "reps": 8, "weight_kg": 80.0}
+            ]}))
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+def stub_backend(method, endpoint, data=None, timeout=None, headers=None):
+    return {"success": True, "workout": {
+        "id": 1, "workout_date": time.strftime("%Y-%m-%d"), "total_volume_kg": 0,
+        "workout_exercises": [
+            {"id": i, "exercise": {"name": e["exercise_name"]}, "set_number": 1,
+             "weight_kg": e["weight_kg"], "reps": e["reps"]}
+            for i, e in enumerate(data["exercises"])
+        ]
+    }}
+
+
+async def replay(llm_s: float) -> Tuple[List[float], int]:
+    agent = Agent(
+        name="logger", model=StubLlm(model="stub", latency_s=llm_s), instruction=prompt.LOGGER_PROMPT,
+        tools=[logger_agent.log_workout], before_model_callback=logger_agent.parsed_log_callback,
+    )
+    runner = InMemoryRunner(agent=agent, app_name="benchmark")
+    StubLlm.calls = 0
+    timings = []
+    for index, (message, _) in enumerate(LOGS):
+        session = await runner.session_service.create_session(
+            app_name="benchmark", user_id=f"u{index}", state={"user_id": index}
+        )
+        content = types.Content(role="user", parts=[types.Part(text=message)])
+        started = time.perf_counter()
+        async for _ in runner.run_async(user_id=f"u{index}", session_id=session.id, new_message=content):
+            pass
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, StubLlm.calls
+
+
+def workout_parser_enabled(enabled: bool) -> None:
+    # The callback reads the flag from the logger module's namespace
+    workout_parser.WORKOUT_LOG_PARSER = enabled
+    logger_agent.WORKOUT_LOG_PARSER = enabled
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=2000, help="passes over the corpus for throughput")
+    parser.add_argument("--llm-ms", type=float, default=600, help="stub model latency per call")
+    args = parser.parse_args()
+
+    logging.getLogger("google_adk").setLevel(logging.ERROR)
+    warnings.filterwarnings("ignore", category=UserWarning)
+
+    exercise_catalog._catalog = exercise_catalog.ExerciseCatalog(fetch=lambda: CATALOG)
+    exercise_catalog.get_exercise_catalog().refresh()
+
+    result = evaluate()
+    print(f"corpus: {len(LOGS)} log messages ({result['parseable']} parseable), "
+          f"{len(NOT_LOGS)} other messages, min confidence {WORKOUT_PARSER_MIN_CONFIDENCE}\n")
+    print(f"coverage   {result['confident']}/{result['parseable']} parseable logs handled locally "
+          f"({result['confident'] / result['parseable']:.0%})")
+    print(f"accuracy   {result['correct']}/{result['confident']} confident parses match the label")
+    print(f"deferred   {result['deferred_right']}/{len(LOGS) - result['parseable']} unusual logs left to the model")
+    print(f"false logs {result['false_logs']}/{len(NOT_LOGS)} edits/questions parsed as logs")
+    for mistake in result["mistakes"]:
+        print(f"  {mistake}")
+    print(f"throughput {throughput(args.repeat):,.0f} messages/s\n")
+
+    logger_agent._make_laravel_request = stub_backend
+    print(f"logger agent, stub model {args.llm_ms:.0f} ms/call, {len(LOGS)} log messages:")
+    for label, enabled in (("parser off", False), ("parser on", True)):
+        workout_parser_enabled(enabled)
+        timings, calls = await replay(args.llm_ms / 1000)
+        print(f"{label:10} model calls {calls:3} | p50 {statistics.median(timings):7.1f} ms | "
+              f"mean {statistics.mean(timings):7.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+"""
+Benchmark: session state size and serialisation time over a simulated year.
+
+ADK serialises the whole session state on every event, so its size is paid
+on every turn. Replays a year of workout logs (4 sessions a week, a few
+exercises per log, several logs per session) into two state layouts:
+- before: a full "last_workout_<date>" copy per day plus "last_workout"
+- after:  workout_state (today's rows + name index, bounded day summaries)
+
+and reports the final state size, the JSON serialisation time per event and
+the cost of looking up an exercise's IDs for an edit.
+
+Usage (from the repo root):
+    python -m workout_coach_agent.benchmark_workout_state [--days 365] [--seed 7]
+"""
+import argparse
+import json
+import random
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Dict, List, MutableMapping
+
+from workout_coach_agent import workout_state
+from workout_coach_agent.workout_state import TODAY_KEY, add_to_today, find_exercise_ids
+
+EXERCISES = [
+    "Bench Press", "Back Squat", "Deadlift", "Overhead Press", "Barbell Row",
+    "Pull Up", "Romanian Deadlift", "Incline Bench Press", "Leg Press", "Bicep Curl",
+    "Tricep Extension", "Lateral Raise", "Lunge", "Hip Thrust", "Calf Raise"
+]
+
+
+def legacy_add_to_today(state: MutableMapping, cleaned_response: Dict, today: str) -> Dict:
+    """The previous layout: one full copy per day plus "last_workout"."""
+    date_key = f"last_workout_{today}"
+    existing_workout = state.get(date_key)
+    if existing_workout and existing_workout.get("workout_date") == today:
+        existing_workout["exercises"].extend(cleaned_response["exercises"])
+        existing_workout["total_volume_kg"] += cleaned_response["total_volume_kg"]
+        state[date_key] = existing_workout
+        state["last_workout"] = existing_workout
+        return existing_workout
+    state[date_key] = cleaned_response
+    state["last_workout"] = cleaned_response
+    return cleaned_response
+
+
+def simulate_logs(days: int, seed: int) -> List[Dict]:
+    """Cleaned log_workout responses for a year of training."""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    next_id = 1
+    logs = []
+    for day in range(days):
+        if rng.random() > 4 / 7:
+            continue
+        today = (start + timedelta(days=day)).isoformat()
+        for _ in range(rng.randint(2, 4)):
+            rows = []
+            for name in rng.sample(EXERCISES, rng.randint(1, 3)):
+                weight = float(rng.randrange(20, 140, 5))
+                reps = rng.randint(5, 12)
+                for set_number in range(1, rng.randint(3, 5) + 1):
+                    rows.append({
+                        "workout_exercise_id": next_id,
+                        "name": name,
+                        "set_number": set_number,
+                        "weight_kg": weight,
+                        "reps": reps,
+                    })
+                    next_id += 1
+            logs.append({
+                "success": True,
+                "message": "Workout logged!",
+                "workout_id": day + 1,
+                "workout_date": today,
+                "total_volume_kg": sum(row["weight_kg"] * row["reps"] for row in rows),
+                "exercises": rows
+            })
+    return logs
+
+
+class _Clock:
+    """Stands in for workout_state.datetime so add_to_today sees simulated dates."""
+    today = "2025-01-01"
+
+    @classmethod
+    def now(cls) -> datetime:
+        return datetime.fromisoformat(cls.today)
+
+
+def replay(logs: List[Dict], legacy: bool) -> Dict:
+    state: Dict = {"user_id": 1}
+    sizes, times = [], []
+    for log in logs:
+        log = json.loads(json.dumps(log))
+        if legacy:
+            legacy_add_to_today(state, log, log["workout_date"])
+        else:
+            _Clock.today = log["workout_date"]
+            add_to_today(state, log)
+        # One serialisation per event, as the session service does
+        elapsed = timeit.timeit(lambda: json.dumps(state), number=5) / 5
+        sizes.append(len(json.dumps(state)))
+        times.append(elapsed)
+    return {"state": state, "sizes": sizes, "times": times}
+
+
+def legacy_lookup(state: Dict, exercise_name: str) -> List:
+    return [
+        row.get("workout_exercise_id") for row in state.get("last_workout", {}).get("exercises", [])
+        if row.get("name", "").lower() == exercise_name.lower()
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--days", type=int, default=365, help="days of training to simulate")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    logs = simulate_logs(args.days, args.seed)
+    real_datetime = workout_state.datetime
+    workout_state.datetime = _Clock
+    try:
+        results = {"before": replay(logs, legacy=True), "after": replay(logs, legacy=False)}
+    finally:
+        workout_state.datetime = real_datetime
+
+    print(f"{len(logs)} logs over {args.days} days, "
+          f"{sum(len(log['exercises']) for log in logs)} sets "
+          f"(WORKOUT_STATE_DAYS={workout_state.WORKOUT_STATE_DAYS})\n")
+    print(f"{'':8}{'final KB':>10}{'max KB':>10}{'last ms':>10}{'total ms':>10}{'keys':>7}")
+    for label, result in results.items():
+        print(f"{label:8}"
+              f"{result['sizes'][-1] / 1024:>10.1f}"
+              f"{max(result['sizes']) / 1024:>10.1f}"
+              f"{result['times'][-1] * 1000:>10.3f}"
+              f"{sum(result['times']) * 1000:>10.1f}"
+              f"{len(result['state']):>7}")
+
+    before, after = results["before"]["state"], results["after"]["state"]
+    name = before["last_workout"]["exercises"][-1]["name"]
+    assert legacy_lookup(before, name) == find_exercise_ids(after[TODAY_KEY], name)
+    number = 10000
+    print(f"\nedit lookup of {name!r} in today's workout:")
+    print(f"  before (scan rows):  {timeit.timeit(lambda: legacy_lookup(before, name), number=number) / number * 1e6:.2f} us")
+    print(f"  after (name index):  "
+          f"{timeit.timeit(lambda: find_exercise_ids(after[TODAY_KEY], name), number=number) / number * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
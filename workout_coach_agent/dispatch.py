@@ -0,0 +1,123 @@
+"""
+Concurrent dispatch of the coordinator's specialist calls.
+
+When the coordinator's model answers with several function calls in one turn
+("log my bench and show today's plan"), ADK starts them as asyncio tasks and
+merges their responses in call order. Two things kept them from overlapping:
+- the specialists' tools are synchronous (blocking HTTP), so each backend
+  call stalled the event loop and with it every other specialist
+- nothing bounded how many specialists (each a full sub-agent run with its
+  own model calls) one message could start at once
+
+ConcurrentAgentTool wraps a specialist so that its synchronous tools run in
+worker threads (asyncio.to_thread) and at most
+WORKOUT_COACH_MAX_CONCURRENT_TOOLS specialists of one invocation (one user
+message) run at a time. Responses still merge in call order.
+
+Specialists that rewrite session state (the logger and edit both replace the
+whole of today's workout) must not overlap: AgentTool gives each run its own
+copy of the state and merges every changed value back when it finishes, so
+the last one to finish would overwrite the other's change. Those are created
+with writes_state=True and take turns within an invocation.
+"""
+import asyncio
+import contextlib
+import functools
+import inspect
+import os
+from typing import Any, Callable, Dict, List
+
+from google.adk.agents import BaseAgent
+from google.adk.tools import AgentTool, FunctionTool, ToolContext
+
+# Run the coordinator's specialists concurrently (off: plain AgentTool)
+WORKOUT_COACH_PARALLEL_TOOLS = os.getenv("WORKOUT_COACH_PARALLEL_TOOLS", "true").lower() in ("1", "true", "yes")
+# Specialists running at the same time for one user message
+WORKOUT_COACH_MAX_CONCURRENT_TOOLS = int(os.getenv("WORKOUT_COACH_MAX_CONCURRENT_TOOLS", "4"))
+
+# invocation_id -> [semaphore, specialists holding or waiting for it, state
+# lock]; only touched from the event loop, so no lock is needed
+_invocation_slots: Dict[str, List[Any]] = {}
+
+
+def in_thread(func: Callable) -> Callable:
+    """
+    Async version of a synchronous tool function that runs it in a worker thread.
+
+    The wrapper keeps the function's name, docstring and signature, so ADK
+    builds the same declaration (and still injects tool_context).
+    """
+    if inspect.iscoroutinefunction(func):
+        return func
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> Any:
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+    return wrapper
+
+
+def offload_sync_tools(agent: BaseAgent) -> BaseAgent:
+    """Make an agent's (and its sub-agents') synchronous function tools run in threads, in place."""
+    tools = getattr(agent, "tools", None)
+    if tools:
+        offloaded = []
+        for tool in tools:
+            if isinstance(tool, FunctionTool):
+                tool = FunctionTool(in_thread(tool.func))
+            elif callable(tool) and not hasattr(tool, "run_async"):
+                tool = in_thread(tool)
+            offloaded.append(tool)
+        agent.tools = offloaded
+    for sub_agent in agent.sub_agents:
+        offload_sync_tools(sub_agent)
+    return agent
+
+
+class ConcurrentAgentTool(AgentTool):
+    """
+    AgentTool whose runs overlap with other specialists', up to a shared limit.
+
+    With writes_state=True, runs of this and other state-writing specialists
+    of the same invocation take turns, so each starts from the state the
+    previous one left.
+    """
+
+    def __init__(
+        self,
+        agent: BaseAgent,
+        limit: int = WORKOUT_COACH_MAX_CONCURRENT_TOOLS,
+        writes_state: bool = False,
+        **kwargs: Any
+    ):
+        super().__init__(agent=offload_sync_tools(agent), **kwargs)
+        self.limit = max(1, limit)
+        self.writes_state = writes_state
+
+    async def run_async(self, *, args: dict, tool_context: ToolContext) -> Any:
+        key = tool_context.invocation_id
+        slot = _invocation_slots.setdefault(key, [asyncio.Semaphore(self.limit), 0, asyncio.Lock()])
+        slot[1] += 1
+        try:
+            # The state lock first, so a writer waiting for its turn holds no slot
+            async with slot[2] if self.writes_state else contextlib.nullcontext():
+                async with slot[0]:
+                    return await super().run_async(args=args, tool_context=tool_context)
+        finally:
+            slot[1] -= 1
+            if not slot[1]:
+                _invocation_slots.pop(key, None)
+
+
+def specialist_tool(agent: BaseAgent, writes_state: bool = False) -> AgentTool:
+    """
+    The coordinator's tool for a specialist agent.
+
+    Args:
+        agent: The specialist
+        writes_state: The specialist rewrites session state values other
+            specialists also write (runs of such specialists take turns)
+    """
+    if WORKOUT_COACH_PARALLEL_TOOLS:
+        return ConcurrentAgentTool(agent, writes_state=writes_state)
+    return AgentTool(agent=agent)
@@ -0,0 +1,173 @@
+"""
+Cached catalog of the exercises users are allowed to log.
+
+The catalog is loaded from the Laravel API on first use (never at import)
+and kept for EXERCISE_CATALOG_TTL_SECONDS. After that, readers get the
+stale list immediately while a background thread refreshes it
+(stale-while-revalidate). A failed refresh keeps the last good list and is
+retried after EXERCISE_CATALOG_RETRY_SECONDS.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from workout_coach_agent.tools import _make_laravel_request
+
+EXERCISE_CATALOG_TTL_SECONDS = float(os.getenv("EXERCISE_CATALOG_TTL_SECONDS", "300"))
+EXERCISE_CATALOG_RETRY_SECONDS = float(os.getenv("EXERCISE_CATALOG_RETRY_SECONDS", "30"))
+# Timeout for the catalog request; the first load blocks on it
+EXERCISE_CATALOG_FETCH_TIMEOUT = float(os.getenv("EXERCISE_CATALOG_FETCH_TIMEOUT", "5"))
+
+logger = logging.getLogger(__name__)
+
+
+def fetch_exercises(timeout: float = EXERCISE_CATALOG_FETCH_TIMEOUT) -> Optional[List[Dict[str, Any]]]:
+    """
+    Fetches the exercise list from the Laravel API.
+
+    Args:
+        timeout: Request timeout in seconds
+
+    Returns:
+        List of exercise dictionaries with at least a name, or None if the
+        request failed or the response had an unexpected format
+    """
+    response = _make_laravel_request("GET", "exercises", None, timeout=timeout)
+    if isinstance(response, dict) and "error" in response:
+        return None
+    # API returns {"exercises": [{"name": "Bench Press", ...}, ...]}
+    if isinstance(response, dict) and "exercises" in response:
+        exercises = response["exercises"]
+    elif isinstance(response, dict) and "data" in response:
+        exercises = response["data"]
+    elif isinstance(response, list):
+        exercises = response
+    else:
+        logger.warning("Unexpected response format from exercises API: %s", response)
+        return None
+    return [exercise for exercise in exercises if isinstance(exercise, dict) and exercise.get("name")]
+
+
+class ExerciseCatalog:
+    """
+    TTL cache of the exercise catalog with background refresh.
+
+    `version` increases every time the list changes, so derived data (rendered
+    prompts, match indexes) can be rebuilt only when needed.
+    """
+
+    def __init__(
+        self,
+        ttl: float = EXERCISE_CATALOG_TTL_SECONDS,
+        retry_after: float = EXERCISE_CATALOG_RETRY_SECONDS,
+        fetch: Callable[[], Optional[List[Dict[str, Any]]]] = fetch_exercises
+    ):
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._exercises: List[Dict[str, Any]] = []
+        self._names: List[str] = []
+        self._loaded_at: Optional[float] = None
+        self._failed_at: Optional[float] = None
+        self._refreshing = False
+        self.version = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def names(self, wait: bool = True) -> List[str]:
+        """
+        Allowed exercise names.
+
+        Args:
+            wait: On a cold cache, block on the first load (default). With
+                  False, start it in the background and return [] for now.
+
+        Returns:
+            Exercise names (possibly stale, or [] if the API was never reachable)
+        """
+        self._ensure_fresh(wait)
+        return self._names
+
+    def exercises(self, wait: bool = True) -> List[Dict[str, Any]]:
+        """Full exercise records, with the same caching as names()."""
+        self._ensure_fresh(wait)
+        return self._exercises
+
+    def refresh(self) -> bool:
+        """
+        Reload the catalog now (blocking).
+
+        Returns:
+            True if the catalog was loaded, False if the fetch failed
+            (the previous list is kept)
+        """
+        try:
+            exercises = self._fetch()
+        except Exception as e:
+            logger.warning("Failed to fetch exercises from API: %s", e)
+            exercises = None
+        finally:
+            self._refreshing = False
+
+        if exercises is None:
+            self._failed_at = time.monotonic()
+            return False
+
+        names = [exercise["name"] for exercise in exercises]
+        with self._lock:
+            if names != self._names:
+                self.version += 1
+            self._exercises = exercises
+            self._names = names
+            self._loaded_at = time.monotonic()
+            self._failed_at = None
+        return True
+
+    def invalidate(self) -> None:
+        """Mark the catalog stale so the next read triggers a refresh."""
+        if self._loaded_at is not None:
+            self._loaded_at = time.monotonic() - self.ttl
+
+    def _ensure_fresh(self, wait: bool) -> None:
+        now = time.monotonic()
+        failed_at = self._failed_at
+        if self._loaded_at is not None and now - self._loaded_at < self.ttl:
+            return
+        if failed_at is not None and now - failed_at < self.retry_after:
+            return
+
+        if self._loaded_at is None and wait:
+            # Cold cache: one caller loads, concurrent callers wait for it
+            with self._load_lock:
+                if self._loaded_at is None and self._failed_at == failed_at:
+                    self.refresh()
+            return
+
+        self._refresh_in_background()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self.refresh, name="exercise-catalog-refresh", daemon=True).start()
+
+
+_catalog: Optional[ExerciseCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_exercise_catalog() -> ExerciseCatalog:
+    """Return the process-wide exercise catalog (nothing is fetched until it is read)."""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = ExerciseCatalog()
+    return _catalog
@@ -0,0 +1,264 @@
+"""
+Local exercise-name validation against the exercise catalog.
+
+Names are matched in three steps, cheapest first:
+1. exact match after normalisation (case, punctuation, plurals: "Squats" -> "squat")
+2. alias table ("bp" -> Bench Press, "ohp" -> Overhead Press, plus any
+   "aliases" listed on the catalog records)
+3. fuzzy match: candidates from a character-trigram index, ranked by edit
+   distance (with transpositions) on the lowercase letters and digits
+
+A name is accepted when it matches exactly, through an alias, or fuzzily
+with similarity >= EXERCISE_MATCH_THRESHOLD (typos like "bench pres");
+otherwise the closest catalog names are returned as suggestions.
+"""
+import os
+import re
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from workout_coach_agent.exercise_catalog import ExerciseCatalog, get_exercise_catalog
+
+# Minimum similarity (0-1) for a fuzzy match to be accepted without asking the user
+EXERCISE_MATCH_THRESHOLD = float(os.getenv("EXERCISE_MATCH_THRESHOLD", "0.85"))
+# Number of closest catalog names suggested for an unknown name
+EXERCISE_MATCH_SUGGESTIONS = int(os.getenv("EXERCISE_MATCH_SUGGESTIONS", "3"))
+
+# Common shorthand -> normalised catalog name (used only if that name is in the catalog)
+EXERCISE_ALIASES = {
+    "bench": "bench press",
+    "bp": "bench press",
+    "flat bench": "bench press",
+    "incline bench": "incline bench press",
+    "ohp": "overhead press",
+    "military press": "overhead press",
+    "shoulder press": "overhead press",
+    "squat": "back squat",
+    "back squat": "squat",
+    "dl": "deadlift",
+    "deads": "deadlift",
+    "rdl": "romanian deadlift",
+    "pullup": "pull up",
+    "chinup": "chin up",
+    "pushup": "push up",
+    "row": "barbell row",
+    "bent over row": "barbell row",
+    "lat pulldown": "lat pull down",
+    "pulldown": "lat pulldown",
+    "curl": "bicep curl",
+    "curls": "bicep curl",
+}
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_FILLER_WORDS = frozenset(("the", "a", "an", "of", "some", "my"))
+
+
+def _singular(token: str) -> str:
+    if len(token) <= 3 or token.endswith("ss"):
+        return token
+    if token.endswith(("shes", "ches", "sses", "xes")):
+        return token[:-2]
+    if token.endswith("s"):
+        return token[:-1]
+    return token
+
+
+def normalize(name: str) -> str:
+    """Lowercase, strip punctuation and filler words, singularise ("Pull-Ups" -> "pull up")."""
+    tokens = _NON_WORD.sub(" ", name.lower()).split()
+    return " ".join(_singular(token) for token in tokens if token not in _FILLER_WORDS)
+
+
+def _compact(name: str) -> str:
+    """Lowercase letters and digits only ("Pull-Ups" -> "pullups"), for fuzzy comparison."""
+    return _NON_WORD.sub("", name.lower())
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Edit distance between two strings: insertions, deletions, substitutions
+    and transpositions of adjacent characters ("deadlfit" -> "deadlift" is 1).
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i]
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            distance = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if cost and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                distance = min(distance, before_previous[j - 2] + 1)
+            current.append(distance)
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class ExerciseMatch(NamedTuple):
+    """Result of matching one user-supplied exercise name."""
+    query: str
+    exercise: Optional[str]        # canonical catalog name, None if not accepted
+    method: str                    # "exact", "alias", "fuzzy" or "none"
+    score: float                   # similarity of the best candidate (0-1)
+    suggestions: Tuple[str, ...]   # closest catalog names when not accepted
+
+    @property
+    def valid(self) -> bool:
+        return self.exercise is not None
+
+
+class ExerciseMatcher:
+    """Exact/alias lookup plus a trigram index for fuzzy matching over catalog names."""
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        aliases: Optional[Dict[str, str]] = None,
+        threshold: float = EXERCISE_MATCH_THRESHOLD
+    ):
+        self.threshold = threshold
+        self._names: List[str] = []
+        self._normalized: List[str] = []
+        self._compact: List[str] = []
+        self._exact: Dict[str, int] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+        # Every word of the catalog names and aliases, plus the names written as one word
+        self.vocabulary: Set[str] = set()
+
+        for name in names:
+            key = normalize(name)
+            if not key or key in self._exact:
+                continue
+            row = len(self._names)
+            self._names.append(name)
+            self._normalized.append(key)
+            self._compact.append(_compact(name))
+            self._exact[key] = row
+            # Spacing variants ("pullups" for "Pull-Ups") are exact matches too
+            self._exact.setdefault(key.replace(" ", ""), row)
+            self.vocabulary.update(key.split())
+            self.vocabulary.add(key.replace(" ", ""))
+            for gram in _trigrams(self._compact[row]):
+                self._trigrams.setdefault(gram, []).append(row)
+
+        # Aliases only count when their target is in this catalog
+        self._aliases: Dict[str, int] = {}
+        for alias, target in {**EXERCISE_ALIASES, **(aliases or {})}.items():
+            alias_key, target_row = normalize(alias), self._exact.get(normalize(target))
+            if target_row is not None and alias_key not in self._exact:
+                self._aliases.setdefault(alias_key, target_row)
+                self.vocabulary.update(alias_key.split())
+                self.vocabulary.add(alias_key.replace(" ", ""))
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def match(self, name: str) -> ExerciseMatch:
+        """
+        Match one exercise name against the catalog.
+
+        Args:
+            name: Exercise name as the user wrote it
+
+        Returns:
+            ExerciseMatch with the canonical name if accepted, otherwise suggestions
+        """
+        key = normalize(name)
+        row = self._exact.get(key)
+        if row is None:
+            row = self._exact.get(key.replace(" ", ""))
+        if row is not None:
+            return ExerciseMatch(name, self._names[row], "exact", 1.0, ())
+        row = self._aliases.get(key)
+        if row is not None:
+            return ExerciseMatch(name, self._names[row], "alias", 1.0, ())
+
+        ranked = self._rank(key, _compact(name))
+        if ranked and ranked[0][0] >= self.threshold:
+            return ExerciseMatch(name, self._names[ranked[0][1]], "fuzzy", round(ranked[0][0], 3), ())
+        return ExerciseMatch(
+            name,
+            None,
+            "none",
+            round(ranked[0][0], 3) if ranked else 0.0,
+            tuple(self._names[row] for _, row in ranked[:EXERCISE_MATCH_SUGGESTIONS])
+        )
+
+    def _rank(self, key: str, compact: str) -> List[Tuple[float, int]]:
+        """Catalog rows sharing trigrams with the name, best edit-distance similarity first."""
+        if not compact:
+            return []
+        grams = _trigrams(compact)
+        shared: Dict[int, int] = {}
+        for gram in grams:
+            for row in self._trigrams.get(gram, ()):
+                shared[row] = shared.get(row, 0) + 1
+
+        # Only the rows with the most trigram overlap are worth an edit distance
+        candidates = sorted(shared, key=shared.get, reverse=True)[:20]
+        ranked = []
+        for row in candidates:
+            other = self._compact[row]
+            similarity = 1 - edit_distance(compact, other) / max(len(compact), len(other))
+            # A shorthand contained in a longer name ("incline" in "incline bench press")
+            if key in self._normalized[row].split() or other.startswith(compact):
+                similarity = max(similarity, 0.5)
+            ranked.append((similarity, row))
+        ranked.sort(key=lambda item: (-item[0], len(self._normalized[item[1]])))
+        return ranked
+
+
+def _catalog_aliases(catalog: ExerciseCatalog) -> Dict[str, str]:
+    """Aliases listed on the catalog records themselves (if the API provides them)."""
+    aliases = {}
+    for exercise in catalog.exercises(wait=False):
+        for alias in exercise.get("aliases") or ():
+            if isinstance(alias, str):
+                aliases[alias] = exercise["name"]
+    return aliases
+
+
+_matcher: Optional[Tuple[int, ExerciseMatcher]] = None
+_matcher_lock = threading.Lock()
+
+
+def get_exercise_matcher(wait: bool = True) -> ExerciseMatcher:
+    """
+    Return a matcher for the current exercise catalog.
+
+    Rebuilt only when the catalog version changes.
+
+    Args:
+        wait: Block on the catalog's first load (default); with False, an
+              empty matcher is returned until the catalog has loaded
+    """
+    global _matcher
+    catalog = get_exercise_catalog()
+    names = catalog.names(wait)
+    cached = _matcher
+    if cached is None or cached[0] != catalog.version:
+        with _matcher_lock:
+            if _matcher is None or _matcher[0] != catalog.version:
+                _matcher = (catalog.version, ExerciseMatcher(names, _catalog_aliases(catalog)))
+            cached = _matcher
+    return cached[1]
+
+
+def validate_exercise_names(names: List[str]) -> Dict[str, ExerciseMatch]:
+    """
+    Match exercise names against the current catalog.
+
+    Returns:
+        Mapping of each given name to its ExerciseMatch (empty if the catalog
+        could not be loaded, so callers can fall back to the backend's check)
+    """
+    matcher = get_exercise_matcher()
+    if not len(matcher):
+        return {}
+    return {name: matcher.match(name) for name in names}
@@ -0,0 +1,204 @@
+"""
+Idempotency keys and duplicate suppression for write requests.
+
+ADK retries a tool call, or a model calls the same tool twice for one
+message, and the same workout or meal is posted twice. Every write therefore
+gets a stable key derived from (scope, user, payload, origin):
+- the origin is the invocation (user message) that caused the write, so
+  repeats within one message collapse while the same set logged again in a
+  later message ("bench 1x5 100", one set at a time) is a new write
+- the key is sent as the Idempotency-Key header, so the backend can collapse
+  repeats it has already applied
+- a bounded in-process LRU of recent keys answers a repeat within
+  IDEMPOTENCY_WINDOW_SECONDS with the first result, without a request
+
+Specialists run under AgentTool get an invocation of their own, so the root
+agent records its invocation in the session state (remember_origin) and
+tools read it back with write_origin. Without an origin, the key uses a time
+bucket instead; a repeat just after a bucket boundary still matches, since
+the previous bucket's key is checked too.
+
+Only successful results are remembered, so a failed write can be retried
+(with the same key).
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+# Session state key holding the invocation ID of the user message being handled
+ORIGIN_STATE_KEY = "idempotency_origin"
+# Repeats are answered from the cache for this many seconds (without an origin,
+# identical writes by the same user within it are one write)
+IDEMPOTENCY_WINDOW_SECONDS = float(os.getenv("IDEMPOTENCY_WINDOW_SECONDS", "120"))
+# Recent keys remembered in-process (least recently used are dropped first)
+IDEMPOTENCY_CACHE_SIZE = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "2048"))
+
+logger = logging.getLogger(__name__)
+
+
+def idempotency_key(
+    scope: str,
+    user: Any,
+    payload: Any,
+    bucket: Optional[int] = None,
+    window: float = IDEMPOTENCY_WINDOW_SECONDS,
+    origin: Optional[str] = None
+) -> str:
+    """
+    Stable key for a write.
+
+    Args:
+        scope: Kind of write, e.g. "workouts/log"
+        user: User the write belongs to
+        payload: JSON-serialisable request body (key order does not matter)
+        bucket: Time bucket (default: the current one, of `window` seconds)
+        origin: Invocation that caused the write; replaces the time bucket
+
+    Returns:
+        32-character hex key
+    """
+    if origin is not None:
+        bucket = f"origin:{origin}"
+    elif bucket is None:
+        bucket = int(time.time() // window)
+    body = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256(f"{scope}\x00{user}\x00{bucket}\x00{body}".encode("utf-8"))
+    return digest.hexdigest()[:32]
+
+
+class IdempotencyCache:
+    """Thread-safe LRU of recent write keys and their results, with per-scope counters."""
+
+    def __init__(self, max_size: int = IDEMPOTENCY_CACHE_SIZE, window: float = IDEMPOTENCY_WINDOW_SECONDS):
+        self.max_size = max_size
+        self.window = window
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def keys(self, scope: str, user: Any, payload: Any, origin: Optional[str] = None) -> Tuple[str, ...]:
+        """
+        Keys an identical earlier write may have used.
+
+        Returns:
+            The origin's key; without an origin, the current bucket's key (the
+            one to send) and the previous bucket's
+        """
+        if origin is not None:
+            return (idempotency_key(scope, user, payload, origin=origin),)
+        bucket = int(time.time() // self.window)
+        return tuple(idempotency_key(scope, user, payload, b, self.window) for b in (bucket, bucket - 1))
+
+    def check(
+        self, scope: str, user: Any, payload: Any, origin: Optional[str] = None
+    ) -> Tuple[str, Optional[Any]]:
+        """
+        Key for a write, and the earlier result if it is a repeat.
+
+        Returns:
+            (key to send, result of the earlier identical write or None)
+        """
+        now = time.time()
+        candidates = self.keys(scope, user, payload, origin)
+
+        with self._lock:
+            stats = self._stats.setdefault(scope, {"writes": 0, "duplicates_suppressed": 0, "completed": 0})
+            stats["writes"] += 1
+            for candidate in candidates:
+                entry = self._entries.get(candidate)
+                if entry is not None and now - entry[0] <= self.window:
+                    self._entries.move_to_end(candidate)
+                    stats["duplicates_suppressed"] += 1
+                    logger.info("Suppressed duplicate %s write for user %s", scope, user)
+                    return candidate, entry[1]
+        return candidates[0], None
+
+    def remember(self, scope: str, key: str, result: Any) -> None:
+        """Store the result of a successful write under its key."""
+        with self._lock:
+            self._entries[key] = (time.time(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._stats.setdefault(scope, {"writes": 0, "duplicates_suppressed": 0, "completed": 0})["completed"] += 1
+
+    def run(
+        self, scope: str, user: Any, payload: Any, send: Callable[[str], Any], origin: Optional[str] = None
+    ) -> Any:
+        """
+        Perform a write at most once per key.
+
+        Args:
+            scope: Kind of write, e.g. "diet/food_entries"
+            user: User the write belongs to
+            payload: Request body the key is derived from
+            send: Performs the write; called with the idempotency key
+            origin: Invocation that caused the write (see write_origin)
+
+        Returns:
+            The write's result, or the earlier result marked "duplicate": True
+        """
+        key, previous = self.check(scope, user, payload, origin)
+        if previous is not None:
+            return mark_duplicate(previous)
+        result = send(key)
+        if not (isinstance(result, dict) and "error" in result):
+            self.remember(scope, key, result)
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-scope counts of writes, duplicates suppressed and writes completed."""
+        with self._lock:
+            return {scope: dict(counts) for scope, counts in self._stats.items()}
+
+
+def mark_duplicate(result: Any) -> Any:
+    """Flag an earlier result returned for a repeated write."""
+    if not isinstance(result, dict):
+        return result
+    return {
+        **result,
+        "duplicate": True,
+        "duplicate_note": "Identical to a write moments ago, so it was not saved again."
+    }
+
+
+def remember_origin(callback_context: Any) -> None:
+    """
+    before_agent_callback for a root agent: record the invocation handling this
+    message, so specialists run under AgentTool (each in an invocation of its
+    own) key their writes on the user's message.
+    """
+    callback_context.state[ORIGIN_STATE_KEY] = callback_context.invocation_id
+
+
+def write_origin(tool_context: Any) -> Optional[str]:
+    """The origin for a tool's writes: the root's invocation, else the tool's own."""
+    if tool_context is None:
+        return None
+    return tool_context.state.get(ORIGIN_STATE_KEY) or tool_context.invocation_id
+
+
+_cache: Optional[IdempotencyCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_idempotency_cache() -> IdempotencyCache:
+    """Return the process-wide idempotency cache."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = IdempotencyCache()
+    return _cache
+
+
+def get_idempotency_stats() -> Dict[str, Dict[str, int]]:
+    """Per-scope write, duplicate and completed-write counts."""
+    return get_idempotency_cache().stats()
@@ -0,0 +1,276 @@
+"""
+Deterministic fast path ahead of the LLM coordinators.
+
+Every message used to cost a coordinator model call just to pick a
+specialist, and another one afterwards to pass the specialist's answer on.
+For frequent, unambiguous messages ("bench 3x8 80kg", "what's my workout
+today", a bare meal photo) a FastPathRouter picks the specialist locally:
+- it runs as the coordinator's before_model_callback; on the first model call
+  of a turn it classifies the user's message with keyword/regex rules
+- a confident match (one specialist, score >= INTENT_ROUTER_THRESHOLD) is
+  answered with a function call to that specialist instead of a model call
+- when the specialist returns, its answer is passed on as the coordinator's
+  reply, again without a model call
+- anything else (no match, several specialists, low score) goes to the model
+
+Per-router metrics (share of messages on the fast path, model calls skipped,
+estimated latency saved) are available from get_router_stats().
+"""
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+INTENT_ROUTER_ENABLED = os.getenv("INTENT_ROUTER_ENABLED", "true").lower() in ("1", "true", "yes")
+# Minimum rule score for the fast path; below it the coordinator model decides
+INTENT_ROUTER_THRESHOLD = float(os.getenv("INTENT_ROUTER_THRESHOLD", "0.8"))
+
+# Marks a turn routed by the fast path (temp: state lives for one invocation)
+_ROUTED_KEY = "temp:fast_path_route"
+_LATENCY_WINDOW = 500
+
+logger = logging.getLogger(__name__)
+
+
+class IntentRule(NamedTuple):
+    """
+    One way of recognising a specialist's messages.
+
+    Attributes:
+        tool: Name of the coordinator's tool for the specialist
+        score: Confidence when the rule matches
+        patterns: Regexes, any of which must match the message (case-insensitive)
+        excludes: Regexes that veto the rule
+        media: True: only for messages with an image; False: only without one
+        max_words: Longer messages are left to the model
+    """
+    tool: str
+    score: float
+    patterns: Tuple[Pattern, ...] = ()
+    excludes: Tuple[Pattern, ...] = ()
+    media: Optional[bool] = False
+    max_words: int = 40
+
+
+def rule(
+    tool: str,
+    score: float,
+    patterns: Iterable[str] = (),
+    excludes: Iterable[str] = (),
+    media: Optional[bool] = False,
+    max_words: int = 40
+) -> IntentRule:
+    """Build an IntentRule from regex strings."""
+    return IntentRule(
+        tool=tool,
+        score=score,
+        patterns=tuple(re.compile(p, re.IGNORECASE) for p in patterns),
+        excludes=tuple(re.compile(p, re.IGNORECASE) for p in excludes),
+        media=media,
+        max_words=max_words,
+    )
+
+
+class Route(NamedTuple):
+    tool: str
+    score: float
+
+
+def message_of(content: Optional[types.Content]) -> Tuple[str, bool]:
+    """Text of a message and whether it carries an image (or other media)."""
+    if content is None:
+        return "", False
+    parts = content.parts or ()
+    text = " ".join(part.text for part in parts if part.text).strip()
+    return text, any(part.inline_data or part.file_data for part in parts)
+
+
+class FastPathRouter:
+    """Rule-based specialist picker for one coordinator, with metrics."""
+
+    def __init__(
+        self,
+        name: str,
+        rules: List[IntentRule],
+        threshold: float = INTENT_ROUTER_THRESHOLD,
+        enabled: bool = INTENT_ROUTER_ENABLED
+    ):
+        self.name = name
+        self.rules = rules
+        self.threshold = threshold
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counts = {"messages": 0, "fast_path": 0, "fallback": 0, "model_calls_skipped": 0}
+        self._by_tool: Dict[str, int] = {}
+        self._model_latencies: List[float] = []
+        self._classify_seconds = 0.0
+        self._model_started: Dict[str, float] = {}
+
+    def classify(self, text: str, has_media: bool = False) -> Optional[Route]:
+        """
+        The specialist a message is for, if the rules agree on exactly one.
+
+        Returns:
+            Route with the best score, or None if no rule matched, rules for
+            different specialists matched, or the best score is below the
+            threshold
+        """
+        words = len(text.split())
+        scores: Dict[str, float] = {}
+        for intent in self.rules:
+            if intent.media is not None and intent.media != has_media:
+                continue
+            if words > intent.max_words:
+                continue
+            if intent.patterns and not any(p.search(text) for p in intent.patterns):
+                continue
+            if any(p.search(text) for p in intent.excludes):
+                continue
+            scores[intent.tool] = max(scores.get(intent.tool, 0.0), intent.score)
+
+        if len(scores) != 1:
+            # Nothing matched, or the message needs several specialists
+            return None
+        tool, score = next(iter(scores.items()))
+        return Route(tool, score) if score >= self.threshold else None
+
+    # ── ADK callbacks ───────────────────────────────────────
+
+    def before_model(self, callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+        """before_model_callback: answer the coordinator's model call locally when possible."""
+        if not self.enabled or not llm_request.contents:
+            return None
+        last = llm_request.contents[-1]
+        responses = [part.function_response for part in last.parts or () if part.function_response]
+        routed = callback_context.state.get(_ROUTED_KEY)
+
+        if responses:
+            if routed and len(responses) == 1 and responses[0].name == routed:
+                # The specialist answered: pass its reply on as ours
+                self._count(model_calls_skipped=1)
+                return LlmResponse(content=types.Content(
+                    role="model", parts=[types.Part(text=_response_text(responses[0].response))]
+                ))
+            self._model_started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        started = time.perf_counter()
+        text, has_media = message_of(last if last.role == "user" else None)
+        route = self.classify(text, has_media) if (text or has_media) else None
+        elapsed = time.perf_counter() - started
+
+        if route is None:
+            self._count(messages=1, fallback=1, classify_seconds=elapsed)
+            self._model_started[callback_context.invocation_id] = time.perf_counter()
+            return None
+
+        self._count(messages=1, fast_path=1, model_calls_skipped=1, classify_seconds=elapsed, tool=route.tool)
+        logger.debug("%s fast path -> %s (%.2f)", self.name, route.tool, route.score)
+        callback_context.state[_ROUTED_KEY] = route.tool
+        return LlmResponse(content=types.Content(role="model", parts=[types.Part(
+            function_call=types.FunctionCall(name=route.tool, args={"request": text or "Analyze the attached photo."})
+        )]))
+
+    def after_model(self, callback_context: CallbackContext, llm_response: LlmResponse) -> Optional[LlmResponse]:
+        """after_model_callback: time the coordinator's model calls (for the latency-saved estimate)."""
+        started = self._model_started.pop(callback_context.invocation_id, None)
+        if started is not None and not llm_response.partial:
+            with self._lock:
+                self._model_latencies.append(time.perf_counter() - started)
+                del self._model_latencies[:-_LATENCY_WINDOW]
+        return None
+
+    # ── metrics ─────────────────────────────────────────────
+
+    def _count(self, classify_seconds: float = 0.0, tool: Optional[str] = None, **counts: int) -> None:
+        with self._lock:
+            for key, value in counts.items():
+                self._counts[key] += value
+            self._classify_seconds += classify_seconds
+            if tool is not None:
+                self._by_tool[tool] = self._by_tool.get(tool, 0) + 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Fast-path counters for this router.
+
+        Returns:
+            Dictionary with messages, fast_path, fallback, fast_path_share,
+            by_tool, model_calls_skipped, mean_model_ms (measured coordinator
+            model calls), est_latency_saved_ms and mean_classify_us
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = list(self._model_latencies)
+            by_tool = dict(self._by_tool)
+            classify_seconds = self._classify_seconds
+        mean_model = sum(latencies) / len(latencies) if latencies else None
+        return {
+            **counts,
+            "fast_path_share": round(counts["fast_path"] / counts["messages"], 3) if counts["messages"] else 0.0,
+            "by_tool": by_tool,
+            "mean_model_ms": round(mean_model * 1000, 1) if mean_model is not None else None,
+            "est_latency_saved_ms": (
+                round(counts["model_calls_skipped"] * mean_model * 1000, 1) if mean_model is not None else None
+            ),
+            "mean_classify_us": (
+                round(classify_seconds / counts["messages"] * 1e6, 1) if counts["messages"] else None
+            ),
+        }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._counts = dict.fromkeys(self._counts, 0)
+            self._by_tool.clear()
+            self._model_latencies.clear()
+            self._classify_seconds = 0.0
+
+
+def _response_text(response: Any) -> str:
+    # AgentTool results arrive as {"result": "..."}
+    if isinstance(response, dict) and set(response) == {"result"}:
+        response = response["result"]
+    return response if isinstance(response, str) else str(response)
+
+
+_routers: Dict[str, FastPathRouter] = {}
+_routers_lock = threading.Lock()
+
+
+def register_router(router: FastPathRouter) -> FastPathRouter:
+    """Make a router's metrics available from get_router_stats()."""
+    with _routers_lock:
+        _routers[router.name] = router
+    return router
+
+
+def get_router_stats() -> Dict[str, Dict[str, Any]]:
+    """Fast-path metrics of every registered router."""
+    with _routers_lock:
+        routers = list(_routers.values())
+    return {router.name: router.stats() for router in routers}
+
+
+# ── shared rule patterns ────────────────────────────────────
+
+# "3x8", "5 x 5", "3×10", "3 sets of 8"
+SETS_X_REPS = r"\b\d+\s*[x×*]\s*\d+\b|\b\d+\s+sets?\s+of\s+\d+"
+# Corrections to something already logged
+EDIT_WORDS = r"\b(was|were|not|actually|instead|change|changed|wrong|fix|edit|update|correct)\b"
+TODAYS_WORKOUT = (
+    r"\bwhat('?s| is)\s+(my\s+)?(workout|training|plan)\s+(for\s+)?today\b",
+    r"\bwhat\s+(should|do)\s+i\s+(do|train|lift)\s+today\b",
+    r"\btoday'?s\s+(workout|training|session)\b",
+)
+PROGRESS = (
+    r"\bhow\s+am\s+i\s+doing\b",
+    r"\b(show|see)\s+(me\s+)?my\s+(progress|stats|statistics)\b",
+    r"\bmy\s+(weekly|monthly)\s+(progress|stats|volume)\b",
+)
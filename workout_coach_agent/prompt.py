@@ -47,7 +47,7 @@ WORKOUT_COACH_PROMPT = """
         - Use when: User describes a completed workout
 
     2. `edit` - Workout Editing Specialist
-        - Tools: edit_workout
+        - Tools: edit_workout_by_name, edit_workout
         - Use when: User wants to correct/change exercises logged today
 
     3. `planner` - Workout Planning Specialist
@@ -55,7 +55,7 @@ WORKOUT_COACH_PROMPT = """
         - Use when: User asks what workout to do today or about their program
 
     4. `analyst` - Progress Analysis Expert
-        - Tools: get_workout_history, get_workout_summary
+        - Tools: get_training_analytics, get_strength_trend, get_workout_history, get_workout_summary
         - Use when: User wants to see stats, history, or progress insights
 
     5. `exercise` - Exercise Technique Specialist
@@ -75,6 +75,11 @@ WORKOUT_COACH_PROMPT = """
     - User context (profile, goals, workout history, streak) is automatically provided
     - User identification is handled through session state - never ask for their ID
     - If a request is ambiguous, ask clarifying questions before routing
+    - If a message needs several specialists for independent things (e.g. "log my bench and show today's plan"),
+      call them all in the same turn - they run at the same time. Only call them one after another when one
+      needs the other's result
+    - Exception: logger and edit both change today's workout, so never call them in the same turn. For
+      "log bench 3x8 80kg and change squats to 100kg", call logger, wait for its result, then call edit
     - You can handle simple general fitness questions yourself without routing
 
     ## Communication Guidelines
@@ -2,6 +2,7 @@ from google.adk.agents import Agent
 from google.adk.tools import ToolContext
 from typing import Dict
 from workout_coach_agent.tools import _make_laravel_request
+from workout_coach_agent.workout_analytics import E1RM_FORMULAS, strength_trend, training_overview
 from . import prompt 
 
 def get_workout_history(tool_context: ToolContext, days: int = 7) -> Dict:
@@ -41,10 +42,51 @@ def get_workout_summary(tool_context: ToolContext, days: int = 7) -> Dict:
     params = {"user_id": user_id, "days": days}
     return _make_laravel_request("GET", "workouts/summary", params)
 
+def get_training_analytics(tool_context: ToolContext, weeks: int = 4, target_days_per_week: int = 3) -> Dict:
+    """
+    Computes the user's training stats locally from their workout history.
+
+    Args:
+        tool_context: Context containing user_id
+        weeks: Number of whole weeks (Monday to Sunday) to analyze, this week included (default: 4)
+        target_days_per_week: Training days per week the user aims for (default: 3)
+
+    Returns:
+        Dictionary with weekly volume per muscle group, training days per week,
+        adherence to the target, PRs (estimated 1RM) in the period and the best
+        estimated 1RM of the most trained exercises
+
+    Example:
+        get_training_analytics(weeks=4)  # This month at a glance
+    """
+    user_id = tool_context.state.get("user_id")
+    return training_overview(user_id, max(1, min(weeks, 260)), max(1, target_days_per_week))
+
+def get_strength_trend(tool_context: ToolContext, exercise_name: str, weeks: int = 12, formula: str = "epley") -> Dict:
+    """
+    Tracks an exercise's estimated 1RM week by week.
+
+    Args:
+        tool_context: Context containing user_id
+        exercise_name: Exercise to track (e.g., "Bench Press", "squat")
+        weeks: Number of weeks to look back (default: 12)
+        formula: 1RM estimate, "epley" or "brzycki" (default: "epley")
+
+    Returns:
+        Dictionary with the best estimated 1RM per week and the change over the period
+
+    Example:
+        get_strength_trend("Bench Press", weeks=12)  # Is my bench going up?
+    """
+    if formula not in E1RM_FORMULAS:
+        return {"success": False, "error": f"Unknown formula {formula}. Use one of: {', '.join(E1RM_FORMULAS)}"}
+    user_id = tool_context.state.get("user_id")
+    return strength_trend(user_id, exercise_name, max(1, min(weeks, 260)), formula)
+
 analyst = Agent(
     name="analyst",
     model="gemini-2.5-flash",
     instruction=prompt.ANALYST_PROMPT,
     description="Analyzes workout data and provides progress insights",
-    tools=[get_workout_history, get_workout_summary]
+    tools=[get_training_analytics, get_strength_trend, get_workout_history, get_workout_summary]
 )
\ No newline at end of file
@@ -26,10 +26,27 @@ ANALYST_PROMPT = """
 
     ## Using Tools
 
-    You have two tools at your disposal:
+    You have four tools at your disposal. The first two compute the numbers for you -
+    prefer them, and never redo their arithmetic:
+
+    **get_training_analytics**
+    - When to use: Progress, consistency, volume or PR questions ("how am I doing", "am I consistent")
+    - Parameters:
+    - weeks: Whole weeks to analyze, this week included (default: 4)
+    - target_days_per_week: Training days per week the user aims for (default: 3)
+    - Returns: Weekly volume per muscle group, training days per week, adherence %, streak of weeks
+      on target, PRs (estimated 1RM) in the period, best estimated 1RM of the most trained exercises
+
+    **get_strength_trend**
+    - When to use: "Am I getting stronger at X?", strength progress on one lift
+    - Parameters:
+    - exercise_name: The exercise to track
+    - weeks: Weeks to look back (default: 12)
+    - formula: "epley" (default) or "brzycki"
+    - Returns: Best estimated 1RM per week and the change in kg and %
 
     **get_workout_history**
-    - When to use: User wants to see what workouts they've done
+    - When to use: User wants to see the individual workouts they've done
     - Parameters: 
     - days: Number of days to look back (default: 7)
     - Returns: List of workouts with exercises, dates, and details
@@ -54,7 +71,7 @@ ANALYST_PROMPT = """
     ## Examples
 
     User: "How am I doing this month?"
-    You: Call get_workout_summary(days=30) → "Strong month! You completed 12 workouts with 48 total sets and 12,450kg total volume. That's 15% more volume than last month. You trained 3x per week consistently."
+    You: Call get_training_analytics(weeks=4) → "Strong month! You completed 12 workouts with 48 total sets and 12,450kg total volume. That's 15% more volume than last month. You trained 3x per week consistently."
 
     User: "What did I do this week?"
     You: Call get_workout_history(days=7) → "This week you completed 3 workouts:
@@ -62,5 +79,8 @@ ANALYST_PROMPT = """
     - Wednesday: Pull (Deadlift, Rows, Pullups)
     - Friday: Legs (Squats, Lunges, Leg Curl)"
 
+    User: "Is my bench going up?"
+    You: Call get_strength_trend(exercise_name="Bench Press", weeks=12) → "Yes! Your estimated 1RM went from 92kg to 101kg over the last 12 weeks (+9.8%)."
+
     Remember, your job is to turn raw data into meaningful insights that help users understand their progress.
 """
\ No newline at end of file
@@ -3,6 +3,13 @@ from typing import Dict, Optional, List
 from google.adk.tools import ToolContext
 from . import prompt
 from workout_coach_agent.tools import _make_laravel_request
+from workout_coach_agent.workout_analytics import get_workout_analytics
+from workout_coach_agent.workout_state import (
+    TODAY_KEY,
+    apply_exercise_edits,
+    lookup_exercise,
+    resolve_workout_exercise_ids,
+)
 
 
 def edit_workout(
@@ -44,57 +51,104 @@ def edit_workout(
             "error": "No workout_exercise_ids provided. Please extract them from tool_context.state['last_workout']."
         }
 
-    # Build array with exercise updates - one per workout_exercise_id
-    exercises_to_update = []
+    # Sets logged moments ago may still carry provisional (negative) IDs
+    workout_exercise_ids, unresolved = resolve_workout_exercise_ids(tool_context.state, workout_exercise_ids)
+    if unresolved:
+        return {
+            "success": False,
+            "error": "Some of these sets are still being saved to the training log. Try the edit again in a moment."
+        }
+
+    return _patch_exercises(tool_context.state, user_id, workout_exercise_ids, _updates(sets, reps, weight_kg, notes))
+
+
+def edit_workout_by_name(
+    tool_context: ToolContext,
+    exercise_name: str,
+    sets: Optional[int] = None,
+    reps: Optional[int] = None,
+    weight_kg: Optional[float] = None,
+    notes: Optional[str] = None
+) -> Dict:
+    """
+    Edits every set of an exercise from today's session, found by name.
+
+    Preferred over edit_workout: the workout_exercise_ids are looked up from
+    today's workout, so there is no need to read them from the state first.
+    Shorthand, plurals and close typos ("bp", "squats") are matched to the logged exercise.
+    All changed fields are sent in one request.
+
+    Args:
+        tool_context: Context containing user_id and today's workout
+        exercise_name: Name of the exercise to edit (e.g., "Bench Press", "squats")
+        sets: New number of sets (optional, only include if changing)
+        reps: New number of reps (optional, only include if changing)
+        weight_kg: New weight in kilograms (optional, only include if changing)
+        notes: New notes (optional, only include if changing)
+
+    Returns:
+        Dictionary with updated exercise details, or an error with
+        did_you_mean suggestions if the exercise was not logged today
 
-    for workout_exercise_id in workout_exercise_ids:
-        exercise_update = {
-            "workout_exercise_id": workout_exercise_id
+    Example:
+        # User says: "bench was 120kg for 6 reps"
+        edit_workout_by_name(tool_context, exercise_name="bench", reps=6, weight_kg=120.0)
+    """
+    updates = _updates(sets, reps, weight_kg, notes)
+    if not updates:
+        return {"success": False, "error": "Nothing to change. Include sets, reps, weight_kg or notes."}
+
+    name, workout_exercise_ids, suggestions = lookup_exercise(tool_context.state.get(TODAY_KEY), exercise_name)
+    if not workout_exercise_ids:
+        error = {
+            "success": False,
+            "error": f"Could not find {exercise_name} in today's workout. Can only edit exercises logged today."
         }
+        if suggestions:
+            error["did_you_mean"] = suggestions
+        return error
 
-        if sets is not None:
-            exercise_update["sets"] = sets
-        if reps is not None:
-            exercise_update["reps"] = reps
-        if weight_kg is not None:
-            exercise_update["weight_kg"] = weight_kg
-        if notes is not None:
-            exercise_update["notes"] = notes
+    # Sets logged moments ago may still carry provisional (negative) IDs
+    workout_exercise_ids, unresolved = resolve_workout_exercise_ids(tool_context.state, workout_exercise_ids)
+    if unresolved:
+        return {
+            "success": False,
+            "error": f"{name} is still being saved to the training log. Try the edit again in a moment."
+        }
+
+    response = _patch_exercises(tool_context.state, tool_context.state.get("user_id"), workout_exercise_ids, updates)
+    if response.get("success"):
+        response = {**response, "exercise_name": name, "workout_exercise_ids": workout_exercise_ids}
+    return response
 
-        exercises_to_update.append(exercise_update)
 
+def _updates(
+    sets: Optional[int],
+    reps: Optional[int],
+    weight_kg: Optional[float],
+    notes: Optional[str]
+) -> Dict:
+    """Only the fields that are being changed."""
+    updates = {"sets": sets, "reps": reps, "weight_kg": weight_kg, "notes": notes}
+    return {field: value for field, value in updates.items() if value is not None}
+
+
+def _patch_exercises(state, user_id, workout_exercise_ids: List[int], updates: Dict) -> Dict:
+    # Build array with exercise updates - one per workout_exercise_id
     data = {
         "user_id": user_id,
-        "exercises": exercises_to_update
+        "exercises": [
+            {"workout_exercise_id": workout_exercise_id, **updates}
+            for workout_exercise_id in workout_exercise_ids
+        ]
     }
 
     response = _make_laravel_request("PATCH", "workouts/exercises/edit", data)
 
     # Update state to keep it in sync with the backend
     if response.get("success"):
-        last_workout = tool_context.state.get("last_workout", {})
-
-        if last_workout and "exercises" in last_workout:
-            # Update the exercises in state with the new values
-            for exercise in last_workout["exercises"]:
-                if exercise.get("workout_exercise_id") in workout_exercise_ids:
-                    # Update fields that were changed
-                    if sets is not None:
-                        exercise["set_number"] = sets
-                    if reps is not None:
-                        exercise["reps"] = reps
-                    if weight_kg is not None:
-                        exercise["weight_kg"] = weight_kg
-                    if notes is not None:
-                        exercise["notes"] = notes
-
-            # Update both state keys
-            today = last_workout.get("workout_date", "")
-            if today:
-                date_key = f"last_workout_{today}"
-                tool_context.state[date_key] = last_workout
-
-            tool_context.state["last_workout"] = last_workout
+        apply_exercise_edits(state, workout_exercise_ids, updates)
+        get_workout_analytics().invalidate(user_id)
 
     return response
 
@@ -105,5 +159,5 @@ edit = Agent(
     model="gemini-2.5-flash",
     instruction=prompt.EDIT_PROMPT,
     description="Edits workout exercises from today's session",
-    tools=[edit_workout]
+    tools=[edit_workout_by_name, edit_workout]
 )
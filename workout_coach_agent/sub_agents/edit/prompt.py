@@ -8,20 +8,27 @@ EDIT_PROMPT = """
     1. **Edit Today's Workouts**
     - Correct mistakes in already logged exercises.
     - Update sets, reps, weight, or notes for any exercise from today's session.
-    - Use the `edit_workout` tool to perform all updates.
+    - Use the `edit_workout_by_name` tool for edits (use `edit_workout` only when specific sets must be edited).
 
     2. **Provide Clear Confirmations**
     - After editing, confirm exactly what was changed.
     - Example: "Updated Bench Press to 110kg (was 105kg)" or "Changed Squats to 4 sets."
 
     3. **Handle Only Edits — Never Log New Exercises**
-    - If the user wants to add a new exercise, do NOT call `edit_workout`.
+    - If the user wants to add a new exercise, do NOT call `edit_workout_by_name` or `edit_workout`.
     - Only modify exercises that have already been logged today.
 
     ---
 
     ## How to Edit Workouts (IMPORTANT WORKFLOW)
 
+    **Default: call edit_workout_by_name**
+    - Pass the exercise name as the user said it and ONLY the fields that change, all in one call
+    - It finds the IDs of every set of that exercise itself; no need to read the state
+    - If it returns did_you_mean, ask the user which exercise they meant
+
+    **Only to edit specific sets, use edit_workout with IDs:**
+
     **Step 1: Access Today's Workout Data**
     - Look at `tool_context.state['last_workout']` to see all exercises logged today
     - The structure looks like this:
@@ -72,7 +79,7 @@ EDIT_PROMPT = """
     **THEN you MUST immediately respond with:**
     "To edit workout entries from previous days, please visit: {LARAVEL_APP_URL}/workout/exercise/edit"
 
-    **DO NOT** call the edit_workout tool for past workouts.
+    **DO NOT** call edit_workout_by_name or edit_workout for past workouts.
     **DO NOT** try to process the edit.
     **ONLY** provide the URL above.
 
@@ -84,6 +91,12 @@ EDIT_PROMPT = """
 
     ---
 
+    ## Tool: edit_workout_by_name
+
+    **Parameters**
+    - `exercise_name` (string): The exercise to edit, e.g. "bench" or "Squats"
+    - Optional fields to update: `sets` (int), `reps` (int), `weight_kg` (float), `notes` (string)
+
     ## Tool: edit_workout
 
     **Parameters**
@@ -116,16 +129,18 @@ EDIT_PROMPT = """
     ## Example Interactions
 
     **User:** "bench press was 110kg not 105kg"
-    → Step 1: Look at tool_context.state['last_workout']['exercises']
-    → Step 2: Find entries where name="Bench Press", extract IDs: [22, 23, 24]
-    → Step 3: Call `edit_workout(tool_context, workout_exercise_ids=[22, 23, 24], weight_kg=110.0)`
+    → Call `edit_workout_by_name(tool_context, exercise_name="bench press", weight_kg=110.0)`
     ✅ Response: "Updated Bench Press to 110kg (was 105kg)."
 
-    **User:** "actually I did 4 sets of squats"
+    **User:** "squats were 8 reps at 120kg"
+    → Call `edit_workout_by_name(tool_context, exercise_name="squats", reps=8, weight_kg=120.0)`
+    ✅ Response: "Updated Squats to 8 reps @ 120kg."
+
+    **User:** "only my last bench set was 100kg"
     → Step 1: Look at tool_context.state['last_workout']['exercises']
-    → Step 2: Find entries where name="Squats", extract IDs: [15, 16, 17, 18]
-    → Step 3: Call `edit_workout(tool_context, workout_exercise_ids=[15, 16, 17, 18], sets=4)`
-    ✅ Response: "Changed Squats to 4 sets."
+    → Step 2: Find the last entry where name="Bench Press": ID 24
+    → Step 3: Call `edit_workout(tool_context, workout_exercise_ids=[24], weight_kg=100.0)`
+    ✅ Response: "Updated your last Bench Press set to 100kg."
 
     **User:** "I want to edit my bench from yesterday"
     → Response: "To edit workout entries from previous days, please visit: {LARAVEL_APP_URL}/workout/exercise/edit"
@@ -1,68 +1,56 @@
 from google.adk.agents import Agent, SequentialAgent
-from typing import Dict, Optional, List
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from typing import Any, Dict, Optional, List, Tuple
 from google.adk.tools import ToolContext
 from datetime import datetime
+import asyncio
+import logging
+import os
 from . import prompt
 from workout_coach_agent.tools import _make_laravel_request
+from workout_coach_agent.exercise_catalog import get_exercise_catalog
+from workout_coach_agent.exercise_matcher import validate_exercise_names
+from workout_coach_agent.idempotency import IDEMPOTENCY_HEADER, get_idempotency_cache, mark_duplicate, write_origin
+from workout_coach_agent.intent_router import message_of
+from workout_coach_agent.workout_analytics import get_workout_analytics
+from workout_coach_agent.workout_parser import WORKOUT_LOG_PARSER, WORKOUT_PARSER_MIN_CONFIDENCE, parse_workout_log
+from workout_coach_agent.workout_queue import WORKOUT_WRITE_BEHIND, get_workout_queue
+from workout_coach_agent.workout_state import (
+    TODAY_KEY,
+    add_to_today,
+    apply_exercise_edits,
+    clean_workout_response,
+    is_provisional,
+    lookup_exercise,
+    provisional_workout,
+    reconcile_pending_logs,
+    resolve_workout_exercise_ids,
+    track_pending_log,
+    without_index,
+)
 
-def _clean_workout_response(response: Dict) -> Dict:
-    """
-    Cleans up the workout log response to only essential information.
+# Run the LLM validator agent before the recorder (the previous flow). By
+# default exercise names are validated locally inside log_workout instead,
+# which saves a full model call per log.
+WORKOUT_LLM_VALIDATOR = os.getenv("WORKOUT_LLM_VALIDATOR", "false").lower() in ("1", "true", "yes")
 
-    Args:
-        response: Raw API response from workout logging
+# Marks a turn whose log was parsed locally (temp: state lives for one invocation)
+_PARSED_LOG_KEY = "temp:parsed_log"
 
-    Returns:
-        Cleaned dictionary with essential workout info including IDs for editing
-    """
-    if not response.get("success") or not response.get("workout"):
-        return response
-
-    workout = response["workout"]
-    
-    exercises = []
-    for exercise_entry in workout.get("workout_exercises", []):
-        exercise = exercise_entry.get("exercise", {})
-        name = exercise.get("name", "Unknown")
-        exercises.append({
-            "workout_exercise_id": exercise_entry.get("id"),
-            "name": name,
-            "set_number": exercise_entry.get("set_number"),
-            "weight_kg": exercise_entry.get("weight_kg"),
-            "reps": exercise_entry.get("reps"),
-        })
-
-    return {
-        "success": True,
-        "message": response.get("message", "Workout logged!"),
-        "workout_id": workout.get("id"),  # ID of the workout record
-        "workout_date": workout.get("workout_date", "").split("T")[0],
-        "total_volume_kg": workout.get("total_volume_kg", 0),
-        "exercises": exercises
-    }
+log = logging.getLogger(__name__)
 
 def _get_allowed_exercises() -> List[str]:
     """
-    Fetches the list of allowed exercises from the Laravel API.
+    Returns the list of allowed exercises from the cached exercise catalog.
 
     Returns:
         List of exercise names that users can log
     """
-    try:
-        response = _make_laravel_request("GET", "exercises", None)
-        # API returns {"exercises": [{"name": "Bench Press", ...}, ...]}
-        if isinstance(response, dict) and "exercises" in response:
-            return [exercise.get("name") for exercise in response["exercises"] if exercise.get("name")]
-        elif isinstance(response, dict) and "data" in response:
-            return [exercise.get("name") for exercise in response["data"] if exercise.get("name")]
-        elif isinstance(response, list):
-            return [exercise.get("name") for exercise in response if exercise.get("name")]
-        else:
-            print(f"Unexpected response format from exercises API: {response}")
-            return []
-    except Exception as e:
-        print(f"Failed to fetch exercises from API: {e}")
-        return []
+    return get_exercise_catalog().names()
 
 def get_allowed_exercises() -> Dict:
     """
@@ -77,15 +65,16 @@ def get_allowed_exercises() -> Dict:
         "count": len(exercises)
     }
 
-def _build_validator_instruction() -> str:
+def _build_validator_instruction(allowed_exercises: List[str]) -> str:
     """
-    Builds the validator agent instruction with dynamically fetched exercises.
+    Builds the validator agent instruction for the given exercise list.
+
+    Args:
+        allowed_exercises: Exercise names from the catalog (may be empty)
 
     Returns:
         Instruction string for the validator agent
     """
-    allowed_exercises = _get_allowed_exercises()
-
     if allowed_exercises:
         exercises_list = "\n".join([f"    - {exercise}" for exercise in allowed_exercises])
         return f"""
@@ -122,9 +111,33 @@ def _build_validator_instruction() -> str:
     else:
         return "You are an exercise validator. Validate exercises against the approved list using the get_allowed_exercises tool."
 
+_validator_instruction_cache: Tuple[int, str] = (-1, "")
+
+async def validator_instruction(context: ReadonlyContext) -> str:
+    """
+    Instruction provider for the validator agent.
+
+    Renders the instruction from the cached exercise catalog on each turn, so
+    nothing is fetched at import and catalog changes show up without a
+    restart. The first call loads the catalog off the event loop; later calls
+    use the cache (refreshed in the background once stale).
+    """
+    global _validator_instruction_cache
+    catalog = get_exercise_catalog()
+    if catalog.loaded:
+        catalog.names(wait=False)
+    else:
+        await asyncio.to_thread(catalog.names)
+
+    version, instruction = _validator_instruction_cache
+    if version != catalog.version:
+        instruction = _build_validator_instruction(catalog.names(wait=False))
+        _validator_instruction_cache = (catalog.version, instruction)
+    return instruction
+
 def log_workout(
     tool_context: ToolContext,
-    exercises: List[Dict[str, any]]
+    exercises: List[Dict[str, Any]]
 ) -> Dict:
     """
     Logs one or more workout exercises to the user's training log in a single request.
@@ -155,35 +168,73 @@ def log_workout(
         ])
     """
     user_id = tool_context.state.get("user_id")
+
+    # Check names against the exercise catalog before anything is sent
+    matches = validate_exercise_names([exercise.get("exercise_name", "") for exercise in exercises])
+    invalid = [match for match in matches.values() if not match.valid]
+    if invalid:
+        return {
+            "success": False,
+            "error": "Some exercises are not in the approved list. Nothing was logged.",
+            "invalid_exercises": [
+                {"exercise_name": match.query, "did_you_mean": list(match.suggestions)}
+                for match in invalid
+            ]
+        }
+    if matches:
+        exercises = [
+            {**exercise, "exercise_name": matches[exercise.get("exercise_name", "")].exercise}
+            for exercise in exercises
+        ]
+
     data = {
         "user_id": user_id,
         "exercises": exercises
     }
 
-    response = _make_laravel_request("POST", "workouts/log", data)
-
-    # Clean up the response
-    cleaned_response = _clean_workout_response(response)
-
-    # Save to context state with today's date as key
-    today = datetime.now().strftime("%Y-%m-%d")
-    date_key = f"last_workout_{today}"
-
-    # Check if workout already exists for today
-    existing_workout = tool_context.state.get(date_key)
-
-    if existing_workout and existing_workout.get("workout_date") == today:
-        # Append exercises to existing workout
-        existing_workout["exercises"].extend(cleaned_response["exercises"])
-        existing_workout["total_volume_kg"] += cleaned_response["total_volume_kg"]
-        tool_context.state[date_key] = existing_workout
-        tool_context.state["last_workout"] = existing_workout
-        return existing_workout
+    # A retried tool call or re-sent message must not log the sets twice
+    idempotency = get_idempotency_cache()
+    origin = write_origin(tool_context)
+    key, previous = idempotency.check("workouts/log", user_id, data, origin)
+    if previous is not None:
+        return mark_duplicate(previous)
+
+    state = tool_context.state
+    if WORKOUT_WRITE_BEHIND:
+        # Queue durably and answer now; the queue sends it in the background
+        sync_failures, _ = reconcile_pending_logs(state)
+        queue = get_workout_queue()
+        # Already queued or sent (the queue, not the cache, knows: the
+        # provisional answer is not remembered until the backend accepts it).
+        # Without an origin, a repeat just after a bucket boundary was queued under the previous key.
+        for candidate in idempotency.keys("workouts/log", user_id, data, origin):
+            entry = queue.get(candidate)
+            if entry is not None and entry["status"] in ("pending", "sent"):
+                return mark_duplicate({"success": True, "message": "Workout already logged"})
+        # A failed log with the same key is queued again
+        queue.enqueue(user_id, data, key=key)
+        cleaned_response = provisional_workout(
+            queue.sequence(key), exercises, datetime.now().strftime("%Y-%m-%d")
+        )
+        track_pending_log(state, key, cleaned_response)
     else:
-        # New day, replace with new workout
-        tool_context.state[date_key] = cleaned_response
-        tool_context.state["last_workout"] = cleaned_response
-        return cleaned_response
+        sync_failures = []
+        response = _make_laravel_request("POST", "workouts/log", data, headers={IDEMPOTENCY_HEADER: key})
+        # Clean up the response
+        cleaned_response = clean_workout_response(response)
+        if not cleaned_response.get("success"):
+            return cleaned_response
+        idempotency.remember("workouts/log", key, cleaned_response)
+
+    # Today's sets changed: the analytics store re-fetches today on next use
+    get_workout_analytics().invalidate(user_id)
+
+    # Merge into today's workout in the session state
+    workout = without_index(add_to_today(state, cleaned_response))
+    if sync_failures:
+        # Earlier logs that could not be saved; the model should tell the user
+        workout = {**workout, "earlier_logs_not_saved": sync_failures}
+    return workout
 
 def edit_workout(
     tool_context: ToolContext,
@@ -225,22 +276,31 @@ def edit_workout(
         edit_workout("Squats", sets=4)
     """
     user_id = tool_context.state.get("user_id")
+    if WORKOUT_WRITE_BEHIND:
+        reconcile_pending_logs(tool_context.state)
 
-    # Get the workout_exercise_id from state
-    last_workout = tool_context.state.get("last_workout", {})
-    workout_exercise_id = None
-
-    if last_workout and "exercises" in last_workout:
-        for exercise in last_workout["exercises"]:
-            if exercise.get("name", "").lower() == exercise_name.lower():
-                workout_exercise_id = exercise.get("workout_exercise_id")
-                break
+    # Get the workout_exercise_id from today's name index (shorthand and typos are matched)
+    _, ids, suggestions = lookup_exercise(tool_context.state.get(TODAY_KEY), exercise_name)
+    workout_exercise_id = ids[0] if ids else None
 
     if not workout_exercise_id:
-        return {
+        error = {
             "success": False,
             "error": f"Could not find {exercise_name} in today's workout. Can only edit exercises logged today."
         }
+        if suggestions:
+            error["did_you_mean"] = suggestions
+        return error
+
+    if is_provisional(workout_exercise_id):
+        # Logged moments ago and not sent yet: send it now to get the real ID
+        resolved, unresolved = resolve_workout_exercise_ids(tool_context.state, [workout_exercise_id])
+        if unresolved:
+            return {
+                "success": False,
+                "error": f"{exercise_name} is still being saved to the training log. Try the edit again in a moment."
+            }
+        workout_exercise_id = resolved[0]
 
     # Build array with exercise updates - only include fields that are being changed
     exercise_update = {
@@ -260,31 +320,111 @@ def edit_workout(
         "user_id": user_id,
         "exercises": [exercise_update]
     }
-    print("Edit workout payload:", data)
+    log.debug("Edit workout payload: %s", data)
+
+    response = _make_laravel_request("PATCH", "workouts/exercises/edit", data)
+    if response.get("success"):
+        apply_exercise_edits(
+            tool_context.state, [workout_exercise_id],
+            {field: value for field, value in exercise_update.items() if field != "workout_exercise_id"}
+        )
+        # Today's sets changed: the analytics store re-fetches today on next use
+        get_workout_analytics().invalidate(user_id)
+    return response
+
+def _confirmation(exercises: List[Dict[str, Any]]) -> str:
+    """
+    Confirmation for a locally parsed log, in the format the prompt asks of the model.
 
-    return _make_laravel_request("PATCH", "workouts/exercises/edit", data)
+    Example:
+        "Logged! Bench Press 3×8 @ 80kg (1,920kg total volume)"
+    """
+    matches = validate_exercise_names([exercise["exercise_name"] for exercise in exercises])
+    lines, volume = [], 0.0
+    for exercise in exercises:
+        match = matches.get(exercise["exercise_name"])
+        name = match.exercise if match is not None and match.valid else exercise["exercise_name"].title()
+        line = f"{name} {exercise['sets']}×{exercise['reps']}"
+        notes = exercise.get("notes") or ""
+        if exercise["weight_kg"] and not notes.startswith("bodyweight"):
+            line += f" @ {exercise['weight_kg']:g}kg"
+        if notes:
+            line += f" ({notes})"
+        lines.append(line)
+        volume += exercise["sets"] * exercise["reps"] * exercise["weight_kg"]
+
+    total = f"{volume:,.0f}kg total volume" if volume else ""
+    if len(lines) == 1:
+        return f"Logged! {lines[0]}" + (f" ({total})" if total else "")
+    bullets = "\n".join(f"- {line}" for line in lines)
+    return f"Logged!\n{bullets}" + (f"\n{total[0].upper()}{total[1:]}" if total else "")
+
+def parsed_log_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback: log messages in a common format without the model.
+
+    On the first model call of a turn, a message parse_workout_log understands
+    ("bench 3x8@80kg, rows 3x10 60") is answered with the log_workout call
+    directly, and a plain success is confirmed locally too. Everything else
+    (low parse confidence, invalid names, duplicates, earlier logs not saved)
+    goes to the model as before.
+    """
+    if not WORKOUT_LOG_PARSER or not llm_request.contents:
+        return None
+    last = llm_request.contents[-1]
+    responses = [part.function_response for part in last.parts or () if part.function_response]
+
+    if responses:
+        parsed = callback_context.state.get(_PARSED_LOG_KEY)
+        if not parsed:
+            return None
+        callback_context.state[_PARSED_LOG_KEY] = None
+        result = responses[0].response if len(responses) == 1 and responses[0].name == "log_workout" else None
+        if (isinstance(result, dict) and result.get("success")
+                and not result.get("duplicate") and not result.get("earlier_logs_not_saved")):
+            return LlmResponse(content=types.Content(role="model", parts=[types.Part(text=_confirmation(parsed))]))
+        # Something to explain to the user: the model writes the reply
+        return None
+
+    text, has_media = message_of(last if last.role == "user" else None)
+    if not text or has_media:
+        return None
+    parsed = parse_workout_log(text)
+    if parsed.confidence < WORKOUT_PARSER_MIN_CONFIDENCE:
+        log.debug("Log left to the model (%.2f): %s", parsed.confidence, "; ".join(parsed.issues))
+        return None
+
+    callback_context.state[_PARSED_LOG_KEY] = parsed.exercises
+    return LlmResponse(content=types.Content(role="model", parts=[types.Part(
+        function_call=types.FunctionCall(name="log_workout", args={"exercises": parsed.exercises})
+    )]))
 
 # Validator agent - validates exercises against approved list
 validator_agent = Agent(
     name="validator",
     model="gemini-2.5-flash",
-    instruction=_build_validator_instruction(),
+    instruction=validator_instruction,
     description="Validates that exercises are in the approved list",
-    tools=[] 
+    tools=[get_allowed_exercises]
 )
 
-# Recorder agent - logs validated workouts to database
+# Recorder agent - logs workouts to database (log_workout validates names locally)
 recorder_agent = Agent(
-    name="recorder",
+    name="recorder" if WORKOUT_LLM_VALIDATOR else "logger",
     model="gemini-2.5-flash",
     instruction=prompt.LOGGER_PROMPT,
-    description="Records validated workout data to database",
-    tools=[log_workout, edit_workout]
+    description="Validates and logs workouts to database",
+    tools=[log_workout, edit_workout],
+    # With the LLM validator in front the recorder gets the validator's output, not the user's message
+    before_model_callback=None if WORKOUT_LLM_VALIDATOR else parsed_log_callback
 )
 
-# Main logger as SequentialAgent - validator first, then recorder
-logger = SequentialAgent(
-    name="logger",
-    sub_agents=[validator_agent, recorder_agent],
-    description="Validates and logs workouts to database"
-)
\ No newline at end of file
+if WORKOUT_LLM_VALIDATOR:
+    # Main logger as SequentialAgent - validator first, then recorder
+    logger = SequentialAgent(
+        name="logger",
+        sub_agents=[validator_agent, recorder_agent],
+        description="Validates and logs workouts to database"
+    )
+else:
+    logger = recorder_agent
\ No newline at end of file
@@ -51,6 +51,14 @@ LOGGER_PROMPT = """
         - notes (str, optional): Optional notes
     - Returns: Workout records with totals and any PRs detected
     - CRITICAL: Always pass ALL exercises in ONE call, never multiple calls
+    - Exercise names are checked against the approved exercise list. Use the user's wording;
+      common shorthand and typos ("bp", "ohp", "rdl", "deadlfit") are mapped to the approved name
+    - If it returns invalid_exercises, NOTHING was logged: tell the user which exercise(s) are
+      not approved and suggest the did_you_mean names. Do not guess - wait for the user to correct
+    - A result with "queued": true is logged and is being saved to the training log in the background;
+      confirm it like any other log (negative workout_exercise_ids are temporary and can still be edited)
+    - If the result contains earlier_logs_not_saved, those earlier exercises could NOT be saved:
+      tell the user and ask them to log them again
 
     ## Communication Guidelines
 
@@ -1,28 +1,257 @@
+import asyncio
 import httpx
+import logging
 import os
-from typing import Dict, Optional
+import re
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
 
 # Get Laravel API config from environment
 LARAVEL_API_URL = os.getenv("LARAVEL_API_URL", "http://localhost:8001/api")
 LARAVEL_API_KEY = os.getenv("LARAVEL_API_KEY", "")
 
-def _make_laravel_request(method: str, endpoint: str, data: Optional[Dict] = None) -> Dict:
-    """Helper function to make requests to Laravel API"""
-    url = f"{LARAVEL_API_URL}/{endpoint}"
-    # headers = {"Authorization": f"Bearer {LARAVEL_API_KEY}"}
-    headers = {"Authorization": f"Bearer xx"}
-    
+# Connection pool / protocol settings for the shared client
+LARAVEL_HTTP2 = os.getenv("LARAVEL_HTTP2", "true").lower() in ("1", "true", "yes")
+LARAVEL_MAX_CONNECTIONS = int(os.getenv("LARAVEL_MAX_CONNECTIONS", "20"))
+LARAVEL_MAX_KEEPALIVE = int(os.getenv("LARAVEL_MAX_KEEPALIVE", "10"))
+LARAVEL_KEEPALIVE_EXPIRY = float(os.getenv("LARAVEL_KEEPALIVE_EXPIRY", "30"))
+LARAVEL_CONNECT_TIMEOUT = float(os.getenv("LARAVEL_CONNECT_TIMEOUT", "5"))
+LARAVEL_TIMEOUT = float(os.getenv("LARAVEL_TIMEOUT", "10"))
+
+# Methods whose data is sent as query parameters rather than a JSON body
+_QUERY_METHODS = ("GET", "DELETE")
+# Latency samples kept per endpoint for the percentiles in get_request_metrics()
+_LATENCY_WINDOW = 1000
+# Numeric path segments (record IDs), folded into "{id}" in metrics keys
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+_async_client: Optional[httpx.AsyncClient] = None
+_async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+_metrics: Dict[str, Dict[str, Any]] = {}
+_metrics_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    """HTTP/2 needs h2 (installed by httpx[http2] in requirements.txt); without it, use HTTP/1.1."""
+    if not LARAVEL_HTTP2:
+        return False
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        logger.warning("LARAVEL_HTTP2 is enabled but h2 is not installed; using HTTP/1.1")
+        return False
+    return True
+
+
+def _client_options() -> Dict[str, Any]:
+    """Settings shared by the sync and async clients."""
+    if LARAVEL_API_KEY:
+        headers = {"Authorization": f"Bearer {LARAVEL_API_KEY}"}
+    else:
+        logger.warning("LARAVEL_API_KEY is not set; Laravel API requests are sent without an Authorization header")
+        headers = {}
+    return {
+        "base_url": f"{LARAVEL_API_URL}/",
+        "headers": headers,
+        "http2": _http2_available(),
+        "limits": httpx.Limits(
+            max_connections=LARAVEL_MAX_CONNECTIONS,
+            max_keepalive_connections=LARAVEL_MAX_KEEPALIVE,
+            keepalive_expiry=LARAVEL_KEEPALIVE_EXPIRY
+        ),
+        "timeout": httpx.Timeout(LARAVEL_TIMEOUT, connect=LARAVEL_CONNECT_TIMEOUT)
+    }
+
+
+def get_client() -> httpx.Client:
+    """Return the shared, pooled Laravel API client (created on first use)."""
+    global _client
+    if _client is None or _client.is_closed:
+        with _client_lock:
+            if _client is None or _client.is_closed:
+                _client = httpx.Client(**_client_options())
+    return _client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """
+    Return the shared async Laravel API client for the running event loop.
+
+    An AsyncClient is bound to the loop it was first used on, so a new one is
+    created when the loop changes.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client.is_closed or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(**_client_options())
+        _async_client_loop = loop
+    return _async_client
+
+
+def close_clients() -> None:
+    """Close the shared sync client (the async one is closed by aclose_async_client)."""
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client."""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+        _async_client_loop = None
+
+
+def _endpoint_key(method: str, endpoint: str) -> str:
+    """Metrics key; numeric path segments are folded so IDs don't create new keys."""
+    return f"{method} {_ID_SEGMENT.sub('/{id}', endpoint.strip('/'))}"
+
+
+def _record(method: str, endpoint: str, status: Optional[int], elapsed_ms: float) -> None:
+    key = _endpoint_key(method, endpoint)
+    with _metrics_lock:
+        metrics = _metrics.get(key)
+        if metrics is None:
+            metrics = _metrics[key] = {
+                "count": 0,
+                "errors": 0,
+                "status_codes": {},
+                "latencies_ms": deque(maxlen=_LATENCY_WINDOW)
+            }
+        metrics["count"] += 1
+        status_key = str(status) if status is not None else "network_error"
+        metrics["status_codes"][status_key] = metrics["status_codes"].get(status_key, 0) + 1
+        if status is None or status >= 400:
+            metrics["errors"] += 1
+        metrics["latencies_ms"].append(elapsed_ms)
+
+
+def get_request_metrics() -> Dict[str, Dict[str, Any]]:
+    """
+    Per-endpoint request metrics.
+
+    Returns:
+        Dictionary keyed by "METHOD endpoint" with count, errors, status_codes
+        and latency mean/p50/p95/max (ms) over the last requests
+    """
+    with _metrics_lock:
+        snapshot = {key: dict(metrics, status_codes=dict(metrics["status_codes"]),
+                              latencies_ms=list(metrics["latencies_ms"]))
+                    for key, metrics in _metrics.items()}
+
+    result = {}
+    for key, metrics in snapshot.items():
+        latencies = sorted(metrics.pop("latencies_ms"))
+        if latencies:
+            metrics.update({
+                "mean_ms": round(statistics.fmean(latencies), 1),
+                "p50_ms": round(statistics.median(latencies), 1),
+                "p95_ms": round(latencies[max(0, int(len(latencies) * 0.95) - 1)], 1),
+                "max_ms": round(latencies[-1], 1)
+            })
+        result[key] = metrics
+    return result
+
+
+def reset_request_metrics() -> None:
+    """Clear all per-endpoint metrics."""
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _request_kwargs(
+    method: str,
+    data: Optional[Dict],
+    timeout: Optional[float],
+    headers: Optional[Dict[str, str]]
+) -> Dict[str, Any]:
+    kwargs: Dict[str, Any] = {}
+    if data is not None:
+        kwargs["params" if method in _QUERY_METHODS else "json"] = data
+    if headers:
+        kwargs["headers"] = headers
+    if timeout is not None:
+        kwargs["timeout"] = httpx.Timeout(timeout, connect=min(timeout, LARAVEL_CONNECT_TIMEOUT))
+    return kwargs
+
+
+def _parse_response(method: str, endpoint: str, response: httpx.Response, elapsed_ms: float) -> Dict:
+    _record(method, endpoint, response.status_code, elapsed_ms)
+    logger.debug(
+        "%s %s -> %d (%.1f ms)", method, response.request.url, response.status_code, elapsed_ms
+    )
+    response.raise_for_status()
+    if response.status_code == 204 or not response.content:
+        return {"success": True}
+    return response.json()
+
+
+def _make_laravel_request(
+    method: str,
+    endpoint: str,
+    data: Optional[Dict] = None,
+    timeout: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict:
+    """
+    Helper function to make requests to Laravel API over the shared pooled client.
+
+    Args:
+        method: GET, POST, PUT, PATCH or DELETE
+        endpoint: Path relative to LARAVEL_API_URL (e.g. "workouts/log")
+        data: Query parameters (GET/DELETE) or JSON body (POST/PUT/PATCH)
+        timeout: Optional per-request timeout in seconds (default LARAVEL_TIMEOUT)
+        headers: Optional extra headers (e.g. Idempotency-Key)
+
+    Returns:
+        Parsed JSON response, or {"error": "..."} if the request failed
+        (plus "status_code" when the API answered with an error status)
+    """
+    method = method.upper()
+    started = time.perf_counter()
+    try:
+        response = get_client().request(method, endpoint, **_request_kwargs(method, data, timeout, headers))
+        return _parse_response(method, endpoint, response, (time.perf_counter() - started) * 1000)
+    except httpx.HTTPStatusError as e:
+        logger.warning("%s %s failed: %s", method, endpoint, e)
+        return {"error": str(e), "status_code": e.response.status_code}
+    except Exception as e:
+        if not isinstance(e, ValueError):
+            _record(method, endpoint, None, (time.perf_counter() - started) * 1000)
+        logger.warning("%s %s failed: %s", method, endpoint, e)
+        return {"error": str(e)}
+
+
+async def _make_laravel_request_async(
+    method: str,
+    endpoint: str,
+    data: Optional[Dict] = None,
+    timeout: Optional[float] = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Dict:
+    """Async counterpart of _make_laravel_request, on the shared AsyncClient."""
+    method = method.upper()
+    started = time.perf_counter()
     try:
-        if method == "GET":
-            response = httpx.get(url, headers=headers, params=data, timeout=10.0)
-            print(f"GET {url} - params: {data} - status: {response.status_code}")
-            print(response.url)
-        elif method == "PATCH":
-            response = httpx.patch(url, headers=headers, json=data, timeout=10.0)
-        else:
-            response = httpx.post(url, headers=headers, json=data, timeout=10.0)
-        
-        response.raise_for_status()
-        return response.json()
+        response = await get_async_client().request(method, endpoint, **_request_kwargs(method, data, timeout, headers))
+        return _parse_response(method, endpoint, response, (time.perf_counter() - started) * 1000)
+    except httpx.HTTPStatusError as e:
+        logger.warning("%s %s failed: %s", method, endpoint, e)
+        return {"error": str(e), "status_code": e.response.status_code}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        if not isinstance(e, ValueError):
+            _record(method, endpoint, None, (time.perf_counter() - started) * 1000)
+        logger.warning("%s %s failed: %s", method, endpoint, e)
+        return {"error": str(e)}
@@ -0,0 +1,477 @@
+"""
+Local analytics over a user's workout history.
+
+The analyst used to fetch raw history JSON for every question and leave the
+arithmetic to the model. Instead, each user's sets are pulled into a
+columnar in-process store (NumPy arrays: date, exercise, weight, reps) and
+aggregated there:
+- weekly volume per muscle group
+- estimated 1RM trends (Epley or Brzycki)
+- PRs (sets that beat the best estimated 1RM so far for that exercise)
+- training frequency and adherence to a days-per-week target
+
+History is pulled incrementally: the first sync fetches
+WORKOUT_ANALYTICS_BACKFILL_DAYS, later syncs (at most every
+WORKOUT_ANALYTICS_SYNC_SECONDS) only the days since the last one, replacing
+those days in the store so same-day logs and edits are picked up.
+"""
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from workout_coach_agent.exercise_catalog import get_exercise_catalog
+from workout_coach_agent.exercise_matcher import ExerciseMatcher
+from workout_coach_agent.tools import _make_laravel_request
+
+# Days of history fetched the first time a user's analytics are needed
+WORKOUT_ANALYTICS_BACKFILL_DAYS = int(os.getenv("WORKOUT_ANALYTICS_BACKFILL_DAYS", "730"))
+# A user's store is re-synced at most this often
+WORKOUT_ANALYTICS_SYNC_SECONDS = float(os.getenv("WORKOUT_ANALYTICS_SYNC_SECONDS", "300"))
+
+E1RM_FORMULAS = ("epley", "brzycki")
+
+# Fallback muscle groups for exercises the catalog has no group for; the
+# first group with a matching keyword wins
+MUSCLE_GROUP_KEYWORDS = (
+    ("core", ("plank", "crunch", "sit up", " ab ", " abs ", "leg raise", "russian twist")),
+    ("legs", ("squat", "leg", "lunge", "calf", "hip thrust", "step up", "glute", "hamstring")),
+    ("arms", ("curl", "tricep", "bicep", "skull", "pushdown", "hammer")),
+    ("shoulders", ("overhead press", "shoulder", "lateral", "raise", "military", "face pull", "arnold")),
+    ("chest", ("bench", "chest", "fly", "flye", "push up", "pushup", "dip", "pec")),
+    ("back", ("deadlift", "row", "pull", "chin", "lat ", "shrug", "back extension")),
+)
+
+logger = logging.getLogger(__name__)
+
+
+def epley(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    """Epley estimated 1RM: weight * (1 + reps / 30); a single is its own 1RM."""
+    weight, reps = np.asarray(weight, dtype=np.float64), np.asarray(reps, dtype=np.float64)
+    return np.where(reps <= 1, weight, weight * (1 + reps / 30))
+
+
+def brzycki(weight: np.ndarray, reps: np.ndarray) -> np.ndarray:
+    """Brzycki estimated 1RM: weight * 36 / (37 - reps); reps are capped at 36."""
+    weight, reps = np.asarray(weight, dtype=np.float64), np.asarray(reps, dtype=np.float64)
+    return np.where(reps <= 1, weight, weight * 36 / (37 - np.minimum(reps, 36)))
+
+
+def estimated_1rm(weight: np.ndarray, reps: np.ndarray, formula: str = "epley") -> np.ndarray:
+    if formula not in E1RM_FORMULAS:
+        raise ValueError(f"Unknown 1RM formula {formula!r}, expected one of {E1RM_FORMULAS}")
+    return epley(weight, reps) if formula == "epley" else brzycki(weight, reps)
+
+
+def muscle_group_for(name: str) -> str:
+    """Muscle group of an exercise by keyword, for names the catalog has no group for."""
+    padded = f" {name.lower()} "
+    for group, keywords in MUSCLE_GROUP_KEYWORDS:
+        if any(keyword in padded for keyword in keywords):
+            return group
+    return "other"
+
+
+def _parse_date(value: Any) -> Optional[int]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value).split("T")[0]).date().toordinal()
+    except ValueError:
+        return None
+
+
+def history_rows(response: Any) -> List[Tuple[int, str, Optional[str], float, int]]:
+    """
+    Flatten a workouts/history response into set rows.
+
+    Accepts the workouts as a list or under "workouts"/"data", each with
+    "workout_exercises" (backend format) or "exercises" (cleaned format).
+
+    Returns:
+        (date ordinal, exercise name, muscle group or None, weight_kg, reps) per set
+    """
+    if isinstance(response, dict):
+        workouts = response.get("workouts", response.get("data", []))
+    else:
+        workouts = response
+    rows = []
+    for workout in workouts or []:
+        if not isinstance(workout, dict):
+            continue
+        day = _parse_date(workout.get("workout_date") or workout.get("date"))
+        if day is None:
+            continue
+        for entry in workout.get("workout_exercises") or workout.get("exercises") or []:
+            exercise = entry.get("exercise") or {}
+            name = exercise.get("name") or entry.get("name")
+            if not name:
+                continue
+            group = exercise.get("muscle_group") or entry.get("muscle_group")
+            rows.append((day, name, group, float(entry.get("weight_kg") or 0), int(entry.get("reps") or 0)))
+    return rows
+
+
+def fetch_history(user_id: Any, days: int) -> Optional[List[Tuple[int, str, Optional[str], float, int]]]:
+    """
+    Fetches the last `days` days of a user's sets from the Laravel API.
+
+    Returns:
+        Set rows (see history_rows), or None if the request failed
+    """
+    response = _make_laravel_request("GET", "workouts/history", {"user_id": user_id, "days": days})
+    if isinstance(response, dict) and "error" in response:
+        logger.warning("Workout history fetch failed for user %s: %s", user_id, response["error"])
+        return None
+    return history_rows(response)
+
+
+class SetStore:
+    """
+    Columnar store of one user's sets.
+
+    Columns are parallel NumPy arrays; exercise names and muscle groups are
+    interned to small integer codes.
+    """
+
+    def __init__(self):
+        self.day = np.empty(0, dtype=np.int32)
+        self.exercise = np.empty(0, dtype=np.int32)
+        self.weight = np.empty(0, dtype=np.float32)
+        self.reps = np.empty(0, dtype=np.int16)
+        self.names: List[str] = []
+        self.groups: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+        self._group_codes: Dict[str, int] = {}
+        self._exercise_group: List[int] = []
+        self.synced_day: Optional[int] = None
+        self.synced_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    def _code(self, name: str, group: Optional[str]) -> int:
+        key = name.lower()
+        code = self._name_codes.get(key)
+        if code is None:
+            code = len(self.names)
+            self._name_codes[key] = code
+            self.names.append(name)
+            self._exercise_group.append(self._group_code(group or muscle_group_for(name)))
+        return code
+
+    def _group_code(self, group: str) -> int:
+        group = str(group).lower()
+        if group not in self._group_codes:
+            self._group_codes[group] = len(self.groups)
+            self.groups.append(group)
+        return self._group_codes[group]
+
+    def replace_from(self, from_day: int, rows: Iterable[Tuple[int, str, Optional[str], float, int]]) -> None:
+        """Drop the stored sets on or after `from_day` and append `rows` (sorted by day)."""
+        rows = [row for row in rows if row[0] >= from_day]
+        keep = self.day < from_day
+        rows.sort(key=lambda row: row[0])
+        self.day = np.concatenate([self.day[keep], np.fromiter((r[0] for r in rows), np.int32, len(rows))])
+        self.exercise = np.concatenate([
+            self.exercise[keep], np.fromiter((self._code(r[1], r[2]) for r in rows), np.int32, len(rows))
+        ])
+        self.weight = np.concatenate([self.weight[keep], np.fromiter((r[3] for r in rows), np.float32, len(rows))])
+        self.reps = np.concatenate([self.reps[keep], np.fromiter((r[4] for r in rows), np.int16, len(rows))])
+
+    def set_groups(self, groups: Dict[str, str]) -> None:
+        """Override muscle groups by exercise name (lower-cased)."""
+        for code, name in enumerate(self.names):
+            group = groups.get(name.lower())
+            if group:
+                self._exercise_group[code] = self._group_code(group)
+
+    def exercise_code(self, name: str) -> Optional[int]:
+        """Code of an exercise by name, tolerating shorthand and typos."""
+        code = self._name_codes.get(name.lower())
+        if code is None and self.names:
+            match = ExerciseMatcher(self.names).match(name)
+            if match.valid:
+                code = self._name_codes[match.exercise.lower()]
+        return code
+
+    def group_of(self, exercise: np.ndarray) -> np.ndarray:
+        return np.asarray(self._exercise_group, dtype=np.int32)[exercise]
+
+
+def _week(day: np.ndarray) -> np.ndarray:
+    # Ordinal 1 (0001-01-01) is a Monday, so weeks start on Monday
+    return (day - 1) // 7
+
+
+def _week_start(week: int) -> str:
+    return date.fromordinal(int(week) * 7 + 1).isoformat()
+
+
+def weekly_volume(store: SetStore, today: int, weeks: int = 4) -> Dict[str, Dict[str, float]]:
+    """
+    Volume (kg x reps) per muscle group for each of the last `weeks` weeks.
+
+    Returns:
+        {week start date: {muscle group: volume}}, oldest week first
+    """
+    first_week = _week(np.int64(today)) - weeks + 1
+    mask = (_week(store.day) >= first_week) & (store.day <= today)
+    week = _week(store.day[mask]) - first_week
+    group = store.group_of(store.exercise[mask])
+    totals = np.zeros((weeks, max(1, len(store.groups))))
+    np.add.at(totals, (week, group), store.weight[mask].astype(np.float64) * store.reps[mask])
+    return {
+        _week_start(first_week + w): {
+            store.groups[g]: round(float(totals[w, g]), 1) for g in np.flatnonzero(totals[w])
+        }
+        for w in range(weeks)
+    }
+
+
+def e1rm_trend(
+    store: SetStore,
+    exercise: int,
+    today: int,
+    weeks: int = 12,
+    formula: str = "epley"
+) -> Dict[str, float]:
+    """
+    Best estimated 1RM of an exercise in each of the last `weeks` weeks it was trained.
+
+    Returns:
+        {week start date: best e1RM in kg}, oldest week first
+    """
+    first_week = _week(np.int64(today)) - weeks + 1
+    mask = (store.exercise == exercise) & (_week(store.day) >= first_week) & (store.day <= today)
+    week = _week(store.day[mask]) - first_week
+    best = np.full(weeks, -1.0)
+    np.maximum.at(best, week, estimated_1rm(store.weight[mask], store.reps[mask], formula))
+    return {_week_start(first_week + w): round(float(best[w]), 1) for w in np.flatnonzero(best >= 0)}
+
+
+def personal_records(store: SetStore, since: int, formula: str = "epley") -> List[Dict[str, Any]]:
+    """
+    Sets on or after `since` whose estimated 1RM beat every earlier set of the
+    same exercise (an exercise's first session is not a PR).
+
+    Returns:
+        One entry per exercise with its best PR set, newest first
+    """
+    if not len(store):
+        return []
+    e1rm = estimated_1rm(store.weight, store.reps, formula)
+    order = np.lexsort((store.day, store.exercise))
+    exercise, day, value = store.exercise[order], store.day[order], e1rm[order]
+    weight, reps = store.weight[order], store.reps[order]
+
+    # Running max per exercise: offset each exercise above all lower codes
+    offset = float(value.max()) + 1
+    running = np.maximum.accumulate(value + exercise * offset) - exercise * offset
+    # Best of strictly earlier days: the running max at the last set of the previous day
+    same_day_start = np.r_[True, (exercise[1:] != exercise[:-1]) | (day[1:] != day[:-1])]
+    start_index = np.maximum.accumulate(np.where(same_day_start, np.arange(len(day)), 0))
+    first_of_exercise = np.r_[True, exercise[1:] != exercise[:-1]]
+    group_start = np.maximum.accumulate(np.where(first_of_exercise, np.arange(len(day)), 0))
+    has_earlier = start_index > group_start
+    prior_best = np.where(has_earlier, running[np.maximum(start_index - 1, 0)], np.inf)
+
+    is_pr = (day >= since) & (value > prior_best + 1e-9)
+    best: Dict[int, int] = {}
+    for i in np.flatnonzero(is_pr):
+        code = int(exercise[i])
+        if code not in best or value[i] > value[best[code]]:
+            best[code] = i
+    records = [
+        {
+            "exercise": store.names[int(exercise[i])],
+            "date": date.fromordinal(int(day[i])).isoformat(),
+            "weight_kg": round(float(weight[i]), 1),
+            "reps": int(reps[i]),
+            "e1rm_kg": round(float(value[i]), 1),
+            "previous_best_e1rm_kg": round(float(prior_best[i]), 1),
+        }
+        for i in best.values()
+    ]
+    return sorted(records, key=lambda record: record["date"], reverse=True)
+
+
+def frequency(store: SetStore, today: int, weeks: int = 4, target_days_per_week: int = 3) -> Dict[str, Any]:
+    """
+    Training days per week over the last `weeks` weeks and adherence to a target.
+
+    The current week counts towards adherence only once it meets the target.
+    """
+    this_week = int(_week(np.int64(today)))
+    first_week = this_week - weeks + 1
+    days = np.unique(store.day[(_week(store.day) >= first_week) & (store.day <= today)])
+    per_week = np.bincount(_week(days) - first_week, minlength=weeks)[:weeks]
+    met = per_week >= target_days_per_week
+    counted = weeks if met[-1] else weeks - 1
+
+    # Consecutive weeks on target, up to this week (or last week while this one is still short)
+    all_days = np.unique(store.day[store.day <= today])
+    streak = 0
+    if len(all_days):
+        week_counts = np.bincount(this_week - _week(all_days))
+        start = 0 if week_counts[0] >= target_days_per_week else 1
+        on_target = week_counts[start:] >= target_days_per_week
+        streak = int(np.argmin(on_target)) if not on_target.all() else len(on_target)
+
+    return {
+        "training_days": int(len(days)),
+        "days_per_week": {_week_start(first_week + w): int(per_week[w]) for w in range(weeks)},
+        "average_days_per_week": round(float(per_week.mean()), 1) if weeks else 0.0,
+        "target_days_per_week": target_days_per_week,
+        "adherence_pct": round(100.0 * float(met[:counted].mean()), 0) if counted else 0.0,
+        "weeks_on_target_streak": streak,
+        "last_workout_date": date.fromordinal(int(all_days[-1])).isoformat() if len(all_days) else None,
+    }
+
+
+class WorkoutAnalytics:
+    """Per-user set stores with incremental sync from the Laravel API."""
+
+    def __init__(
+        self,
+        fetch: Callable[[Any, int], Optional[List[Tuple[int, str, Optional[str], float, int]]]] = fetch_history,
+        backfill_days: int = WORKOUT_ANALYTICS_BACKFILL_DAYS,
+        sync_seconds: float = WORKOUT_ANALYTICS_SYNC_SECONDS
+    ):
+        self._fetch = fetch
+        self.backfill_days = backfill_days
+        self.sync_seconds = sync_seconds
+        self._lock = threading.Lock()
+        self._stores: Dict[Any, Tuple[threading.Lock, SetStore]] = {}
+
+    def store(self, user_id: Any, force: bool = False) -> SetStore:
+        """
+        A user's set store, synced if it is older than sync_seconds.
+
+        A failed sync keeps the sets already in the store; until the first
+        sync succeeds, synced_day stays None.
+        """
+        with self._lock:
+            lock, store = self._stores.setdefault(user_id, (threading.Lock(), SetStore()))
+        with lock:
+            if force or store.synced_at is None or time.time() - store.synced_at >= self.sync_seconds:
+                self._sync(user_id, store)
+        return store
+
+    def _sync(self, user_id: Any, store: SetStore) -> None:
+        today = date.today().toordinal()
+        if store.synced_day is None:
+            days = self.backfill_days
+        else:
+            # Re-fetch the last synced day too: it may have had more sets logged since
+            days = today - store.synced_day + 1
+        rows = self._fetch(user_id, days)
+        if rows is None:
+            return
+        store.replace_from(today - days + 1, rows)
+        store.synced_day = today
+        store.synced_at = time.time()
+        self._attach_catalog_groups(store)
+
+    @staticmethod
+    def _attach_catalog_groups(store: SetStore) -> None:
+        """Catalog muscle groups win over the keyword fallback (when the catalog is loaded)."""
+        catalog = get_exercise_catalog()
+        if not catalog.loaded:
+            return
+        store.set_groups({
+            str(exercise["name"]).lower(): exercise.get("muscle_group") or exercise.get("category")
+            for exercise in catalog.exercises(wait=False)
+        })
+
+    def invalidate(self, user_id: Any) -> None:
+        """Sync a user's store on its next use (e.g. after a log or edit)."""
+        with self._lock:
+            entry = self._stores.get(user_id)
+        if entry is not None:
+            entry[1].synced_at = None
+
+
+_analytics: Optional[WorkoutAnalytics] = None
+_analytics_lock = threading.Lock()
+
+
+def get_workout_analytics() -> WorkoutAnalytics:
+    """Return the process-wide workout analytics."""
+    global _analytics
+    if _analytics is None:
+        with _analytics_lock:
+            if _analytics is None:
+                _analytics = WorkoutAnalytics()
+    return _analytics
+
+
+def _today() -> int:
+    return date.today().toordinal()
+
+
+# Returned instead of empty analytics while a user's history could not be loaded once
+_HISTORY_UNAVAILABLE = {"success": False, "error": "Could not load your training history; try again shortly."}
+
+
+def training_overview(
+    user_id: Any,
+    weeks: int = 4,
+    target_days_per_week: int = 3,
+    formula: str = "epley"
+) -> Dict[str, Any]:
+    """
+    Compact training overview: weekly volume per muscle group, frequency and
+    adherence, PRs in the window and the best e1RM of the most trained exercises.
+    """
+    store = get_workout_analytics().store(user_id)
+    if store.synced_day is None:
+        return dict(_HISTORY_UNAVAILABLE)
+    today = _today()
+    # Window of whole weeks (Monday to Sunday), as in weekly_volume
+    since = int(_week(np.int64(today)) - weeks + 1) * 7 + 1
+
+    recent = store.exercise[(store.day >= since) & (store.day <= today)]
+    top = np.argsort(np.bincount(recent, minlength=len(store.names)))[::-1][:5] if len(recent) else []
+    best_e1rm = {}
+    for code in top:
+        trend = e1rm_trend(store, int(code), today, weeks, formula)
+        if trend:
+            best_e1rm[store.names[int(code)]] = max(trend.values())
+
+    return {
+        "success": True,
+        "weeks": weeks,
+        "sets": int(len(recent)),
+        "weekly_volume_kg": weekly_volume(store, today, weeks),
+        "frequency": frequency(store, today, weeks, target_days_per_week),
+        "personal_records": personal_records(store, since, formula),
+        "best_e1rm_kg": best_e1rm,
+        "e1rm_formula": formula,
+    }
+
+
+def strength_trend(user_id: Any, exercise_name: str, weeks: int = 12, formula: str = "epley") -> Dict[str, Any]:
+    """Weekly best estimated 1RM of one exercise, with the change over the period."""
+    store = get_workout_analytics().store(user_id)
+    if store.synced_day is None:
+        return dict(_HISTORY_UNAVAILABLE)
+    code = store.exercise_code(exercise_name)
+    if code is None:
+        return {"success": False, "error": f"No {exercise_name} sets in your training history."}
+    trend = e1rm_trend(store, code, _today(), weeks, formula)
+    if not trend:
+        return {"success": False, "error": f"No {store.names[code]} sets in the last {weeks} weeks."}
+    values = list(trend.values())
+    return {
+        "success": True,
+        "exercise": store.names[code],
+        "e1rm_formula": formula,
+        "weekly_best_e1rm_kg": trend,
+        "change_kg": round(values[-1] - values[0], 1),
+        "change_pct": round(100.0 * (values[-1] - values[0]) / values[0], 1) if values[0] else None,
+    }
@@ -0,0 +1,256 @@
+"""
+Local parser for the common ways users write workout logs.
+
+Handles, per exercise (several per message, separated by ",", ";", "and",
+"then" or new lines):
+- sets x reps: "3x8", "3 x 8", "3×8", "3 sets of 8 (reps)"
+- weight: "@80kg", "at 80 kilos", "135lb", "3x8x80", or a bare number
+  ("squat 5x5 100", taken as kg)
+- bodyweight: "bw", "bodyweight", "bw+10kg" (added weight)
+- RPE: "@8 rpe", "rpe 8", "rpe8"
+
+parse_workout_log returns the `exercises` payload for log_workout and a
+confidence; anything unusual (missing sets or weight, rep ranges, extra
+numbers, long names, words that are in no exercise catalog name or alias)
+lowers it, so the caller can leave the message to the LLM. Messages about
+another day ("yesterday", "last monday") are always left to the LLM. Names
+are passed on as written; log_workout maps them to the catalog.
+
+The logger agent uses it as a before_model_callback: a message parsed with
+confidence >= WORKOUT_PARSER_MIN_CONFIDENCE goes straight to log_workout,
+without the model call that used to extract the payload.
+"""
+import os
+import re
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from workout_coach_agent.exercise_matcher import get_exercise_matcher, normalize
+from workout_coach_agent.intent_router import EDIT_WORDS
+
+# Log parseable messages without the logger's model (off: the model parses every log)
+WORKOUT_LOG_PARSER = os.getenv("WORKOUT_LOG_PARSER", "true").lower() in ("1", "true", "yes")
+# Minimum parse confidence for skipping the model
+WORKOUT_PARSER_MIN_CONFIDENCE = float(os.getenv("WORKOUT_PARSER_MIN_CONFIDENCE", "0.9"))
+
+LB_TO_KG = 0.45359237
+
+_SPLIT = re.compile(r"\s*(?:[,;\n]|\band\b|\bthen\b|\+(?!\s*\d))\s*", re.IGNORECASE)
+_NUMBER = r"\d+(?:[.,]\d+)?"
+_UNIT = r"(?:kgs?|kilos?|kilograms?|lbs?|pounds?)"
+_SETS_X_REPS_X_WEIGHT = re.compile(
+    rf"\b(\d+)\s*[x×*]\s*(\d+)\s*[x×*]\s*({_NUMBER})\s*({_UNIT})?(?![\w-])", re.IGNORECASE
+)
+_SETS_X_REPS = re.compile(r"\b(\d+)\s*[x×*]\s*(\d+)(?![\w.,-])", re.IGNORECASE)
+_SETS_OF_REPS = re.compile(r"\b(\d+)\s*sets?\s*(?:of\s*)?(\d+)(?:\s*reps?)?\b", re.IGNORECASE)
+_SETS_ONLY = re.compile(r"\b(\d+)\s*sets?\b", re.IGNORECASE)
+_REPS_ONLY = re.compile(r"\b(\d+)\s*reps?\b", re.IGNORECASE)
+_RPE = re.compile(rf"(?:@\s*({_NUMBER})\s*rpe\b|\brpe\s*@?\s*({_NUMBER}))", re.IGNORECASE)
+_BODYWEIGHT = re.compile(
+    rf"\b(?:bw|bodyweight|body\s+weight)\b(?:\s*\+\s*({_NUMBER})\s*({_UNIT})?)?", re.IGNORECASE
+)
+_WEIGHT_WITH_UNIT = re.compile(rf"(?:@|\bat\b|\bwith\b)?\s*({_NUMBER})\s*({_UNIT})\b", re.IGNORECASE)
+_WEIGHT_AFTER_AT = re.compile(rf"(?:@|\bat\b)\s*({_NUMBER})\b", re.IGNORECASE)
+_BARE_NUMBER = re.compile(rf"(?<![\w.])({_NUMBER})(?![\w.])")
+_RANGE = re.compile(r"\d+\s*-\s*\d+")
+_WEEKDAY = r"(?:mon|tues|wednes|thurs|fri|satur|sun)day"
+_FILLER = re.compile(
+    r"\b(i|just|did|done|finished|today|my|some|of|for|at|with|reps?|sets?|then|also|a|an|the|"
+    r"workout|log|logged|please|pls|this\s+(?:morning|afternoon|evening)|tonight|earlier)\b|[@:!.]",
+    re.IGNORECASE
+)
+
+# Corrections and questions mention numbers too, but are not new logs;
+# a log for another day needs its date, which only the model works out
+_NOT_A_LOG = re.compile(
+    rf"{EDIT_WORDS}|\?|\b(what|how|why|should|can|could|plan)\b|"
+    rf"\b(yesterday|ago|last\s+(?:night|week|{_WEEKDAY})|on\s+{_WEEKDAY})\b",
+    re.IGNORECASE
+)
+
+# Plausible ranges; values outside them are more likely a misparse
+_MAX_SETS, _MAX_REPS, _MAX_WEIGHT_KG = 20, 100, 500.0
+
+
+class ParsedLog(NamedTuple):
+    """
+    Result of parse_workout_log.
+
+    Attributes:
+        exercises: Payload for log_workout (exercise_name, sets, reps, weight_kg, notes?)
+        confidence: 0-1; 1 means every part of the message was understood
+        issues: Why the confidence was lowered
+    """
+    exercises: List[Dict[str, Any]]
+    confidence: float
+    issues: Tuple[str, ...] = ()
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace(",", "."))
+
+
+def _kg(value: str, unit: Optional[str]) -> float:
+    weight = _to_float(value)
+    if unit and unit.lower().startswith(("lb", "pound")):
+        return round(weight * LB_TO_KG, 2)
+    return weight
+
+
+def _take(pattern: re.Pattern, text: str) -> Tuple[Optional[re.Match], str]:
+    """First match of a pattern and the text with it blanked out."""
+    match = pattern.search(text)
+    if match is None:
+        return None, text
+    return match, text[:match.start()] + " " + text[match.end():]
+
+
+def _parse_segment(text: str) -> Tuple[Optional[Dict[str, Any]], float, List[str]]:
+    """Parse one exercise; returns (exercise or None, confidence, issues)."""
+    confidence, issues, notes = 1.0, [], []
+    rest = text
+
+    if _RANGE.search(rest):
+        return None, 0.0, [f"rep or weight range in {text!r}"]
+
+    match, rest = _take(_RPE, rest)
+    if match:
+        notes.append(f"RPE {_to_float(match.group(1) or match.group(2)):g}")
+
+    sets = reps = weight = None
+    match, rest = _take(_SETS_X_REPS_X_WEIGHT, rest)
+    if match:
+        sets, reps, weight = int(match.group(1)), int(match.group(2)), _kg(match.group(3), match.group(4))
+    else:
+        for pattern in (_SETS_X_REPS, _SETS_OF_REPS):
+            match, rest = _take(pattern, rest)
+            if match:
+                sets, reps = int(match.group(1)), int(match.group(2))
+                break
+        else:
+            match, rest = _take(_SETS_ONLY, rest)
+            if match:
+                sets = int(match.group(1))
+            match, rest = _take(_REPS_ONLY, rest)
+            if match:
+                reps = int(match.group(1))
+
+    if weight is None:
+        match, rest = _take(_BODYWEIGHT, rest)
+        if match:
+            weight = _kg(match.group(1), match.group(2)) if match.group(1) else 0.0
+            notes.append(f"bodyweight +{weight:g}kg" if weight else "bodyweight")
+    if weight is None:
+        match, rest = _take(_WEIGHT_WITH_UNIT, rest)
+        if match:
+            weight = _kg(match.group(1), match.group(2))
+    if weight is None:
+        match, rest = _take(_WEIGHT_AFTER_AT, rest)
+        if match:
+            weight = _to_float(match.group(1))
+            confidence -= 0.05
+            issues.append("weight without unit (kg assumed)")
+    if weight is None:
+        match, rest = _take(_BARE_NUMBER, rest)
+        if match:
+            weight = _to_float(match.group(1))
+            confidence -= 0.05
+            issues.append("weight without unit (kg assumed)")
+
+    if _BARE_NUMBER.search(rest):
+        confidence = 0.0
+        issues.append(f"unexplained number in {text!r}")
+
+    name = " ".join(_FILLER.sub(" ", rest).split()).strip(" -")
+    if not name:
+        return None, 0.0, [f"no exercise name in {text!r}"]
+    if len(name.split()) > 4 or not re.fullmatch(r"[a-zA-Z][a-zA-Z' -]*", name):
+        confidence = min(confidence, 0.5)
+        issues.append(f"unusual exercise name {name!r}")
+    else:
+        unknown = _unknown_words(name)
+        if unknown:
+            confidence = min(confidence, 0.7)
+            issues.append(f"{', '.join(unknown)} not in any exercise name")
+
+    if sets is None or reps is None:
+        confidence = min(confidence, 0.5)
+        issues.append(f"sets or reps missing for {name!r}")
+    if weight is None:
+        confidence = min(confidence, 0.6)
+        issues.append(f"weight missing for {name!r}")
+    if sets is not None and not 1 <= sets <= _MAX_SETS:
+        confidence = min(confidence, 0.3)
+        issues.append(f"{sets} sets for {name!r}")
+    if reps is not None and not 1 <= reps <= _MAX_REPS:
+        confidence = min(confidence, 0.3)
+        issues.append(f"{reps} reps for {name!r}")
+    if weight is not None and weight > _MAX_WEIGHT_KG:
+        confidence = min(confidence, 0.3)
+        issues.append(f"{weight:g}kg for {name!r}")
+
+    exercise = {
+        "exercise_name": name,
+        "sets": sets or 1,
+        "reps": reps or 1,
+        "weight_kg": float(weight or 0.0),
+    }
+    if notes:
+        exercise["notes"] = ", ".join(notes)
+    return exercise, max(confidence, 0.0), issues
+
+
+def parse_workout_log(text: str) -> ParsedLog:
+    """
+    Parse a workout log message into log_workout's exercises payload.
+
+    Args:
+        text: The user's message, e.g. "bench 3x8@80kg, rows 3x10 60"
+
+    Returns:
+        ParsedLog; confidence 0 (and no exercises) when nothing could be parsed
+
+    Example:
+        parse_workout_log("squat 5x5 100, pullups 3x12 bw")
+        # exercises: [{"exercise_name": "squat", "sets": 5, "reps": 5, "weight_kg": 100.0},
+        #             {"exercise_name": "pullups", "sets": 3, "reps": 12, "weight_kg": 0.0,
+        #              "notes": "bodyweight"}]
+    """
+    if _NOT_A_LOG.search(text or ""):
+        return ParsedLog([], 0.0, ("looks like an edit, a question or a log for another day",))
+    segments = [segment for segment in _SPLIT.split(text or "") if segment and segment.strip()]
+    # "3 sets of bench press, 8 reps at 80kg": a part without a name belongs to the one before
+    merged: List[str] = []
+    for segment in segments:
+        if merged and not _FILLER.sub(" ", _BARE_NUMBER.sub(" ", _strip_numbers(segment))).strip():
+            merged[-1] = f"{merged[-1]} {segment}"
+        else:
+            merged.append(segment)
+
+    exercises, issues, confidence = [], [], 1.0
+    for segment in merged:
+        exercise, segment_confidence, segment_issues = _parse_segment(segment)
+        issues.extend(segment_issues)
+        confidence = min(confidence, segment_confidence)
+        if exercise is not None:
+            exercises.append(exercise)
+    if not exercises:
+        return ParsedLog([], 0.0, tuple(issues) or ("nothing to parse",))
+    return ParsedLog(exercises, confidence, tuple(issues))
+
+
+def _unknown_words(name: str) -> List[str]:
+    """Words of a name found in no catalog name or alias (all of them while the catalog is not loaded)."""
+    vocabulary = get_exercise_matcher(wait=False).vocabulary
+    key = normalize(name)
+    if key.replace(" ", "") in vocabulary:
+        return []
+    # normalize() keeps short plurals ("ups")
+    return [word for word in key.split() if word not in vocabulary and word[:-1] not in vocabulary]
+
+
+def _strip_numbers(text: str) -> str:
+    """A segment without its numbers, units and set/rep/weight notation."""
+    for pattern in (_RPE, _SETS_X_REPS_X_WEIGHT, _SETS_X_REPS, _SETS_OF_REPS, _SETS_ONLY, _REPS_ONLY,
+                    _BODYWEIGHT, _WEIGHT_WITH_UNIT, _WEIGHT_AFTER_AT):
+        text = pattern.sub(" ", text)
+    return text
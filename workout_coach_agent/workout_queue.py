@@ -0,0 +1,326 @@
+"""
+Durable write-behind queue for workout logs.
+
+log_workout stores each log in a local SQLite queue and answers right away
+with provisional workout_exercise_ids; a background thread then posts the
+queued logs to the Laravel API in batches:
+- each log carries an idempotency key, sent as the Idempotency-Key header on
+  every attempt, so a retry after a lost response cannot log the sets twice
+- network errors and 5xx responses are retried with exponential backoff;
+  4xx responses (e.g. validation errors) mark the log as failed
+- logs of one user are sent in order; different users are sent in parallel
+- queued logs survive a restart and are sent once the process is back
+
+The backend's responses are kept in the queue (for
+WORKOUT_QUEUE_RETENTION_SECONDS) so workout_state can swap the provisional
+IDs in the session state for the real ones.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from workout_coach_agent.idempotency import IDEMPOTENCY_HEADER
+from workout_coach_agent.tools import _make_laravel_request
+from workout_coach_agent.workout_analytics import get_workout_analytics
+
+WORKOUT_WRITE_BEHIND = os.getenv("WORKOUT_WRITE_BEHIND", "true").lower() in ("1", "true", "yes")
+WORKOUT_QUEUE_PATH = os.getenv(
+    "WORKOUT_QUEUE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".workout_queue.sqlite3")
+)
+# The flusher wakes up this often (and as soon as a batch is full)
+WORKOUT_QUEUE_FLUSH_INTERVAL = float(os.getenv("WORKOUT_QUEUE_FLUSH_INTERVAL", "1.0"))
+WORKOUT_QUEUE_BATCH_SIZE = int(os.getenv("WORKOUT_QUEUE_BATCH_SIZE", "20"))
+WORKOUT_QUEUE_CONCURRENCY = int(os.getenv("WORKOUT_QUEUE_CONCURRENCY", "4"))
+WORKOUT_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORKOUT_QUEUE_MAX_ATTEMPTS", "10"))
+# Sent and failed logs are kept this long for reconciliation, then pruned
+WORKOUT_QUEUE_RETENTION_SECONDS = float(os.getenv("WORKOUT_QUEUE_RETENTION_SECONDS", "86400"))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workout_logs (
+    key TEXT PRIMARY KEY,
+    user_id TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    response TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS workout_logs_due ON workout_logs (status, next_attempt_at);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def new_idempotency_key() -> str:
+    """Random idempotency key, for logs queued without one."""
+    return uuid.uuid4().hex
+
+
+def post_workout_log(payload: Dict[str, Any], key: str) -> Dict[str, Any]:
+    """Send one queued log to the Laravel API."""
+    return _make_laravel_request("POST", "workouts/log", payload, headers={IDEMPOTENCY_HEADER: key})
+
+
+class WorkoutLogQueue:
+    """
+    SQLite-backed queue of workout logs waiting to be sent.
+
+    A single connection is shared between threads and guarded by a lock;
+    every public method is safe to call concurrently.
+    """
+
+    def __init__(
+        self,
+        path: str = WORKOUT_QUEUE_PATH,
+        send: Callable[[Dict[str, Any], str], Dict[str, Any]] = post_workout_log,
+        batch_size: int = WORKOUT_QUEUE_BATCH_SIZE,
+        concurrency: int = WORKOUT_QUEUE_CONCURRENCY,
+        max_attempts: int = WORKOUT_QUEUE_MAX_ATTEMPTS
+    ):
+        self.path = path
+        self._send = send
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            # An acknowledged log must survive a crash
+            self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.executescript(_SCHEMA)
+        self._conn.commit()
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix="workout-queue")
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._sending: set = set()
+
+    # ── queue ───────────────────────────────────────────────
+
+    def enqueue(self, user_id: Any, payload: Dict[str, Any], key: Optional[str] = None) -> str:
+        """
+        Durably queue a workout log.
+
+        Args:
+            user_id: User the log belongs to (logs of one user are sent in order)
+            payload: Request body for POST workouts/log
+            key: Idempotency key; enqueueing an existing key again is a no-op,
+                unless that log failed: then it is queued again from scratch
+
+        Returns:
+            The idempotency key
+        """
+        key = key or new_idempotency_key()
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO workout_logs (key, user_id, payload, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET status = 'pending', attempts = 0, next_attempt_at = 0, "
+                "payload = excluded.payload, response = NULL, error = NULL, updated_at = excluded.updated_at "
+                "WHERE status = 'failed'",
+                (key, None if user_id is None else str(user_id), json.dumps(payload), now, now)
+            )
+            self._conn.commit()
+            pending = self._conn.execute(
+                "SELECT COUNT(*) FROM workout_logs WHERE status = 'pending'"
+            ).fetchone()[0]
+        if pending >= self.batch_size:
+            self._wake.set()
+        return key
+
+    def sequence(self, key: str) -> Optional[int]:
+        """Insertion number of a queued log (1, 2, ...), used for provisional IDs."""
+        with self._lock:
+            row = self._conn.execute("SELECT rowid FROM workout_logs WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        State of a queued log.
+
+        Returns:
+            {"key", "status" ("pending", "sent" or "failed"), "attempts",
+            "response", "error"}, or None if the key is unknown (or pruned)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM workout_logs WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return {
+            "key": row["key"],
+            "status": row["status"],
+            "attempts": row["attempts"],
+            "response": json.loads(row["response"]) if row["response"] else None,
+            "error": row["error"]
+        }
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM workout_logs WHERE status = 'pending'"
+            ).fetchone()[0]
+
+    # ── sending ─────────────────────────────────────────────
+
+    def flush(self, keys: Optional[List[str]] = None, wait: bool = True) -> int:
+        """
+        Send due pending logs (or the given ones, due or not) now.
+
+        Args:
+            keys: Only send these logs
+            wait: Block until the batch has been sent
+
+        Returns:
+            Number of logs picked for sending
+        """
+        with self._lock:
+            if keys is not None:
+                placeholders = ",".join("?" * len(keys))
+                rows = self._conn.execute(
+                    f"SELECT * FROM workout_logs WHERE status = 'pending' AND key IN ({placeholders}) "
+                    "ORDER BY created_at", list(keys)
+                ).fetchall()
+            else:
+                rows = self._conn.execute(
+                    "SELECT * FROM workout_logs WHERE status = 'pending' AND next_attempt_at <= ? "
+                    "ORDER BY created_at LIMIT ?", (time.time(), self.batch_size)
+                ).fetchall()
+            rows = [row for row in rows if row["key"] not in self._sending]
+            self._sending.update(row["key"] for row in rows)
+
+        # One task per user keeps each user's logs in order
+        by_user: Dict[Optional[str], List[sqlite3.Row]] = {}
+        for row in rows:
+            by_user.setdefault(row["user_id"], []).append(row)
+        futures = [self._executor.submit(self._send_rows, user_rows) for user_rows in by_user.values()]
+        if wait:
+            for future in futures:
+                future.result()
+        return len(rows)
+
+    def _send_rows(self, rows: List[sqlite3.Row]) -> None:
+        for row in rows:
+            try:
+                self._send_row(row)
+            finally:
+                with self._lock:
+                    self._sending.discard(row["key"])
+
+    def _send_row(self, row: sqlite3.Row) -> None:
+        key = row["key"]
+        attempts = row["attempts"] + 1
+        try:
+            response = self._send(json.loads(row["payload"]), key)
+        except Exception as e:
+            response = {"error": str(e)}
+
+        now = time.time()
+        status_code = response.get("status_code") if isinstance(response, dict) else None
+        if isinstance(response, dict) and "error" not in response:
+            update = ("sent", json.dumps(response), None, now)
+        elif status_code is not None and 400 <= status_code < 500 and status_code not in (408, 429):
+            update = ("failed", None, response["error"], now)
+        elif attempts >= self.max_attempts:
+            update = ("failed", None, response.get("error", "unknown error"), now)
+        else:
+            # Exponential backoff: 1s, 2s, 4s ... capped at 5 minutes
+            retry_at = now + min(2 ** (attempts - 1), 300)
+            update = ("pending", None, response.get("error"), retry_at)
+            logger.warning("Workout log %s failed (attempt %d), retrying: %s", key, attempts, response.get("error"))
+
+        with self._lock:
+            self._conn.execute(
+                "UPDATE workout_logs SET status = ?, response = ?, error = ?, next_attempt_at = ?, "
+                "attempts = ?, updated_at = ? WHERE key = ?",
+                (*update, attempts, now, key)
+            )
+            self._conn.commit()
+        if update[0] == "sent":
+            # The backend has the sets now; an analytics sync since enqueueing missed them
+            payload = json.loads(row["payload"])
+            get_workout_analytics().invalidate(payload.get("user_id", row["user_id"]))
+        elif update[0] == "failed":
+            logger.error("Workout log %s failed permanently: %s", key, update[2])
+
+    def send_now(self, key: str) -> Optional[Dict[str, Any]]:
+        """Send one queued log immediately (ignoring backoff) and return its state."""
+        entry = self.get(key)
+        if entry is not None and entry["status"] == "pending":
+            self.flush(keys=[key])
+        return self.get(key)
+
+    def prune(self, older_than: float = WORKOUT_QUEUE_RETENTION_SECONDS) -> int:
+        """Delete sent and failed logs last updated more than `older_than` seconds ago."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM workout_logs WHERE status != 'pending' AND updated_at < ?",
+                (time.time() - older_than,)
+            )
+            self._conn.commit()
+            return cursor.rowcount
+
+    # ── background flusher ──────────────────────────────────
+
+    def start(self, interval: float = WORKOUT_QUEUE_FLUSH_INTERVAL) -> None:
+        """Start the background flusher (idempotent)."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, args=(interval,), name="workout-queue-flusher", daemon=True
+            )
+            self._thread.start()
+
+    def _run(self, interval: float) -> None:
+        last_prune = 0.0
+        while not self._stop.is_set():
+            try:
+                while self.flush() >= self.batch_size:
+                    pass
+                if time.time() - last_prune > 3600:
+                    self.prune()
+                    last_prune = time.time()
+            except Exception:
+                logger.exception("Workout queue flush failed")
+            self._wake.wait(interval)
+            self._wake.clear()
+
+    def stop(self, flush: bool = True) -> None:
+        """Stop the flusher, optionally sending everything that is due first."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        if flush:
+            self.flush()
+        self._executor.shutdown(wait=True)
+
+
+_queue: Optional[WorkoutLogQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_workout_queue() -> WorkoutLogQueue:
+    """Return the process-wide workout log queue, with its flusher running."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                queue = WorkoutLogQueue()
+                queue.start()
+                _queue = queue
+    return _queue
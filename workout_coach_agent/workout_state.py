@@ -0,0 +1,400 @@
+"""
+Workouts in the ADK session state.
+
+ADK serialises the session state on every event, so it is kept bounded:
+- "last_workout": today's workout with one row per set (the edit tools need
+  the workout_exercise_ids), plus "index": normalised exercise name ->
+  workout_exercise_ids for O(1) lookups, rebuilt on every log and edit
+- "workout_history": compact per-day summaries (no set rows) of the last
+  WORKOUT_STATE_DAYS days, oldest dropped first; a day moves here when the
+  first workout of a later day is logged
+
+Sessions written before this layout have a "last_workout_<date>" key per
+day; compact_state folds them into the history and clears them.
+
+With the write-behind queue, freshly logged sets first get provisional
+(negative) workout_exercise_ids; reconcile_pending_logs later swaps them for
+the backend's rows once the queued log has been sent.
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, MutableMapping, Optional, Tuple
+
+from workout_coach_agent.exercise_matcher import ExerciseMatcher, normalize
+from workout_coach_agent.workout_queue import WorkoutLogQueue, get_workout_queue
+
+# Days of workout summaries kept in the session state
+WORKOUT_STATE_DAYS = int(os.getenv("WORKOUT_STATE_DAYS", "14"))
+
+TODAY_KEY = "last_workout"
+HISTORY_KEY = "workout_history"
+# State key listing queued logs not yet reconciled: [{"key", "date", "ids"}]
+PENDING_LOGS_KEY = "pending_workout_logs"
+_LEGACY_DAY_PREFIX = "last_workout_"
+
+# Provisional IDs are -(sequence * _ROWS_PER_LOG + row), unique per queued log
+_ROWS_PER_LOG = 1000
+
+
+def clean_workout_response(response: Dict) -> Dict:
+    """
+    Cleans up the workout log response to only essential information.
+
+    Args:
+        response: Raw API response from workout logging
+
+    Returns:
+        Cleaned dictionary with essential workout info including IDs for editing
+    """
+    if not response.get("success") or not response.get("workout"):
+        return response
+
+    workout = response["workout"]
+
+    exercises = []
+    for exercise_entry in workout.get("workout_exercises", []):
+        exercise = exercise_entry.get("exercise", {})
+        name = exercise.get("name", "Unknown")
+        exercises.append({
+            "workout_exercise_id": exercise_entry.get("id"),
+            "name": name,
+            "set_number": exercise_entry.get("set_number"),
+            "weight_kg": exercise_entry.get("weight_kg"),
+            "reps": exercise_entry.get("reps"),
+        })
+
+    return {
+        "success": True,
+        "message": response.get("message", "Workout logged!"),
+        "workout_id": workout.get("id"),  # ID of the workout record
+        "workout_date": workout.get("workout_date", "").split("T")[0],
+        "total_volume_kg": workout.get("total_volume_kg", 0),
+        "exercises": exercises
+    }
+
+
+def _row_volume(row: Dict) -> float:
+    return float(row.get("weight_kg") or 0) * int(row.get("reps") or 0)
+
+
+def provisional_workout(sequence: int, exercises: List[Dict[str, Any]], today: str) -> Dict:
+    """
+    Workout as log_workout reports it before the backend has answered.
+
+    One row per set, like the backend's response, with provisional
+    (negative) workout_exercise_ids.
+    """
+    rows = []
+    for exercise in exercises:
+        for set_number in range(1, max(1, int(exercise.get("sets") or 1)) + 1):
+            rows.append({
+                "workout_exercise_id": -(sequence * _ROWS_PER_LOG + len(rows) + 1),
+                "name": exercise.get("exercise_name", "Unknown"),
+                "set_number": set_number,
+                "weight_kg": exercise.get("weight_kg"),
+                "reps": exercise.get("reps"),
+            })
+    return {
+        "success": True,
+        "queued": True,
+        "message": "Workout logged! (saving to your training log in the background)",
+        "workout_id": None,
+        "workout_date": today,
+        "total_volume_kg": sum(_row_volume(row) for row in rows),
+        "exercises": rows
+    }
+
+
+def is_provisional(workout_exercise_id: Any) -> bool:
+    """Whether a workout_exercise_id is a placeholder for a log not yet sent."""
+    return isinstance(workout_exercise_id, int) and workout_exercise_id < 0
+
+
+def build_index(rows: Iterable[Dict]) -> Dict[str, List[Any]]:
+    """Normalised exercise name -> workout_exercise_ids of its sets, in set order."""
+    index: Dict[str, List[Any]] = {}
+    for row in rows:
+        index.setdefault(normalize(str(row.get("name", ""))), []).append(row.get("workout_exercise_id"))
+    return index
+
+
+def find_exercise_ids(workout: Optional[Dict], exercise_name: str) -> List[Any]:
+    """workout_exercise_ids of an exercise in a workout (exact normalised name)."""
+    if not workout:
+        return []
+    index = workout.get("index")
+    if index is None:
+        index = build_index(workout.get("exercises", []))
+    return list(index.get(normalize(exercise_name), []))
+
+
+def lookup_exercise(workout: Optional[Dict], exercise_name: str) -> Tuple[Optional[str], List[Any], List[str]]:
+    """
+    Find an exercise in a workout by name, tolerating shorthand and typos.
+
+    Tries the name index first, then matches against the exercise names in
+    the workout ("bp" -> "Bench Press", "squats" -> "Back Squat").
+
+    Returns:
+        (exercise name as logged, its workout_exercise_ids, suggestions if
+        nothing matched)
+    """
+    ids = find_exercise_ids(workout, exercise_name)
+    names = list(dict.fromkeys(str(row.get("name", "")) for row in (workout or {}).get("exercises", [])))
+    if ids:
+        key = normalize(exercise_name)
+        return next((name for name in names if normalize(name) == key), exercise_name), ids, []
+    if not names:
+        return None, [], []
+    match = ExerciseMatcher(names).match(exercise_name)
+    if not match.valid:
+        return None, [], list(match.suggestions)
+    return match.exercise, find_exercise_ids(workout, match.exercise), []
+
+
+def apply_exercise_edits(state: MutableMapping, workout_exercise_ids: Iterable[Any], updates: Dict[str, Any]) -> None:
+    """
+    Mirror a successful edit in today's workout (and its name index).
+
+    Args:
+        state: Session state (tool_context.state)
+        workout_exercise_ids: Rows that were edited
+        updates: Fields sent in the PATCH ("sets", "reps", "weight_kg", "notes")
+    """
+    workout = state.get(TODAY_KEY)
+    if not workout or "exercises" not in workout:
+        return
+    ids = set(workout_exercise_ids)
+    # The row's set_number stands in for "sets", as the edit tools always did
+    fields = {("set_number" if field == "sets" else field): value for field, value in updates.items()}
+    rows = [dict(row, **fields) if row.get("workout_exercise_id") in ids else row for row in workout["exercises"]]
+    workout = dict(workout, exercises=rows)
+    workout["index"] = build_index(rows)
+    state[TODAY_KEY] = workout
+
+
+def without_index(workout: Dict) -> Dict:
+    """Workout as returned to the model (the index is for the tools only)."""
+    return {key: value for key, value in workout.items() if key != "index"}
+
+
+def summarize_workout(workout: Dict) -> Dict:
+    """
+    Compact day summary: per exercise [sets, total reps, top weight_kg].
+    """
+    exercises: Dict[str, List[float]] = {}
+    for row in workout.get("exercises", []):
+        summary = exercises.setdefault(str(row.get("name", "Unknown")), [0, 0, 0.0])
+        summary[0] += 1
+        summary[1] += int(row.get("reps") or 0)
+        summary[2] = max(summary[2], float(row.get("weight_kg") or 0))
+    return {
+        "workout_id": workout.get("workout_id"),
+        "total_volume_kg": workout.get("total_volume_kg", 0),
+        "exercises": exercises
+    }
+
+
+def _archive(history: Dict[str, Dict], workout: Dict) -> None:
+    date = workout.get("workout_date")
+    if date:
+        history[date] = summarize_workout(workout)
+
+
+def _trim(history: Dict[str, Dict]) -> Dict[str, Dict]:
+    """Keep the newest WORKOUT_STATE_DAYS days."""
+    if len(history) <= WORKOUT_STATE_DAYS:
+        return history
+    return {date: history[date] for date in sorted(history)[-WORKOUT_STATE_DAYS:]}
+
+
+def compact_state(state: MutableMapping) -> None:
+    """Fold legacy "last_workout_<date>" keys into the history and clear them."""
+    legacy = [key for key in state if key.startswith(_LEGACY_DAY_PREFIX) and state.get(key)]
+    if not legacy:
+        return
+    history = dict(state.get(HISTORY_KEY) or {})
+    for key in legacy:
+        workout = state[key]
+        if isinstance(workout, dict):
+            history.setdefault(key[len(_LEGACY_DAY_PREFIX):], summarize_workout(workout))
+        # ADK state has no delete; None keeps the serialised key tiny
+        state[key] = None
+    state[HISTORY_KEY] = _trim(history)
+
+
+def add_to_today(state: MutableMapping, cleaned_response: Dict) -> Dict:
+    """
+    Merge a logged workout into today's workout in the session state.
+
+    Returns:
+        Today's workout after the merge
+    """
+    today = datetime.now().strftime("%Y-%m-%d")
+    compact_state(state)
+
+    # Check if workout already exists for today
+    existing_workout = state.get(TODAY_KEY)
+
+    if existing_workout and existing_workout.get("workout_date") == today:
+        # Append exercises to existing workout
+        workout = dict(existing_workout)
+        workout["exercises"] = existing_workout["exercises"] + cleaned_response["exercises"]
+        workout["total_volume_kg"] += cleaned_response["total_volume_kg"]
+        if workout.get("workout_id") is None:
+            workout["workout_id"] = cleaned_response.get("workout_id")
+    else:
+        # New day: the previous day moves to the history
+        if existing_workout and existing_workout.get("workout_date"):
+            history = dict(state.get(HISTORY_KEY) or {})
+            _archive(history, existing_workout)
+            state[HISTORY_KEY] = _trim(history)
+        workout = dict(cleaned_response)
+
+    workout["index"] = build_index(workout["exercises"])
+    state[TODAY_KEY] = workout
+    return workout
+
+
+def track_pending_log(state: MutableMapping, key: str, workout: Dict) -> None:
+    """Remember a queued log so reconcile_pending_logs can resolve its IDs later."""
+    pending = list(state.get(PENDING_LOGS_KEY) or [])
+    pending.append({
+        "key": key,
+        "date": workout["workout_date"],
+        "ids": [row["workout_exercise_id"] for row in workout["exercises"]]
+    })
+    state[PENDING_LOGS_KEY] = pending
+
+
+def _swap_rows(state: MutableMapping, log: Dict, real: Optional[Dict]) -> Dict[int, Any]:
+    """
+    Replace a log's provisional rows in today's workout with the backend's
+    rows (or drop them if the log failed).
+
+    Returns:
+        Provisional ID -> real ID
+    """
+    provisional_ids = set(log["ids"])
+    real_rows = real["exercises"] if real else []
+    id_map: Dict[int, Any] = {}
+
+    # Days already moved to the history have no set rows left to update
+    workout = state.get(TODAY_KEY)
+    if workout and workout.get("workout_date") == log["date"] and workout.get("exercises"):
+        rows = workout["exercises"]
+        positions = [i for i, row in enumerate(rows) if row.get("workout_exercise_id") in provisional_ids]
+        if not positions:
+            return id_map
+
+        provisional = [rows[i] for i in positions]
+        # Match sets by (name, set_number); fall back to order
+        by_set = {(str(row.get("name", "")).lower(), row.get("set_number")): row for row in real_rows}
+        for i, row in enumerate(provisional):
+            match = by_set.get((str(row.get("name", "")).lower(), row.get("set_number")))
+            if match is None and i < len(real_rows):
+                match = real_rows[i]
+            if match is not None:
+                id_map[row["workout_exercise_id"]] = match.get("workout_exercise_id")
+
+        kept = [row for row in rows if row.get("workout_exercise_id") not in provisional_ids]
+        first = positions[0]
+        workout = dict(workout, exercises=kept[:first] + list(real_rows) + kept[first:])
+        workout["total_volume_kg"] = (
+            workout.get("total_volume_kg", 0)
+            - sum(_row_volume(row) for row in provisional)
+            + (real.get("total_volume_kg", 0) if real else 0)
+        )
+        if real and workout.get("workout_id") is None:
+            workout["workout_id"] = real.get("workout_id")
+        workout["index"] = build_index(workout["exercises"])
+        state[TODAY_KEY] = workout
+
+    return id_map
+
+
+def reconcile_pending_logs(
+    state: MutableMapping,
+    queue: Optional[WorkoutLogQueue] = None
+) -> Tuple[List[Dict], Dict[int, Any]]:
+    """
+    Swap provisional rows for the backend's rows for every queued log that
+    has been sent, and drop the rows of logs that failed.
+
+    Args:
+        state: Session state (tool_context.state)
+        queue: Workout log queue (default: the process-wide queue)
+
+    Returns:
+        (failed logs as {"exercises", "error"}, provisional ID -> real ID)
+    """
+    pending = state.get(PENDING_LOGS_KEY) or []
+    if not pending:
+        return [], {}
+    queue = queue or get_workout_queue()
+
+    remaining, failed, id_map = [], [], {}
+    for log in pending:
+        entry = queue.get(log["key"])
+        if entry is not None and entry["status"] == "pending":
+            remaining.append(log)
+            continue
+
+        real = None
+        if entry is not None and entry["status"] == "sent":
+            real = clean_workout_response(entry["response"])
+            if not real.get("success"):
+                real = None
+        names = _names_for(state, log)
+        id_map.update(_swap_rows(state, log, real))
+        if real is None:
+            failed.append({
+                "exercises": names,
+                "error": (entry or {}).get("error") or "The workout log was lost before it could be saved"
+            })
+
+    state[PENDING_LOGS_KEY] = remaining
+    return failed, id_map
+
+
+def _names_for(state: MutableMapping, log: Dict) -> List[str]:
+    ids = set(log["ids"])
+    workout = state.get(TODAY_KEY) or {}
+    return list(dict.fromkeys(
+        row.get("name") for row in workout.get("exercises", []) if row.get("workout_exercise_id") in ids
+    ))
+
+
+def resolve_workout_exercise_ids(
+    state: MutableMapping,
+    workout_exercise_ids: Iterable[Any],
+    queue: Optional[WorkoutLogQueue] = None
+) -> Tuple[List[Any], List[Any]]:
+    """
+    Turn provisional workout_exercise_ids into real ones, sending their
+    queued logs right away if they have not been sent yet.
+
+    Returns:
+        (resolved IDs, IDs that are still provisional because their log
+        could not be sent yet or failed)
+    """
+    ids = list(workout_exercise_ids)
+    if not any(is_provisional(i) for i in ids):
+        return ids, []
+    queue = queue or get_workout_queue()
+
+    wanted = {i for i in ids if is_provisional(i)}
+    for log in state.get(PENDING_LOGS_KEY) or []:
+        if wanted & set(log["ids"]):
+            queue.send_now(log["key"])
+    _, id_map = reconcile_pending_logs(state, queue)
+
+    resolved, unresolved = [], []
+    for i in ids:
+        if not is_provisional(i):
+            resolved.append(i)
+        elif id_map.get(i) is not None:
+            resolved.append(id_map[i])
+        else:
+            unresolved.append(i)
+    return resolved, unresolved